@@ -26,6 +26,7 @@ const App = () => {
 
   const handleLogout = () => {
     localStorage.removeItem('userToken');
+    localStorage.removeItem('refreshToken');
     setIsLoggedIn(false);
   };
 
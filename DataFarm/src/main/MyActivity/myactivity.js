@@ -32,15 +32,43 @@ const MyActivity = () => {
 
     // 👇 --- 백엔드 API 연결 로직 ---
     
-    // ❗️ 실제 애플리케이션에서는 로그인 후 사용자 정보를 가져와야 합니다.
-    // 여기서는 테스트를 위해 사용자 ID를 1로 고정합니다.
-    const MOCK_USER_ID = 1; 
+    // 로그인 때 받은 액세스 토큰으로 사용자를 식별합니다 (user_id를 따로 보내지 않음).
     const API_BASE_URL = "http://localhost:1234"; // FastAPI 서버 주소
+    const authHeaders = () => ({ Authorization: `Bearer ${localStorage.getItem('userToken')}` });
+
+    // 액세스 토큰이 만료되면(401) 리프레시 토큰으로 한 번 재발급받고 같은 요청을 다시 보냅니다.
+    const refreshAccessToken = async () => {
+        const refreshToken = localStorage.getItem('refreshToken');
+        if (!refreshToken) return false;
+        const response = await fetch(`${API_BASE_URL}/users/refresh`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ refresh_token: refreshToken })
+        });
+        if (!response.ok) return false;
+        const data = await response.json();
+        localStorage.setItem('userToken', data.access_token);
+        localStorage.setItem('refreshToken', data.refresh_token);
+        return true;
+    };
+
+    const authFetch = async (url, options = {}) => {
+        const send = () => fetch(url, { ...options, headers: { ...(options.headers || {}), ...authHeaders() } });
+        const response = await send();
+        if (response.status === 401 && await refreshAccessToken()) {
+            return send();
+        }
+        return response;
+    };
 
     // 1. 백엔드에서 데이터를 불러와 캘린더 형식에 맞게 변환하는 함수
     const fetchLogs = async () => {
         try {
-            const response = await fetch(`${API_BASE_URL}/api/produce-logs?user_id=${MOCK_USER_ID}`);
+            const response = await authFetch(`${API_BASE_URL}/api/produce-logs`);
+            if (!response.ok) {
+                console.error("Error fetching produce logs:", response.status);
+                return;
+            }
             const data = await response.json();
             
             // 백엔드 데이터(logs)를 FullCalendar가 이해하는 형식으로 변환
@@ -71,14 +99,13 @@ const MyActivity = () => {
     const handleSaveRecord = async () => {
         if (selectedDate && selectedCrop && quantity) {
             const newLog = {
-                userId: MOCK_USER_ID,
                 cropName: selectedCrop,
                 quantity: parseFloat(quantity), // 문자열을 숫자로 변환
                 productionDate: selectedDate.dateStr
             };
 
             try {
-                const response = await fetch(`${API_BASE_URL}/api/produce-logs`, {
+                const response = await authFetch(`${API_BASE_URL}/api/produce-logs`, {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify(newLog)
@@ -110,7 +137,7 @@ const MyActivity = () => {
             const logId = selected.event.id; // 이벤트 ID (DB의 ID)
 
             try {
-                const response = await fetch(`${API_BASE_URL}/api/produce-logs/${logId}`, {
+                const response = await authFetch(`${API_BASE_URL}/api/produce-logs/${logId}`, {
                     method: 'DELETE'
                 });
 
@@ -28,9 +28,9 @@ const LoginPage = ({ onLogin }) => {
       const data = await response.json();
 
       if (response.ok) {
-        // 서버 응답에 토큰이 있다고 가정하고 localStorage에 저장
-        // 실제 API 응답 구조에 맞게 수정해야 합니다. (예: data.token)
-        const token = data.result.token; 
+        // 액세스 토큰은 부모(App)가 localStorage에 저장, 리프레시 토큰은 재발급용으로 따로 보관
+        const token = data.access_token;
+        localStorage.setItem('refreshToken', data.refresh_token);
         
         // 부모 컴포넌트에 로그인 상태 전달 (token 전달)
         onLogin(token); 
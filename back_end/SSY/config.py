@@ -1,51 +1,216 @@
 import os
-from dotenv import load_dotenv
-
+import typing
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from dotenv import load_dotenv, find_dotenv
-
-# (1) 현재 작업 폴더 기준 탐색 + (2) 파일 경로 직접 지정, 둘 다 시도
-dotenv_path = find_dotenv(usecwd=True)
-if not dotenv_path:
-    # main.py와 같은 폴더의 .env를 시도
-    dotenv_path = str((Path(__file__).resolve().parent / ".env"))
-
-load_dotenv(dotenv_path, override=True)
-# .env 파일에서 환경 변수를 로드합니다.
-# 이 코드가 os.getenv()를 호출하기 전에 실행되어야 합니다.
-# 현재 스크립트가 실행되는 폴더의 절대 경로를 가져옵니다.
-# 이것이 os.path.dirname(__file__)보다 더 안정적일 수 있습니다.
-current_dir = os.getcwd() 
-
-# 프로젝트의 최상위 폴더(back_end 폴더의 부모 폴더) 경로를 만듭니다.
-# 경로가 꼬이지 않도록 주의합니다.
-project_root = os.path.dirname(current_dir)
-
-# 최상위 폴더에 있는 .env 파일을 명시적으로 로드합니다.
-load_dotenv(os.path.join(project_root, '.env'))
-
-# 이 코드를 추가하여 값이 제대로 로드되었는지 확인합니다.
-print("CWD:", os.getcwd())
-print("DOTENV used:", dotenv_path)
-print(f"DEBUG: ORACLE_USER = '{os.getenv('ORACLE_USER')}'")
-print(f"DEBUG: ORACLE_PASSWORD = '{os.getenv('ORACLE_PASSWORD')}'")
-print(f"DEBUG: ORACLE_DSN = '{os.getenv('ORACLE_DSN')}'")
-# Oracle DB 접속 정보
-# --- Oracle DB 접속 정보 ---
-# URL 전체가 아닌, 사용자명/비밀번호/DSN을 분리하여 정의합니다.
-ORACLE_USER = os.getenv("ORACLE_USER")
-ORACLE_PASSWORD = os.getenv("ORACLE_PASSWORD")
-ORACLE_DSN = os.getenv("ORACLE_DSN") # 호스트:포트/서비스명
-
-# --- NAVER SMTP ---
-NAVER_SMTP_HOST = "smtp.naver.com"
-NAVER_SMTP_PORT = 587
-NAVER_SMTP_USER = os.getenv("NAVER_SMTP_USER")
-NAVER_SMTP_PASS = os.getenv("NAVER_SMTP_PASS")
-SMTP_FROM = NAVER_SMTP_USER
-
-# --- 구글 SMTP ---
-GOOGLE_SMTP_HOST = "smtp.gmail.com"
-GOOGLE_SMTP_PORT = 587
-GOOGLE_SMTP_USER = os.getenv("GOOGLE_SMTP_USER")
-GOOGLE_SMTP_PASS = os.getenv("GOOGLE_SMTP_PASS")
\ No newline at end of file
+from typing import List, Optional
+
+# 설정은 처음 읽힐 때(config.XXX 접근) 한 번만 .env/환경 변수에서 만들어집니다.
+# import만으로는 .env 탐색/출력/폴더 생성 같은 부수 효과가 없으므로 워커 기동과 reload가 빠릅니다.
+# 테스트/앱 팩토리는 configure(Settings(...))로 .env 없이 값을 직접 넣을 수 있습니다.
+
+
+@dataclass(frozen=True)
+class Settings:
+    # --- Oracle DB 접속 정보 ---
+    # URL 전체가 아닌, 사용자명/비밀번호/DSN을 분리하여 정의합니다.
+    ORACLE_USER: Optional[str] = None
+    ORACLE_PASSWORD: Optional[str] = None
+    ORACLE_DSN: Optional[str] = None  # 호스트:포트/서비스명, 없으면 기동 시 풀/메타데이터 준비를 건너뜀
+
+    # --- NAVER SMTP ---
+    NAVER_SMTP_HOST: str = "smtp.naver.com"
+    NAVER_SMTP_PORT: int = 587
+    NAVER_SMTP_USER: Optional[str] = None
+    NAVER_SMTP_PASS: Optional[str] = None
+    SMTP_FROM: Optional[str] = None  # 비우면 NAVER_SMTP_USER
+
+    # --- 구글 SMTP ---
+    GOOGLE_SMTP_HOST: str = "smtp.gmail.com"
+    GOOGLE_SMTP_PORT: int = 587
+    GOOGLE_SMTP_USER: Optional[str] = None
+    GOOGLE_SMTP_PASS: Optional[str] = None
+
+    # --- Oracle 세션 풀 ---
+    # 요청마다 connect() 하지 않고 프로세스 단위 풀에서 세션을 빌려 씁니다.
+    DB_POOL_MIN: int = 2
+    DB_POOL_MAX: int = 10
+    DB_POOL_BUDGET: int = 0  # 모든 웹 워커를 합친 세션 상한 (0이면 워커마다 DB_POOL_MAX)
+    DB_POOL_INCREMENT: int = 1
+    DB_POOL_WAIT_TIMEOUT_MS: int = 5000  # 세션 대여 대기 한도
+    DB_POOL_PING_INTERVAL: int = 60  # 0이면 대여 때마다 ping
+    DB_STMT_CACHE_SIZE: int = 40
+
+    # --- 비밀번호 해시 (bcrypt) ---
+    BCRYPT_ROUNDS: int = 12  # cost factor; 바꾸면 로그인 시 자동 재해시
+    PASSWORD_HASH_WORKERS: int = 0  # 0이면 CPU 수 / 웹 워커 수
+
+    # --- 생산 기록 조회 ---
+    PRODUCE_LOG_MAX_LIMIT: int = 1000  # 페이지당 최대 행 수
+    DB_STREAM_ARRAYSIZE: int = 500  # 스트리밍 시 한 번에 가져올 행 수
+    PRODUCE_LOG_BULK_BATCH_SIZE: int = 500  # executemany 한 번(=트랜잭션 하나)의 행 수
+    PRODUCE_LOG_BULK_MAX_ROWS: int = 50000  # 요청 하나에 허용하는 최대 행 수
+    PRODUCE_LOG_CSV_MAX_BYTES: int = 8 * 1024 * 1024  # CSV 업로드 최대 크기 (넘으면 읽기를 멈추고 413)
+
+    # --- 메일 발송 큐 (MAIL_OUTBOX + 백그라운드 워커) ---
+    SMTP_STARTTLS: bool = True  # 로컬 테스트용 SMTP(aiosmtpd 등)는 0
+    SMTP_TIMEOUT: float = 10
+    MAIL_PROVIDERS: List[str] = field(default_factory=lambda: ["naver", "google"])  # 앞에서부터 시도
+    MAIL_WORKERS: int = 2  # 워커마다 SMTP 연결을 유지
+    MAIL_BATCH_SIZE: int = 20
+    MAIL_POLL_INTERVAL: float = 5
+    MAIL_MAX_ATTEMPTS: int = 6
+    MAIL_RETRY_BASE_SECONDS: float = 10  # 재시도 간격: base * 2^(시도-1)
+    MAIL_RETRY_MAX_SECONDS: float = 900
+    MAIL_STALE_SENDING_SECONDS: int = 300  # 발송 중 멈춘 메일 회수 기준
+    MAIL_RETENTION_HOURS: int = 72  # 발송 완료/실패 행 보관 기간 (본문은 끝나는 즉시 비움)
+
+    # --- OTP 저장소 ---
+    OTP_BACKEND: str = "oracle"  # oracle | memory(단일 프로세스) | redis
+    OTP_TTL_SECONDS: int = 180
+    OTP_MAX_ATTEMPTS: int = 5  # 초과 시 재발급 전까지 잠금
+    OTP_HASH_SECRET: str = "datafarm-otp"  # 개발용 값, DB를 연결하면 별도 값이 없을 때 기동 거부 (공개 키면 6자리 코드는 10^6번이면 역산)
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # --- 로그인 토큰 (JWT) ---
+    JWT_SECRET: str = "dkanrjsk"  # 개발용 값, DB를 연결하면(ORACLE_DSN) 별도 값이 없을 때 기동 거부
+    JWT_ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_HOURS: int = 24
+    JWT_CACHE_SIZE: int = 10000  # 검증된 토큰 클레임 LRU 크기
+
+    # --- 프로필 이미지 업로드 ---
+    UPLOAD_DIR: str = "./psa"  # 첫 저장 때 만들어짐
+    UPLOAD_MAX_BYTES: int = 5 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    UPLOAD_ALLOWED_EXTS: List[str] = field(default_factory=lambda: [".jpg", ".jpeg", ".png", ".gif", ".webp"])
+    UPLOAD_CACHE_MAX_AGE: int = 365 * 24 * 3600  # 내용 주소 파일이라 바뀌지 않음
+    THUMBNAIL_SIZES: List[int] = field(default_factory=lambda: [128, 512])  # 긴 변 기준 px
+    THUMBNAIL_WORKERS: int = 2
+    UPLOAD_SHARD_DEPTH: int = 2  # 하위 폴더 단계 (2 -> ab/cd/파일, 폴더당 파일 수 1/65536)
+
+    # --- 요청 제한 (OTP 발송/검증, 회원가입) ---
+    # "횟수/초" 형식, 비우면 그 규칙은 끔
+    RATE_LIMIT_BACKEND: str = "memory"  # memory(단일 프로세스) | redis
+    TRUST_FORWARDED_FOR: bool = False  # 리버스 프록시 뒤일 때만 1
+    OTP_SEND_LIMIT_PER_EMAIL: str = "3/600"
+    OTP_SEND_LIMIT_PER_IP: str = "20/600"
+    OTP_VERIFY_LIMIT_PER_EMAIL: str = "10/600"
+    OTP_VERIFY_LIMIT_PER_IP: str = "60/600"
+    SIGNUP_LIMIT_PER_EMAIL: str = "5/600"  # 회원가입 (bcrypt 해시가 비싸므로 같은 방식으로 제한)
+    SIGNUP_LIMIT_PER_IP: str = "20/600"
+
+    # --- 운영 작업 엔드포인트 (/api/metadata/refresh) ---
+    ADMIN_TOKEN: Optional[str] = None  # X-Admin-Token 헤더 값, 비우면 운영 엔드포인트를 막음
+    METADATA_REFRESH_LIMIT: str = "3/60"  # 데이터 사전 조회가 무거우므로 전체 합산으로 제한
+
+    # --- HTTP 캐시 (ETag 버전) ---
+    CACHE_VERSION_BACKEND: str = "memory"  # memory(단일 워커만, WEB_WORKERS > 1 이면 기동 거부) | redis
+
+    # --- 날씨 API ---
+    WEATHER_API_KEY: Optional[str] = None
+    WEATHER_API_URL: str = "https://api.openweathermap.org"
+    WEATHER_TIMEOUT: float = 3
+    WEATHER_CACHE_TTL: float = 600  # 이 시간 동안은 캐시 그대로
+    WEATHER_STALE_TTL: float = 1800  # 이 시간까지는 묵은 값 + 뒤에서 갱신
+
+    # --- 지표 (/metrics) ---
+    SLOW_QUERY_MS: float = 0  # 이 시간(ms) 이상 걸린 DB 왕복은 SQL과 함께 출력, 0이면 끔
+
+    # --- 운영 서버 (gunicorn.conf.py: gunicorn + uvicorn 워커) ---
+    SERVER_BIND: str = "0.0.0.0:1234"
+    WEB_WORKERS: int = 1  # 웹 워커 프로세스 수, 0이면 CPU 수
+    GRACEFUL_TIMEOUT: int = 30  # SIGTERM 후 진행 중 요청/DB 트랜잭션/메일 발송을 마무리할 시간
+
+    def __post_init__(self):
+        # 비어 있거나 0인 값의 실제 기본값 (frozen이라 object.__setattr__)
+        cpus = os.cpu_count() or 1
+        web_workers = self.WEB_WORKERS or cpus
+        for name, value in (
+            ("NAVER_SMTP_HOST", self.NAVER_SMTP_HOST or type(self).NAVER_SMTP_HOST),
+            ("GOOGLE_SMTP_HOST", self.GOOGLE_SMTP_HOST or type(self).GOOGLE_SMTP_HOST),
+            ("SMTP_FROM", self.SMTP_FROM or self.NAVER_SMTP_USER),
+            ("WEB_WORKERS", web_workers),
+            ("PASSWORD_HASH_WORKERS", self.PASSWORD_HASH_WORKERS or max(1, cpus // web_workers)),
+            ("UPLOAD_ALLOWED_EXTS", [e.lower() for e in self.UPLOAD_ALLOWED_EXTS]),
+        ):
+            object.__setattr__(self, name, value)
+
+        # 저장소에 공개된 기본 비밀키로는 실제 DB에 붙지 않음 (토큰 위조)
+        if self.db_configured and self.JWT_SECRET == type(self).JWT_SECRET:
+            raise ValueError("JWT_SECRET must be set to a private value when ORACLE_DSN is configured.")
+        if self.db_configured and self.OTP_HASH_SECRET == type(self).OTP_HASH_SECRET:
+            raise ValueError("OTP_HASH_SECRET must be set to a private value when ORACLE_DSN is configured.")
+        # 워커마다 따로 세는 버전이면 다른 워커의 쓰기 뒤에도 304(오래된 기록)를 줌 -> 성능 문제가 아니라 잘못된 응답
+        if self.WEB_WORKERS > 1 and self.CACHE_VERSION_BACKEND.lower() == "memory":
+            raise ValueError("CACHE_VERSION_BACKEND=memory serves stale 304s with WEB_WORKERS > 1; use redis.")
+
+    @property
+    def db_configured(self) -> bool:
+        return bool(self.ORACLE_DSN)
+
+    def db_pool_limits(self):
+        """웹 워커(프로세스) 하나의 세션 풀 (min, max). DB_POOL_BUDGET이 있으면 워커 수로 나눈 몫을 넘지 않습니다."""
+        pool_max = self.DB_POOL_MAX
+        if self.DB_POOL_BUDGET:
+            pool_max = max(1, min(pool_max, self.DB_POOL_BUDGET // self.WEB_WORKERS))
+        return min(self.DB_POOL_MIN, pool_max), pool_max
+
+    @classmethod
+    def from_env(cls, environ=None, load_env_files: bool = True) -> "Settings":
+        """환경 변수(기본 os.environ)로 설정을 만듭니다. load_env_files면 먼저 .env 파일을 읽어 둡니다."""
+        if load_env_files:
+            load_env()
+        environ = os.environ if environ is None else environ
+        hints = typing.get_type_hints(cls)
+        values = {}
+        for f in fields(cls):
+            raw = environ.get(f.name)
+            if raw is not None:
+                values[f.name] = _parse(hints[f.name], raw, f)
+        return cls(**values)
+
+
+def _parse(tp, raw: str, f):
+    origin = typing.get_origin(tp)
+    if origin is typing.Union:  # Optional[str]
+        return raw or None
+    if origin in (list, List):
+        item = typing.get_args(tp)[0]
+        return [item(v.strip()) for v in raw.split(",") if v.strip()]
+    if tp is bool:
+        return raw.strip().lower() in ("1", "true", "yes", "on")
+    if tp in (int, float):
+        return tp(raw) if raw.strip() else f.default  # 빈 값이면 기본값
+    return raw
+
+
+def load_env():
+    # (1) 현재 작업 폴더 기준 탐색 + (2) SSY 폴더의 .env, 둘 다 시도
+    from dotenv import load_dotenv, find_dotenv
+    dotenv_path = find_dotenv(usecwd=True) or str(Path(__file__).resolve().parent / ".env")
+    load_dotenv(dotenv_path, override=True)
+    # 프로젝트 최상위 폴더(back_end의 부모)의 .env (이미 있는 값은 덮지 않음)
+    load_dotenv(os.path.join(os.path.dirname(os.getcwd()), ".env"))
+
+
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    global _settings
+    if _settings is None:
+        _settings = Settings.from_env()
+    return _settings
+
+
+def configure(settings: Optional[Settings]):
+    """프로세스 설정을 교체 (None이면 다음 접근 때 환경 변수에서 다시 읽음)"""
+    global _settings
+    _settings = settings
+
+
+def __getattr__(name: str):
+    # config.DB_POOL_MAX 같은 기존 접근을 그대로 지원 (모듈 속성 지연 조회)
+    if name.isupper():
+        return getattr(get_settings(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
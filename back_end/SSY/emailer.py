@@ -4,38 +4,88 @@ from email.utils import formataddr
 from . import config
 
 
-def send_mail(to_email: str, subject: str, html: str, service: str = "naver"):
-    """
-    Sends an email using the specified service (naver or google).
-    """
+def _smtp_settings(service: str):
     if service == "naver":
-        smtp_host = config.NAVER_SMTP_HOST
-        smtp_port = config.NAVER_SMTP_PORT
-        smtp_user = config.NAVER_SMTP_USER
-        smtp_pass = config.NAVER_SMTP_PASS
-        from_email = config.NAVER_SMTP_USER
-        display_from = formataddr(("TRADESITE", from_email))
+        return config.NAVER_SMTP_HOST, config.NAVER_SMTP_PORT, config.NAVER_SMTP_USER, config.NAVER_SMTP_PASS
     elif service == "google":
-        smtp_host = config.GOOGLE_SMTP_HOST
-        smtp_port = config.GOOGLE_SMTP_PORT
-        smtp_user = config.GOOGLE_SMTP_USER
-        smtp_pass = config.GOOGLE_SMTP_PASS
-        from_email = config.GOOGLE_SMTP_USER
-        display_from = formataddr(("TRADESITE", from_email))
-    else:
-        # Invalid service, raise an error or handle it gracefully.
-        raise ValueError(f"Invalid email service: {service}. Must be 'naver' or 'google'.")
+        return config.GOOGLE_SMTP_HOST, config.GOOGLE_SMTP_PORT, config.GOOGLE_SMTP_USER, config.GOOGLE_SMTP_PASS
+    # Invalid service, raise an error or handle it gracefully.
+    raise ValueError(f"Invalid email service: {service}. Must be 'naver' or 'google'.")
+
 
+def _build_message(from_email: str, to_email: str, subject: str, html: str) -> MIMEText:
     msg = MIMEText(html, "html", "utf-8")
-    msg["From"] = display_from
+    msg["From"] = formataddr(("TRADESITE", from_email))
     msg["To"] = to_email
     msg["Subject"] = subject
+    return msg
+
+
+def send_mail(to_email: str, subject: str, html: str, service: str = "naver"):
+    """
+    Sends an email using the specified service (naver or google).
+    Opens a new connection per call; the mail worker uses SmtpSender instead.
+    """
+    sender = SmtpSender(service)
+    try:
+        sender.send(to_email, subject, html)
+    finally:
+        sender.close()
+
+
+class SmtpSender:
+    """
+    Keeps one authenticated SMTP connection to a provider and reuses it across messages.
+    Not thread-safe: give each worker its own sender.
+    """
+
+    def __init__(self, service: str):
+        self.service = service
+        self.host, self.port, self.user, self.password = _smtp_settings(service)
+        self._smtp = None
+
+    def _connect(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=config.SMTP_TIMEOUT)
+        try:
+            if config.SMTP_STARTTLS:
+                smtp.starttls()
+            if self.user and self.password:
+                smtp.login(self.user, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp = smtp
+
+    def _alive(self) -> bool:
+        if self._smtp is None:
+            return False
+        try:
+            return self._smtp.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+        except OSError:
+            return False
+
+    def send(self, to_email: str, subject: str, html: str):
+        if not self._alive():
+            self.close()
+            self._connect()
+        msg = _build_message(self.user, to_email, subject, html)
+        try:
+            self._smtp.sendmail(self.user, [to_email], msg.as_string())
+        except smtplib.SMTPServerDisconnected:
+            # Server dropped an idle connection between the NOOP and the send: reconnect once.
+            self.close()
+            self._connect()
+            self._smtp.sendmail(self.user, [to_email], msg.as_string())
 
-    with smtplib.SMTP(smtp_host, smtp_port) as s:
-        s.starttls()
-        # Authentication is now required for both services.
-        s.login(smtp_user, smtp_pass)
-        s.sendmail(from_email, [to_email], msg.as_string())
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self._smtp.close()
+            self._smtp = None
 
 
 def otp_html(code: str) -> str:
@@ -0,0 +1,23 @@
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+class SsyApiError(Exception):
+    """
+    DAO/라우트가 실패를 알릴 때 던지는 예외.
+    DAO는 성공 시 평범한 dict/list만 돌려주고, 실패는 이 예외로 상태 코드와 메시지를 올립니다.
+    응답 본문은 기존과 같은 {"result": 메시지, ...} 모양입니다.
+    """
+
+    def __init__(self, status_code: int, result: str, headers: dict = None, **extra):
+        super().__init__(result)
+        self.status_code = status_code
+        self.result = result
+        self.headers = headers
+        self.extra = extra
+
+
+def register_error_handlers(app: FastAPI):
+    @app.exception_handler(SsyApiError)
+    async def _ssy_api_error(request: Request, exc: SsyApiError):
+        return JSONResponse({"result": exc.result, **exc.extra}, status_code=exc.status_code, headers=exc.headers)
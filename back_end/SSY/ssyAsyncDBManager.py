@@ -0,0 +1,93 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from SSY import config
+from SSY.ssyMetrics import SsyMetrics, TimedAsync, CURSOR_OPS, CONNECTION_ROUND_TRIPS
+
+class SsyAsyncDBManager:
+    """
+    SsyDBManager의 asyncio 버전.
+    oracledb thin 모드의 async 풀을 써서 DB 왕복 동안 이벤트 루프/스레드풀을 붙잡지 않습니다.
+    풀 설정은 SsyDBManager와 같은 config 값을 씁니다.
+    """
+    # 프로세스(이벤트 루프) 전역 async 세션 풀
+    _pool = None
+    _acquire_count = 0
+    _wait_total_ms = 0.0
+    _wait_max_ms = 0.0
+
+    @classmethod
+    def getPool(cls):
+        if cls._pool is None:
+            import oracledb  # 풀을 처음 만들 때 import (DB 없이 쓰는 워커/테스트의 기동 시간 절약)
+            pool_min, pool_max = config.get_settings().db_pool_limits()  # 다중 워커면 DB_POOL_BUDGET을 나눠 씀
+            cls._pool = oracledb.create_pool_async(
+                user=config.ORACLE_USER,
+                password=config.ORACLE_PASSWORD,
+                dsn=config.ORACLE_DSN,
+                min=pool_min,
+                max=pool_max,
+                increment=config.DB_POOL_INCREMENT,
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=config.DB_POOL_WAIT_TIMEOUT_MS,
+                ping_interval=config.DB_POOL_PING_INTERVAL,
+                stmtcachesize=config.DB_STMT_CACHE_SIZE,
+            )
+        return cls._pool
+
+    @classmethod
+    async def closePool(cls, timeout: float = 0):
+        """풀 종료. timeout 동안은 빌려 간 세션(진행 중 트랜잭션)이 반납되기를 기다린 뒤 닫습니다."""
+        if cls._pool is not None:
+            pool, cls._pool = cls._pool, None
+            deadline = time.monotonic() + timeout
+            while pool.busy and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            await pool.close(force=True)
+
+    @classmethod
+    @asynccontextmanager
+    async def acquire(cls):
+        """
+        풀에서 세션을 빌려 (con, cur)를 넘겨줍니다. 사용법은 SsyDBManager.acquire()와 같습니다.
+
+            async with SsyAsyncDBManager.acquire() as (con, cur):
+                await cur.execute(...)
+                await con.commit()
+        """
+        started = time.perf_counter()
+        con = await cls.getPool().acquire()
+        waited_ms = (time.perf_counter() - started) * 1000
+        cls._acquire_count += 1
+        cls._wait_total_ms += waited_ms
+        cls._wait_max_ms = max(cls._wait_max_ms, waited_ms)
+        SsyMetrics.observe("db_pool_wait_seconds", waited_ms / 1000, {"pool": "async"}, help="Time spent waiting for a pooled session")
+
+        cur = con.cursor()
+        try:
+            # DB 왕복(execute/fetch/commit 등)마다 시간/횟수를 SsyMetrics에 기록
+            yield TimedAsync(con, CONNECTION_ROUND_TRIPS), TimedAsync(cur, CURSOR_OPS)
+        except Exception:
+            await con.rollback()
+            raise
+        finally:
+            cur.close()
+            await con.close()  # 풀 세션은 close() 시 풀로 반납됩니다
+
+    @classmethod
+    def stats(cls):
+        """풀 크기 조정용 지표 (busy/open 세션 수, 대여 대기 시간)."""
+        pool = cls._pool
+        count = cls._acquire_count
+        pool_min, pool_max = config.get_settings().db_pool_limits()
+        return {
+            "min": pool_min,
+            "max": pool_max,
+            "increment": config.DB_POOL_INCREMENT,
+            "open": pool.opened if pool else 0,
+            "busy": pool.busy if pool else 0,
+            "acquires": count,
+            "wait_avg_ms": round(cls._wait_total_ms / count, 3) if count else 0.0,
+            "wait_max_ms": round(cls._wait_max_ms, 3),
+        }
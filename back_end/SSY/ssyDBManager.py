@@ -1,15 +1,101 @@
-from oracledb import connect
+import threading
+import time
+from contextlib import contextmanager
+
 from SSY import config
+from SSY.ssyMetrics import SsyMetrics, Timed, CURSOR_OPS, CONNECTION_ROUND_TRIPS
 
 class SsyDBManager:
-    @staticmethod
-    def makeConCur():
-        # user, password, dsn을 분리하여 인자로 전달
-        con = connect(
-            user=config.ORACLE_USER,
-            password=config.ORACLE_PASSWORD,
-            dsn=config.ORACLE_DSN
-        )
+    # 프로세스 전역 세션 풀 (최초 사용 시 생성)
+    _pool = None
+    _lock = threading.Lock()
+    _acquire_count = 0
+    _wait_total_ms = 0.0
+    _wait_max_ms = 0.0
+
+    @classmethod
+    def getPool(cls):
+        if cls._pool is None:
+            with cls._lock:
+                if cls._pool is None:
+                    import oracledb  # 풀을 처음 만들 때 import (DB 없이 쓰는 워커/테스트의 기동 시간 절약)
+                    pool_min, pool_max = config.get_settings().db_pool_limits()  # 다중 워커면 DB_POOL_BUDGET을 나눠 씀
+                    cls._pool = oracledb.create_pool(
+                        user=config.ORACLE_USER,
+                        password=config.ORACLE_PASSWORD,
+                        dsn=config.ORACLE_DSN,
+                        min=pool_min,
+                        max=pool_max,
+                        increment=config.DB_POOL_INCREMENT,
+                        getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                        wait_timeout=config.DB_POOL_WAIT_TIMEOUT_MS,
+                        ping_interval=config.DB_POOL_PING_INTERVAL,
+                        stmtcachesize=config.DB_STMT_CACHE_SIZE,
+                    )
+        return cls._pool
+
+    @classmethod
+    def closePool(cls):
+        with cls._lock:
+            if cls._pool is not None:
+                cls._pool.close(force=True)
+                cls._pool = None
+
+    @classmethod
+    def _recordWait(cls, waited_ms):
+        SsyMetrics.observe("db_pool_wait_seconds", waited_ms / 1000, {"pool": "sync"}, help="Time spent waiting for a pooled session")
+        with cls._lock:
+            cls._acquire_count += 1
+            cls._wait_total_ms += waited_ms
+            cls._wait_max_ms = max(cls._wait_max_ms, waited_ms)
+
+    @classmethod
+    @contextmanager
+    def acquire(cls):
+        """
+        풀에서 세션을 빌려 (con, cur)를 넘겨줍니다.
+        블록 안에서 예외가 나면 rollback 후 그대로 다시 던지고, 세션은 항상 풀로 반납됩니다.
+
+            with SsyDBManager.acquire() as (con, cur):
+                cur.execute(...)
+                con.commit()
+        """
+        con, cur = cls.makeConCur()
+        try:
+            # DB 왕복(execute/fetch/commit 등)마다 시간/횟수를 SsyMetrics에 기록
+            yield Timed(con, CONNECTION_ROUND_TRIPS), Timed(cur, CURSOR_OPS)
+        except Exception:
+            con.rollback()
+            raise
+        finally:
+            cls.closeConCur(con, cur)
+
+    @classmethod
+    def stats(cls):
+        """풀 크기 조정용 지표 (busy/open 세션 수, 대여 대기 시간)."""
+        pool = cls._pool
+        with cls._lock:
+            count = cls._acquire_count
+            wait_total = cls._wait_total_ms
+            wait_max = cls._wait_max_ms
+        pool_min, pool_max = config.get_settings().db_pool_limits()
+        return {
+            "min": pool_min,
+            "max": pool_max,
+            "increment": config.DB_POOL_INCREMENT,
+            "open": pool.opened if pool else 0,
+            "busy": pool.busy if pool else 0,
+            "acquires": count,
+            "wait_avg_ms": round(wait_total / count, 3) if count else 0.0,
+            "wait_max_ms": round(wait_max, 3),
+        }
+
+    @classmethod
+    def makeConCur(cls):
+        # 기존 호출부 호환용: 풀에서 세션을 빌려옵니다 (closeConCur로 반납)
+        started = time.perf_counter()
+        con = cls.getPool().acquire()
+        cls._recordWait((time.perf_counter() - started) * 1000)
         cur = con.cursor()
         return con, cur
     @staticmethod
@@ -17,4 +103,4 @@ class SsyDBManager:
         if cur:  # Check if cur is not None
             cur.close()
         if con:  # Check if con is not None
-            con.close()
+            con.close()  # 풀 세션은 close() 시 풀로 반납됩니다
@@ -1,10 +1,24 @@
+import hashlib
 import os
+import re
+import secrets
+import threading
+import time
 from datetime import datetime
 from uuid import uuid4
 
+# ULID용 Crockford base32 (I, L, O, U 제외 -> 사전순 = 시간순)
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_SAFE_BASE = re.compile(r"[^0-9A-Za-z가-힣_-]+")
+_HEX64 = re.compile(r"^[0-9a-f]{64}$")
+
 class SsyFileNameGenerator:
+    _lock = threading.Lock()
+    _last_ms = -1
+    _last_rand = 0
+
     @staticmethod
-    def generate(fileName, mode):
+    def generate(fileName, mode, digest=None):
         # 확장자 추출 (예: ".jpeg", ".png")
         base, ext = os.path.splitext(fileName)
         if not ext:
@@ -15,4 +29,50 @@ class SsyFileNameGenerator:
             return f"{base}_{uuid_str}{ext}"
         elif mode == "date":
             now = datetime.today().strftime("%Y%m%d%H%M%S")
-            return f"{base}_{now}{ext}"
\ No newline at end of file
+            return f"{base}_{now}{ext}"
+        elif mode == "hash":
+            # 내용 주소 방식: 파일 내용의 해시(digest)가 곧 이름 -> 같은 파일은 한 번만 저장
+            if not digest:
+                raise ValueError("hash mode requires digest")
+            return f"{digest}{ext.lower()}"
+        elif mode == "ulid":
+            # 시간순 정렬되는 고유 ID + 정리된 원래 이름 (예: 01J9Z3...X_photo.jpg)
+            safe = _SAFE_BASE.sub("_", base).strip("_")[:40]
+            return f"{SsyFileNameGenerator.ulid()}_{safe}{ext.lower()}" if safe else f"{SsyFileNameGenerator.ulid()}{ext.lower()}"
+        raise ValueError(f"Invalid mode: {mode}. Must be 'uuid', 'date', 'hash' or 'ulid'.")
+
+    @classmethod
+    def ulid(cls) -> str:
+        """
+        ULID (26자) = 48비트 밀리초 시각 + 80비트 난수.
+        같은 밀리초 안에서는 직전 난수 + 1 로 프로세스 내 단조 증가를 보장하고,
+        워커/서버 간에는 80비트 난수로 충돌을 피합니다.
+        """
+        with cls._lock:
+            ms = time.time_ns() // 1_000_000
+            if ms <= cls._last_ms:
+                ms = cls._last_ms
+                rand = cls._last_rand + 1
+                if rand >> 80:  # 같은 밀리초에 2^80개를 넘으면 다음 밀리초로
+                    ms, rand = ms + 1, secrets.randbits(80)
+            else:
+                rand = secrets.randbits(80)
+            cls._last_ms, cls._last_rand = ms, rand
+
+        value = (ms << 80) | rand
+        chars = []
+        for _ in range(26):
+            chars.append(_CROCKFORD[value & 31])
+            value >>= 5
+        return "".join(reversed(chars))
+
+    @staticmethod
+    def shard(fileName, depth=2, width=2):
+        """
+        파일 이름 -> 하위 폴더 경로 (예: "ab/cd"). 한 폴더에 파일이 수백만 개 쌓이지 않도록 나눠 담습니다.
+        내용 해시 이름은 해시 앞자리를, 그 밖의 이름(ULID 등)은 이름의 해시를 씁니다
+        (ULID 앞자리는 시각이라 같은 시기 파일이 한 폴더에 몰리기 때문).
+        """
+        stem = os.path.splitext(os.path.basename(fileName))[0].split("_")[0]
+        key = stem if _HEX64.match(stem) else hashlib.sha256(stem.encode()).hexdigest()
+        return os.path.join(*[key[i * width:(i + 1) * width] for i in range(depth)]) if depth > 0 else ""
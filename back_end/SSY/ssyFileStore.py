@@ -0,0 +1,209 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import UploadFile
+from fastapi.responses import FileResponse
+
+from SSY import config
+from SSY.ssyFileNameGenerator import SsyFileNameGenerator
+
+logger = logging.getLogger(__name__)
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UploadNotAllowed(Exception):
+    pass
+
+
+# 프로세스 풀 워커에서 실행 (pickle 가능해야 하므로 모듈 최상위에 둠)
+def _make_thumbnails(src: str, thumb_dir: str, stem: str, sizes: list) -> list:
+    try:
+        from PIL import Image  # 선택 의존성: 없으면 썸네일만 건너뜀
+    except ImportError:
+        logger.warning("thumbnail skipped: Pillow is not installed")
+        return []
+    made = []
+    with Image.open(src) as img:
+        img.load()
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+        for size in sizes:
+            out = os.path.join(thumb_dir, f"{stem}_{size}.webp")
+            if os.path.exists(out):
+                continue
+            thumb = img.copy()
+            thumb.thumbnail((size, size))
+            tmp = out + ".tmp"
+            thumb.save(tmp, "WEBP", quality=80, method=4)
+            os.replace(tmp, out)
+            made.append(out)
+    return made
+
+
+class SsyFileStore:
+    """
+    업로드 파일 저장소 (내용 주소 방식).
+    - 업로드를 청크 단위로 읽어 임시 파일에 쓰면서(디스크 I/O는 스레드로) sha256을 계산하고 크기 한도를 검사합니다.
+    - 파일 이름은 내용 해시라서 같은 이미지는 한 번만 저장됩니다.
+      (같은 초에 올라온 두 파일도 내용이 다르면 이름이 다르므로 덮어쓰지 않음. ULID 이름은 같은 내용을
+       따로 보관해야 하는 업로드용으로 SsyFileNameGenerator에 남겨 둠: 중복 제거/immutable 캐시와는 맞지 않음)
+    - 썸네일(WebP)은 응답과 별개로 백그라운드 프로세스 풀에서 만듭니다.
+    - save()는 파일마다 사용 중 표시(참조 수)를 올리고 호출자는 끝나면 release() 합니다.
+      같은 내용을 올린 다른 요청이 아직 진행 중이면 release(discard=True)도 파일을 지우지 않습니다.
+      (표시는 프로세스 안에서만 보이므로 이미 DB에 기록된 참조는 호출자가 확인한 뒤 discard를 정해야 함)
+    """
+    _executor = None
+    _tasks = set()
+    _lock = threading.Lock()
+    _refs = {}  # 파일 이름 -> 진행 중인 save() 수
+    NAME_RE = re.compile(r"^[0-9a-f]{64}(_\d+)?\.[a-z0-9]{1,5}$")
+
+    @classmethod
+    def folder(cls) -> str:
+        os.makedirs(config.UPLOAD_DIR, exist_ok=True)
+        return config.UPLOAD_DIR
+
+    @classmethod
+    def path(cls, file_name: str, thumb: bool = False) -> str:
+        # 샤딩된 위치 (예: ./psa/ab/cd/<이름>, ./psa/thumbs/ab/cd/<이름>)
+        shard = SsyFileNameGenerator.shard(file_name, config.UPLOAD_SHARD_DEPTH)
+        return os.path.join(config.UPLOAD_DIR, "thumbs" if thumb else "", shard, file_name)
+
+    @classmethod
+    def find(cls, file_name: str, thumb: bool = False):
+        # 샤딩 이전에 평평하게 저장된 파일도 찾아줌
+        for path in (cls.path(file_name, thumb), os.path.join(config.UPLOAD_DIR, "thumbs" if thumb else "", file_name)):
+            if os.path.isfile(path):
+                return path
+        return None
+
+    # === 저장 ===
+    @classmethod
+    async def save(cls, upload: UploadFile):
+        """
+        -> (파일 이름, 새로 저장했는지)
+        이미 같은 내용이 있으면 (이름, False): 다른 사용자가 쓰는 파일일 수 있으니 호출자가 지우면 안 됩니다.
+        어느 쪽이든 끝나면 release(이름) 해야 합니다.
+        """
+        ext = os.path.splitext(upload.filename or "")[1].lower() or ".jpeg"
+        if ext not in config.UPLOAD_ALLOWED_EXTS:
+            raise UploadNotAllowed(ext)
+
+        folder = cls.folder()
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while True:
+                    chunk = await upload.read(config.UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > config.UPLOAD_MAX_BYTES:
+                        raise UploadTooLarge(size)
+                    digest.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+
+            file_name = SsyFileNameGenerator.generate(upload.filename or "", "hash", digest=digest.hexdigest())
+            # 있는지 확인 + 옮기기 + 사용 중 표시를 release()의 삭제와 겹치지 않게 한 번에
+            with cls._lock:
+                cls._refs[file_name] = cls._refs.get(file_name, 0) + 1
+                if cls.find(file_name):
+                    os.remove(tmp_path)
+                    return file_name, False
+                final_path = cls.path(file_name)
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(tmp_path, final_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        cls.schedule_thumbnails(file_name)
+        return file_name, True
+
+    @classmethod
+    def release(cls, file_name: str, discard: bool = False):
+        """
+        save()의 사용 중 표시를 내림. discard면 (save()가 새로 만든 파일을 되돌릴 때)
+        같은 파일을 쓰는 다른 진행 중 요청이 없을 때만 파일과 썸네일을 지웁니다.
+        """
+        with cls._lock:
+            left = cls._refs.get(file_name, 0) - 1
+            if left > 0:
+                cls._refs[file_name] = left
+                return
+            cls._refs.pop(file_name, None)
+            if discard:
+                cls._remove(file_name)
+
+    @classmethod
+    def _remove(cls, file_name: str):
+        stem = os.path.splitext(file_name)[0]
+        for path in [cls.find(file_name)] + [cls.find(f"{stem}_{s}.webp", thumb=True) for s in config.THUMBNAIL_SIZES]:
+            if path:
+                os.remove(path)
+
+    # === 썸네일 (백그라운드) ===
+    @classmethod
+    def getExecutor(cls):
+        if cls._executor is None:
+            # SsyPasswordHasher와 같이 spawn (스레드가 있는 서버 프로세스를 fork하지 않음)
+            cls._executor = ProcessPoolExecutor(max_workers=config.THUMBNAIL_WORKERS,
+                                                mp_context=multiprocessing.get_context("spawn"))
+        return cls._executor
+
+    @classmethod
+    def schedule_thumbnails(cls, file_name: str):
+        if not config.THUMBNAIL_SIZES:
+            return
+        thumb_dir = os.path.dirname(cls.path(file_name, thumb=True))
+        os.makedirs(thumb_dir, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            cls.getExecutor(), _make_thumbnails,
+            cls.path(file_name), thumb_dir,
+            os.path.splitext(file_name)[0], config.THUMBNAIL_SIZES,
+        )
+        cls._tasks.add(future)
+        future.add_done_callback(cls._done)
+
+    @classmethod
+    def _done(cls, future):
+        cls._tasks.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("thumbnail failed", exc_info=future.exception())
+
+    @classmethod
+    async def shutdown(cls):
+        if cls._tasks:
+            await asyncio.gather(*cls._tasks, return_exceptions=True)
+        if cls._executor is not None:
+            executor, cls._executor = cls._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    # === 제공 (장기 캐시) ===
+    @classmethod
+    def response(cls, file_name: str, thumb: bool = False):
+        """파일 이름 검증 후 FileResponse, 없으면 None"""
+        if not cls.NAME_RE.match(file_name or ""):
+            return None
+        path = cls.find(file_name, thumb)
+        if path is None:
+            return None
+        # 이름이 내용 해시이므로 내용이 바뀌지 않음 -> immutable
+        # CORS 헤더는 앱의 CORSMiddleware가 붙임
+        return FileResponse(path, headers={
+            "Cache-Control": f"public, max-age={config.UPLOAD_CACHE_MAX_AGE}, immutable",
+        })
@@ -0,0 +1,110 @@
+import hashlib
+import itertools
+import time
+
+from fastapi import Request, Response
+
+from SSY import config
+
+
+# === ETag / 조건부 GET ===
+def make_etag(*parts) -> str:
+    """버전/조회 조건 등으로 만든 강한 ETag (같은 입력이면 같은 값)"""
+    digest = hashlib.sha1("\x1f".join("" if p is None else str(p) for p in parts).encode()).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    # If-None-Match는 약한 비교 (W/ 접두어 무시), "*"는 항상 일치
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def not_modified_response(etag: str, cache_control: str, vary: str = None) -> Response:
+    # 304에도 200과 같은 Vary를 실어야 공유 캐시가 다른 사용자의 응답으로 재검증하지 않음
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if vary:
+        headers["Vary"] = vary
+    return Response(status_code=304, headers=headers)
+
+
+class VersionStore:
+    """
+    키(예: 사용자별 생산 기록)마다 바뀔 때만 올라가는 버전.
+    읽기 라우트는 버전으로 ETag를 만들어 DB 조회 없이 304를 돌려주고, 쓰기 라우트는 성공 후 bump() 합니다.
+    버전 값은 저장소가 새로 시작될 때(재기동/키 만료) 이전 값과 겹치지 않도록 시각을 섞어 만듭니다.
+    """
+
+    async def get(self, key: str) -> str:
+        raise NotImplementedError
+
+    async def bump(self, key: str):
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
+
+
+class MemoryVersionStore(VersionStore):
+    """프로세스 내 버전. 다른 워커의 쓰기를 모르므로 웹 워커가 하나일 때만 쓰세요 (다중 워커는 redis)."""
+
+    def __init__(self):
+        self._epoch = f"{time.time_ns():x}"
+        self._versions = {}
+        self._counter = itertools.count(1)
+
+    async def get(self, key: str) -> str:
+        # 처음 보는 키도 전역 카운터에서 값을 받아 둠 -> 쓰기가 없던 키끼리 같은 버전("epoch.0")을 나눠 갖지 않음
+        version = self._versions.get(key)
+        if version is None:
+            version = self._versions.setdefault(key, next(self._counter))
+        return f"{self._epoch}.{version}"
+
+    async def bump(self, key: str):
+        # 키마다 따로 세지 않고 전역 카운터를 써서 지운 뒤 다시 생긴 키도 이전 값과 겹치지 않음
+        self._versions[key] = next(self._counter)
+
+
+class RedisVersionStore(VersionStore):
+    """Redis INCR 버전. 모든 워커/서버가 같은 버전을 봅니다."""
+
+    def __init__(self, url: str, prefix: str = "ver:", ttl_seconds: int = 7 * 24 * 3600):
+        import redis.asyncio as redis  # 선택 의존성: CACHE_VERSION_BACKEND=redis 일 때만 필요
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+        self.ttl = ttl_seconds
+
+    async def get(self, key: str) -> str:
+        k = f"{self.prefix}{key}"
+        # 처음 보는(또는 만료된) 키는 현재 시각(ms)에서 시작 -> 예전 ETag와 겹치지 않음 (왕복 한 번)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.set(k, time.time_ns() // 1_000_000, nx=True, ex=self.ttl)
+            pipe.get(k)
+            _, value = await pipe.execute()
+        return value.decode()
+
+    async def bump(self, key: str):
+        k = f"{self.prefix}{key}"
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.set(k, time.time_ns() // 1_000_000, nx=True, ex=self.ttl)
+            pipe.incr(k)
+            pipe.expire(k, self.ttl)
+            await pipe.execute()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+def create_version_store(backend: str = None) -> VersionStore:
+    backend = (backend or config.CACHE_VERSION_BACKEND).lower()
+    if backend == "memory":
+        return MemoryVersionStore()
+    if backend == "redis":
+        return RedisVersionStore(config.REDIS_URL)
+    raise ValueError(f"Invalid cache version backend: {backend}. Must be 'memory' or 'redis'.")
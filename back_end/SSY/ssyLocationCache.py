@@ -0,0 +1,84 @@
+import asyncio
+
+from SSY.ssyMetadata import SsyMetadata
+
+class SsyLocationCache:
+    """
+    LOCATIONS(주소 차원 테이블) 프로세스 내 캐시.
+    - (si_do, si_gun_gu, dong, detail_address) -> location_id, location_id -> 주소
+    - 앱 기동 시 warm()으로 전부 읽고, 이후에는 refresh()로 마지막으로 본 LOCATION_ID 이후 행만 가져옵니다.
+      (LOCATIONS는 재사용만 하고 지우지 않는 차원 테이블이라 ID 증가분만 보면 됩니다)
+    - 가입 시 주소 ID를 쿼리 없이 찾고, 지역별 집계/작물 추천에서 LOCATIONS 조인을 대신합니다.
+    """
+    _by_key = {}
+    _by_id = {}
+    _max_id = 0
+    _lock = asyncio.Lock()
+
+    @staticmethod
+    def key(si_do, si_gun_gu, dong, detail_address=None):
+        # Oracle은 빈 문자열을 NULL로 저장하므로 같은 규칙으로 맞춤
+        return (si_do or None, si_gun_gu or None, dong or None, detail_address or None)
+
+    @classmethod
+    def size(cls) -> int:
+        return len(cls._by_id)
+
+    @classmethod
+    def _add(cls, location_id, si_do, si_gun_gu, dong, detail_address):
+        location_id = int(location_id)
+        k = cls.key(si_do, si_gun_gu, dong, detail_address)
+        # 중복 주소가 남아 있으면(정리 전 데이터) 가장 작은 ID를 대표로
+        if k not in cls._by_key or location_id < cls._by_key[k]:
+            cls._by_key[k] = location_id
+        cls._by_id[location_id] = k
+        cls._max_id = max(cls._max_id, location_id)
+
+    @classmethod
+    def put(cls, location_id, si_do, si_gun_gu, dong, detail_address=None):
+        if location_id is not None:
+            cls._add(location_id, si_do, si_gun_gu, dong, detail_address)
+
+    @classmethod
+    async def warm(cls, cur):
+        await cls.refresh(cur, full=True)
+
+    @classmethod
+    async def refresh(cls, cur, full: bool = False):
+        async with cls._lock:
+            await SsyMetadata.ensure(cur)
+            if full:
+                cls._by_key, cls._by_id, cls._max_id = {}, {}, 0
+            await cur.execute(
+                f"""
+                SELECT LOCATION_ID, SI_DO, SI_GUN_GU, DONG, DETAIL_ADDRESS
+                  FROM {SsyMetadata.table("LOCATIONS")}
+                 WHERE LOCATION_ID > :P_AFTER
+                 ORDER BY LOCATION_ID
+                """,
+                {"P_AFTER": cls._max_id},
+            )
+            for row in await cur.fetchall():
+                cls._add(*row)
+
+    # === 조회 ===
+    @classmethod
+    def get(cls, si_do, si_gun_gu, dong, detail_address=None):
+        return cls._by_key.get(cls.key(si_do, si_gun_gu, dong, detail_address))
+
+    @classmethod
+    def address(cls, location_id):
+        """location_id -> {'si_do', 'si_gun_gu', 'dong', 'detail_address'} 또는 None"""
+        k = cls._by_id.get(int(location_id)) if location_id is not None else None
+        if k is None:
+            return None
+        return {"si_do": k[0], "si_gun_gu": k[1], "dong": k[2], "detail_address": k[3]}
+
+    @classmethod
+    async def address_or_refresh(cls, cur, location_id):
+        # 다른 워커가 새로 넣은 주소면 증가분만 읽고 다시 찾음
+        found = cls.address(location_id)
+        if found is None and location_id is not None:
+            await cls.refresh(cur)
+            found = cls.address(location_id)
+        return found
@@ -0,0 +1,287 @@
+import asyncio
+import logging
+import time
+
+from SSY import config
+from SSY.emailer import SmtpSender
+from SSY.ssyAsyncDBManager import SsyAsyncDBManager
+from SSY.ssyMetadata import SsyMetadata
+from SSY.ssyMetrics import SsyMetrics
+
+logger = logging.getLogger(__name__)
+
+class SsyMailWorker:
+    """
+    메일 발송 큐(MAIL_OUTBOX) 처리기.
+    - enqueue(): 요청 처리 트랜잭션 안에서 outbox에 한 줄 INSERT (commit은 호출자가)
+    - 백그라운드 워커 N개: 대기 메일을 가져가(SENDING) 발송하고 결과를 기록
+      워커마다 공급자별 SMTP 연결을 유지해 메일마다 연결/STARTTLS/로그인을 반복하지 않습니다.
+    - 실패 시 config.MAIL_PROVIDERS 순서대로 다음 공급자로 넘기고,
+      모두 실패하면 지수 백오프로 재시도, MAIL_MAX_ATTEMPTS 초과 시 FAILED
+    - 유효 시간(ttl_seconds)이 있는 메일(OTP 등)은 그 시간이 지나면 보내지 않고 지우며, 그 뒤로 잡히는 재시도는 하지 않음
+    - 본문은 발송 완료/최종 실패 시 비우고(BODY_HTML = NULL), 끝난 행은 MAIL_RETENTION_HOURS 뒤에 삭제
+    """
+    PURGE_INTERVAL = 600  # 끝난 메일 정리 주기(초)
+
+    _tasks = []
+    _wake = None
+    _stopping = False
+    _next_purge = 0.0
+
+    # === 큐 적재 (호출자 트랜잭션에 포함) ===
+    @staticmethod
+    async def enqueue(cur, to_email: str, subject: str, html: str, ttl_seconds: float = None):
+        """ttl_seconds: 이 시간 안에 못 보내면 의미 없는 메일(인증번호 등). 지나면 발송/재시도하지 않음"""
+        await SsyMetadata.ensure(cur)
+        await cur.execute(
+            f"""
+            INSERT INTO {SsyMetadata.table("MAIL_OUTBOX")} (TO_EMAIL, SUBJECT, BODY_HTML, EXPIRES_AT)
+            VALUES (:P_TO, :P_SUBJECT, :P_BODY,
+                    CASE WHEN :P_TTL IS NULL THEN NULL ELSE SYSTIMESTAMP + NUMTODSINTERVAL(:P_TTL, 'SECOND') END)
+            """,
+            {"P_TO": to_email, "P_SUBJECT": subject, "P_BODY": html, "P_TTL": ttl_seconds},
+        )
+
+    @classmethod
+    def notify(cls):
+        # commit 직후 호출: 폴링 주기를 기다리지 않고 워커를 깨움
+        if cls._wake is not None:
+            cls._wake.set()
+
+    # === 워커 시작/종료 ===
+    @classmethod
+    def start(cls, workers: int = None):
+        if cls._tasks:
+            return
+        cls._wake = asyncio.Event()
+        cls._stopping = False
+        cls._tasks = [asyncio.create_task(cls._run()) for _ in range(workers or config.MAIL_WORKERS)]
+
+    @classmethod
+    async def stop(cls, timeout: float = 30):
+        """발송 예정 시각이 된 메일을 모두 보낸 뒤 종료 (timeout 초과 시 취소)."""
+        if not cls._tasks:
+            return
+        cls._stopping = True
+        cls._wake.set()
+        done, pending = await asyncio.wait(cls._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        cls._tasks = []
+
+    @classmethod
+    async def _run(cls):
+        senders = {}  # 공급자 -> SmtpSender (이 워커 전용 연결)
+        try:
+            while True:
+                try:
+                    claimed = await cls._process_batch(senders)
+                except Exception:
+                    logger.exception("mail worker batch failed")
+                    claimed = 0
+                if claimed:
+                    continue
+                if cls._stopping:
+                    break
+                if time.monotonic() >= cls._next_purge:
+                    cls._next_purge = time.monotonic() + cls.PURGE_INTERVAL  # 워커 하나만 정리
+                    try:
+                        await cls.purge()
+                    except Exception:
+                        logger.exception("mail purge failed")
+                try:
+                    await asyncio.wait_for(cls._wake.wait(), timeout=config.MAIL_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                cls._wake.clear()
+        finally:
+            for sender in senders.values():
+                await asyncio.to_thread(sender.close)
+
+    # === 한 묶음 처리: 가져오기 -> (세션 반납) 발송 -> 결과 기록 ===
+    @classmethod
+    async def _process_batch(cls, senders) -> int:
+        messages = await cls._claim()
+        if not messages:
+            return 0
+
+        results = []
+        for msg_id, to_email, subject, html, attempts, deadline in messages:
+            if deadline is not None and time.monotonic() >= deadline:
+                # 묶음 안에서 앞 메일 발송이 밀려 유효 시간이 지남: 보내지 않음
+                results.append((msg_id, attempts, None, "expired before delivery", deadline))
+                continue
+            provider, error = await cls._deliver(senders, to_email, subject, html)
+            results.append((msg_id, attempts + 1, provider, error, deadline))
+
+        await cls._record(results)
+        return len(messages)
+
+    @classmethod
+    async def _claim(cls):
+        async with SsyAsyncDBManager.acquire() as (con, cur):
+            await SsyMetadata.ensure(cur)
+            t = SsyMetadata.table("MAIL_OUTBOX")
+
+            # 워커가 죽어 SENDING에 멈춘 메일 회수
+            await cur.execute(
+                f"""
+                UPDATE {t}
+                   SET STATUS = 'PENDING', LOCKED_AT = NULL
+                 WHERE STATUS = 'SENDING'
+                   AND LOCKED_AT < SYSTIMESTAMP - NUMTODSINTERVAL(:P_STALE, 'SECOND')
+                """,
+                {"P_STALE": config.MAIL_STALE_SENDING_SECONDS},
+            )
+            # 유효 시간이 지난 대기 메일(만료된 인증번호)은 보내지 않고 삭제
+            await cur.execute(f"DELETE FROM {t} WHERE STATUS = 'PENDING' AND EXPIRES_AT <= SYSTIMESTAMP")
+
+            await cur.execute(
+                f"""
+                SELECT ID
+                  FROM {t}
+                 WHERE STATUS = 'PENDING'
+                   AND NEXT_ATTEMPT_AT <= SYSTIMESTAMP
+                 ORDER BY NEXT_ATTEMPT_AT, ID
+                 FETCH FIRST :P_N ROWS ONLY
+                """,
+                {"P_N": config.MAIL_BATCH_SIZE},
+            )
+            ids = [r[0] for r in await cur.fetchall()]
+            if not ids:
+                await con.commit()
+                return []
+
+            # 다른 워커/프로세스와 겹치지 않도록 PENDING인 것만 SENDING으로 (행 단위로 선점 확인)
+            await cur.executemany(
+                f"""
+                UPDATE {t}
+                   SET STATUS = 'SENDING', LOCKED_AT = SYSTIMESTAMP
+                 WHERE ID = :P_ID AND STATUS = 'PENDING'
+                """,
+                [{"P_ID": i} for i in ids],
+                arraydmlrowcounts=True,
+            )
+            claimed = [i for i, n in zip(ids, cur.getarraydmlrowcounts()) if n]
+            await con.commit()
+            if not claimed:
+                return []
+
+            binds = {f"P_ID{n}": i for n, i in enumerate(claimed)}
+            await cur.execute(
+                f"""
+                SELECT ID, TO_EMAIL, SUBJECT, BODY_HTML, ATTEMPTS,
+                       (CAST(EXPIRES_AT AS DATE) - SYSDATE) * 86400 AS TTL_LEFT
+                  FROM {t}
+                 WHERE ID IN ({", ".join(":" + k for k in binds)})
+                 ORDER BY ID
+                """,
+                binds,
+            )
+            messages = []
+            now = time.monotonic()
+            for msg_id, to_email, subject, body, attempts, ttl_left in await cur.fetchall():
+                if hasattr(body, "read"):  # CLOB
+                    body = await body.read()
+                deadline = None if ttl_left is None else now + float(ttl_left)  # DB 시각 대신 이 프로세스 시계 기준
+                messages.append((msg_id, to_email, subject, body, int(attempts or 0), deadline))
+            return messages
+
+    @classmethod
+    async def _deliver(cls, senders, to_email, subject, html):
+        """공급자 순서대로 시도. (성공한 공급자, None) 또는 (None, 오류 요약)"""
+        errors = []
+        for provider in config.MAIL_PROVIDERS:
+            try:
+                sender = senders.get(provider)
+                if sender is None:
+                    sender = senders[provider] = SmtpSender(provider)
+                async with SsyMetrics.atimer("external_call_duration_seconds", {"service": f"smtp_{provider}"},
+                                             help="Outbound call duration (weather API, SMTP)"):
+                    await asyncio.to_thread(sender.send, to_email, subject, html)
+                return provider, None
+            except Exception as e:
+                SsyMetrics.inc("external_call_errors_total", {"service": f"smtp_{provider}"}, help="Failed outbound calls")
+                errors.append(f"{provider}: {e}")
+                if provider in senders:
+                    await asyncio.to_thread(senders[provider].close)
+        return None, "; ".join(errors) or "no mail provider configured"
+
+    @staticmethod
+    def _retry_delay(attempts: int) -> float:
+        return min(config.MAIL_RETRY_BASE_SECONDS * (2 ** (attempts - 1)), config.MAIL_RETRY_MAX_SECONDS)
+
+    @classmethod
+    def _plan_failures(cls, results, now: float):
+        """실패한 메일 -> (재시도 목록, 최종 실패 목록). 유효 시간 안에 다시 보낼 수 없으면 최종 실패"""
+        retry, final = [], []
+        for i, a, p, err, deadline in results:
+            if err is None:
+                continue
+            delay = cls._retry_delay(a)
+            item = {"P_ID": i, "P_ATTEMPTS": a, "P_ERROR": err[:1000]}
+            if a >= config.MAIL_MAX_ATTEMPTS or (deadline is not None and now + delay >= deadline):
+                final.append(item)
+            else:
+                retry.append({**item, "P_DELAY": delay})
+        return retry, final
+
+    @classmethod
+    async def _record(cls, results):
+        sent = [{"P_ID": i, "P_ATTEMPTS": a, "P_PROVIDER": p} for i, a, p, err, _ in results if err is None]
+        retry, final = cls._plan_failures(results, time.monotonic())
+        for item in retry + final:
+            logger.warning("mail %s 발송 실패 (%s회): %s", item["P_ID"], item["P_ATTEMPTS"], item["P_ERROR"])
+
+        # 보낸 메일과 최종 실패한 메일은 본문(인증번호 등)을 남기지 않음
+        async with SsyAsyncDBManager.acquire() as (con, cur):
+            t = SsyMetadata.table("MAIL_OUTBOX")
+            if sent:
+                await cur.executemany(
+                    f"""
+                    UPDATE {t}
+                       SET STATUS = 'SENT', SENT_AT = SYSTIMESTAMP, LOCKED_AT = NULL, BODY_HTML = NULL,
+                           ATTEMPTS = :P_ATTEMPTS, PROVIDER = :P_PROVIDER, LAST_ERROR = NULL
+                     WHERE ID = :P_ID
+                    """,
+                    sent,
+                )
+            if retry:
+                await cur.executemany(
+                    f"""
+                    UPDATE {t}
+                       SET STATUS = 'PENDING', LOCKED_AT = NULL, ATTEMPTS = :P_ATTEMPTS,
+                           NEXT_ATTEMPT_AT = SYSTIMESTAMP + NUMTODSINTERVAL(:P_DELAY, 'SECOND'),
+                           LAST_ERROR = :P_ERROR
+                     WHERE ID = :P_ID
+                    """,
+                    retry,
+                )
+            if final:
+                await cur.executemany(
+                    f"""
+                    UPDATE {t}
+                       SET STATUS = 'FAILED', LOCKED_AT = NULL, BODY_HTML = NULL,
+                           ATTEMPTS = :P_ATTEMPTS, LAST_ERROR = :P_ERROR
+                     WHERE ID = :P_ID
+                    """,
+                    final,
+                )
+            await con.commit()
+
+    # === 끝난 메일 정리 (SENT/FAILED 행을 보관 기간 뒤 삭제) ===
+    @classmethod
+    async def purge(cls) -> int:
+        async with SsyAsyncDBManager.acquire() as (con, cur):
+            await SsyMetadata.ensure(cur)
+            await cur.execute(
+                f"""
+                DELETE FROM {SsyMetadata.table("MAIL_OUTBOX")}
+                 WHERE STATUS IN ('SENT', 'FAILED')
+                   AND CREATED_AT < SYSTIMESTAMP - NUMTODSINTERVAL(:P_HOURS, 'HOUR')
+                """,
+                {"P_HOURS": config.MAIL_RETENTION_HOURS},
+            )
+            deleted = cur.rowcount
+            await con.commit()
+            return deleted
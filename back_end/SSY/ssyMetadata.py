@@ -0,0 +1,113 @@
+import asyncio
+
+from SSY import config
+
+class SsyMetadata:
+    """
+    DAO들이 함께 쓰는 스키마/테이블 메타데이터 캐시.
+    스키마, 완전수식 테이블 이름, PK 컬럼, 컬럼 목록을 앱 기동 시(lifespan) 한 번에 조회해 둡니다.
+    데이터 사전(ALL_*) 조회가 첫 사용자 요청에 얹히지 않게 하기 위함입니다.
+    테이블 구조가 바뀌면 invalidate() 후 다시 warm() 하면 됩니다.
+    """
+    TABLES = ("USERS", "EMAIL_TOKENS", "LOCATIONS", "PRODUCE_LOGS", "PRODUCE_LOG_ROLLUPS", "MAIL_OUTBOX")
+    # PK 제약이 없을 때 쓰는 흔한 PK 이름
+    PK_FALLBACKS = ("ID", "USER_ID", "USERS_ID")
+
+    _schema = None
+    _pks = {}
+    _columns = {}
+    _lock = asyncio.Lock()
+
+    @classmethod
+    def ready(cls) -> bool:
+        return cls._schema is not None
+
+    @classmethod
+    def schema(cls):
+        """확정된 스키마(소유자) 이름, 아직 조회 전이면 None"""
+        return cls._schema
+
+    @classmethod
+    def invalidate(cls):
+        cls._schema = None
+        cls._pks = {}
+        cls._columns = {}
+
+    @classmethod
+    async def ensure(cls, cur):
+        # lifespan에서 못 데웠을 때(DB 기동 지연 등)를 위한 지연 초기화
+        if cls._schema is None:
+            await cls.warm(cur)
+
+    @classmethod
+    async def warm(cls, cur):
+        async with cls._lock:
+            if cls._schema is not None:
+                return
+
+            # 1) config에 DB_SCHEMA 있으면 사용, 없으면 현재 세션 스키마
+            schema = (getattr(config, "DB_SCHEMA", None) or "").upper()
+            if not schema:
+                await cur.execute("SELECT SYS_CONTEXT('USERENV','CURRENT_SCHEMA') FROM dual")
+                schema = ((await cur.fetchone())[0] or "").upper()
+
+            binds = {"P_OWNER": schema}
+            binds.update({f"P_T{i}": t for i, t in enumerate(cls.TABLES)})
+            in_list = ", ".join(f":P_T{i}" for i in range(len(cls.TABLES)))
+
+            # 2) 컬럼 목록 (테이블 전체 한 번에)
+            await cur.execute(
+                f"""
+                SELECT table_name, column_name
+                  FROM all_tab_columns
+                 WHERE owner = :P_OWNER
+                   AND table_name IN ({in_list})
+                 ORDER BY table_name, column_id
+                """,
+                binds,
+            )
+            columns = {}
+            for table, column in await cur.fetchall():
+                columns.setdefault(table, []).append(column)
+
+            # 3) PK 컬럼 (단일 컬럼 PK 기준)
+            await cur.execute(
+                f"""
+                SELECT cons.table_name, cols.column_name
+                  FROM all_constraints cons
+                  JOIN all_cons_columns cols
+                    ON cons.owner = cols.owner
+                   AND cons.constraint_name = cols.constraint_name
+                   AND cons.table_name = cols.table_name
+                 WHERE cons.constraint_type = 'P'
+                   AND cons.owner = :P_OWNER
+                   AND cons.table_name IN ({in_list})
+                 ORDER BY cons.table_name, cols.position
+                """,
+                binds,
+            )
+            pks = {}
+            for table, column in await cur.fetchall():
+                pks.setdefault(table, column)
+
+            cls._columns = columns
+            cls._pks = pks
+            cls._schema = schema
+
+    @classmethod
+    def table(cls, name: str) -> str:
+        # 모든 테이블을 소유자 접두사로 완전수식
+        return f"{cls._schema}.{name}" if cls._schema else name
+
+    @classmethod
+    def pk(cls, name: str) -> str:
+        if name in cls._pks:
+            return cls._pks[name]
+        for col in cls.PK_FALLBACKS:
+            if col in cls._columns.get(name, ()):
+                return col
+        return "ID"
+
+    @classmethod
+    def columns(cls, name: str) -> list:
+        return list(cls._columns.get(name, ()))
@@ -0,0 +1,205 @@
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from SSY import config
+
+logger = logging.getLogger(__name__)
+
+# 요청 하나 동안의 DB 지표 [왕복 수, DB 시간(초)] (미들웨어가 요청마다 새로 넣음, 백그라운드 작업은 None)
+_request_db = contextvars.ContextVar("ssy_request_db", default=None)
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+
+class SsyMetrics:
+    """
+    프로세스 내 지표 저장소 (Prometheus 텍스트 형식으로 /metrics 에 노출, X-Admin-Token 필요).
+    - 히스토그램: 라우트별 처리 시간, DB 문장 시간, 외부 호출(날씨 API/SMTP) 시간, 요청당 DB 왕복 수
+    - 카운터: 외부 호출 결과 등
+    지표 이름/라벨 종류가 몇 개뿐이라 외부 라이브러리 없이 dict로 충분합니다.
+    """
+    _lock = threading.Lock()
+    _histograms = {}  # name -> {labels(tuple): [bucket counts..., sum, count]}
+    _buckets = {}     # name -> buckets
+    _counters = {}    # name -> {labels(tuple): value}
+    _help = {}
+
+    # === 기록 ===
+    @classmethod
+    def observe(cls, name: str, value: float, labels: dict = None, buckets=DEFAULT_BUCKETS, help: str = ""):
+        key = tuple(sorted((labels or {}).items()))
+        with cls._lock:
+            series = cls._histograms.setdefault(name, {})
+            cls._buckets.setdefault(name, buckets)
+            cls._help.setdefault(name, help)
+            b = cls._buckets[name]
+            slot = series.get(key)
+            if slot is None:
+                slot = series[key] = [0] * (len(b) + 2)
+            slot[bisect.bisect_left(b, value)] += 1  # value가 들어가는 첫 버킷 (마지막 칸은 +Inf)
+            slot[-2] += value
+            slot[-1] += 1
+
+    @classmethod
+    def inc(cls, name: str, labels: dict = None, amount: float = 1, help: str = ""):
+        key = tuple(sorted((labels or {}).items()))
+        with cls._lock:
+            series = cls._counters.setdefault(name, {})
+            cls._help.setdefault(name, help)
+            series[key] = series.get(key, 0) + amount
+
+    @classmethod
+    @contextmanager
+    def timer(cls, name: str, labels: dict = None, help: str = ""):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            cls.observe(name, time.perf_counter() - started, labels, help=help)
+
+    @classmethod
+    @asynccontextmanager
+    async def atimer(cls, name: str, labels: dict = None, help: str = ""):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            cls.observe(name, time.perf_counter() - started, labels, help=help)
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._histograms, cls._buckets, cls._counters, cls._help = {}, {}, {}, {}
+
+    # === 노출 (Prometheus text format 0.0.4) ===
+    @staticmethod
+    def _fmt_labels(key, extra=()):
+        items = list(key) + list(extra)
+        if not items:
+            return ""
+        escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+    @classmethod
+    def render(cls) -> str:
+        lines = []
+        with cls._lock:
+            for name, series in cls._histograms.items():
+                if cls._help.get(name):
+                    lines.append(f"# HELP {name} {cls._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                buckets = cls._buckets[name]
+                for key, slot in series.items():
+                    cumulative = 0
+                    for le, n in zip(list(buckets) + ["+Inf"], slot[:-2]):
+                        cumulative += n
+                        lines.append(f"{name}_bucket{cls._fmt_labels(key, [('le', le)])} {cumulative}")
+                    lines.append(f"{name}_sum{cls._fmt_labels(key)} {slot[-2]}")
+                    lines.append(f"{name}_count{cls._fmt_labels(key)} {slot[-1]}")
+            for name, series in cls._counters.items():
+                if cls._help.get(name):
+                    lines.append(f"# HELP {name} {cls._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{cls._fmt_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    # === 요청 단위 DB 지표 ===
+    @staticmethod
+    def begin_request():
+        return _request_db.set([0, 0.0])
+
+    @staticmethod
+    def request_stats():
+        """진행 중인 요청의 [왕복 수, DB 시간] (요청 밖이면 None)"""
+        return _request_db.get()
+
+    @staticmethod
+    def end_request(token):
+        stats = _request_db.get()
+        _request_db.reset(token)
+        return stats
+
+    @classmethod
+    def record_db(cls, op: str, seconds: float, sql: str = None):
+        cls.observe("db_statement_duration_seconds", seconds, {"op": op},
+                    help="Oracle call duration by operation")
+        stats = _request_db.get()
+        if stats is not None:
+            # fetch는 prefetch/arraysize 버퍼에서 나오는 경우가 많아 왕복 수에는 넣지 않음 (기다린 시간은 DB 시간에 포함)
+            if op not in CURSOR_FETCHES:
+                stats[0] += 1
+            stats[1] += seconds
+        if config.SLOW_QUERY_MS and seconds * 1000 >= config.SLOW_QUERY_MS:
+            statement = " ".join((sql or "").split())[:300]
+            logger.warning("slow query %.1fms [%s]: %s", seconds * 1000, op, statement)
+
+
+# 호출마다 DB에 다녀오는 것 (왕복 수로 셈)
+CURSOR_ROUND_TRIPS = ("execute", "executemany", "callproc", "callfunc")
+CONNECTION_ROUND_TRIPS = ("commit", "rollback")
+# 버퍼가 비었을 때만 DB에 가는 것 (시간만 잼)
+CURSOR_FETCHES = ("fetchone", "fetchmany", "fetchall")
+CURSOR_OPS = CURSOR_ROUND_TRIPS + CURSOR_FETCHES
+
+
+class _Timed:
+    """
+    oracledb 커서/연결 대리 객체: DB에 다녀오는 호출(ops)마다 SsyMetrics.record_db() 로 시간/왕복 수를 남기고,
+    나머지 속성(var, description, rowcount, arraysize 설정 등)은 원래 객체로 그대로 넘깁니다.
+    """
+
+    def __init__(self, target, ops):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_ops", ops)
+        object.__setattr__(self, "_last_sql", None)
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __iter__(self):
+        return iter(self._target)
+
+    def _remember(self, name, args):
+        if name in ("execute", "executemany") and args:
+            object.__setattr__(self, "_last_sql", args[0])
+
+
+class TimedAsync(_Timed):
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name not in self._ops:
+            return attr
+
+        async def timed(*args, **kwargs):
+            self._remember(name, args)
+            started = time.perf_counter()
+            try:
+                return await attr(*args, **kwargs)
+            finally:
+                SsyMetrics.record_db(name, time.perf_counter() - started, self._last_sql)
+        return timed
+
+    def __aiter__(self):
+        return self._target.__aiter__()
+
+
+class Timed(_Timed):
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name not in self._ops:
+            return attr
+
+        def timed(*args, **kwargs):
+            self._remember(name, args)
+            started = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                SsyMetrics.record_db(name, time.perf_counter() - started, self._last_sql)
+        return timed
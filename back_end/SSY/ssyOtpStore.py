@@ -0,0 +1,193 @@
+import base64
+import hashlib
+import hmac
+import time
+from datetime import datetime, timedelta
+
+from SSY import config
+from SSY.ssyMetadata import SsyMetadata
+
+# verify() 결과
+OTP_OK = "ok"
+OTP_INVALID = "invalid"   # 코드 불일치 / 만료 / 발급 이력 없음
+OTP_LOCKED = "locked"     # 시도 횟수 초과 (재발급 전까지 잠김)
+
+
+def hash_otp(user_id: int, code: str) -> str:
+    """OTP는 원문 대신 HMAC-SHA256(비밀키, user_id:code) 값만 저장합니다 (base64url 43자)."""
+    digest = hmac.new(config.OTP_HASH_SECRET.encode(), f"{user_id}:{code}".encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+
+class OtpStore:
+    """
+    OTP 저장소 인터페이스.
+    cur는 Oracle 구현에서만 쓰며(호출자 트랜잭션), 다른 구현은 무시합니다.
+    writes_db가 True인 구현은 verify() 뒤 호출자가 commit 해야 시도 횟수가 남습니다.
+    """
+    writes_db = False
+
+    async def issue(self, cur, user_id: int, code: str, ttl_seconds: int):
+        raise NotImplementedError
+
+    async def verify(self, cur, user_id: int, code: str) -> str:
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
+
+
+class OracleOtpStore(OtpStore):
+    """기존 EMAIL_TOKENS 테이블 방식 (TOKEN에 해시 저장, ATTEMPTS로 시도 횟수)."""
+    writes_db = True
+
+    async def issue(self, cur, user_id: int, code: str, ttl_seconds: int):
+        t = SsyMetadata.table("EMAIL_TOKENS")
+        # 이전 미사용 OTP 무효화
+        await cur.execute(
+            f"""
+            UPDATE {t}
+               SET USED_AT = SYSDATE
+             WHERE USER_ID = :P_USER_ID
+               AND PURPOSE = 'OTP'
+               AND USED_AT IS NULL
+            """,
+            {"P_USER_ID": user_id},
+        )
+        # 새 OTP 발급
+        await cur.execute(
+            f"""
+            INSERT INTO {t} (USER_ID, TOKEN, PURPOSE, EXPIRES_AT)
+            VALUES (:P_USER_ID, :P_TOKEN, 'OTP', :P_EXPIRES_AT)
+            """,
+            {
+                "P_USER_ID": user_id,
+                "P_TOKEN": hash_otp(user_id, code),
+                "P_EXPIRES_AT": datetime.now() + timedelta(seconds=ttl_seconds),
+            },
+        )
+
+    async def verify(self, cur, user_id: int, code: str) -> str:
+        t = SsyMetadata.table("EMAIL_TOKENS")
+        await cur.execute(
+            f"""
+            SELECT ROWID, TOKEN, ATTEMPTS
+              FROM {t}
+             WHERE USER_ID = :P_USER_ID
+               AND PURPOSE = 'OTP'
+               AND USED_AT IS NULL
+               AND EXPIRES_AT > SYSDATE
+             ORDER BY EXPIRES_AT DESC
+             FETCH FIRST 1 ROWS ONLY
+            """,
+            {"P_USER_ID": user_id},
+        )
+        row = await cur.fetchone()
+        if not row:
+            return OTP_INVALID
+        rid, token, attempts = row[0], row[1], int(row[2] or 0)
+        if attempts >= config.OTP_MAX_ATTEMPTS:
+            return OTP_LOCKED
+
+        if hmac.compare_digest(token or "", hash_otp(user_id, code)):
+            await cur.execute(f"UPDATE {t} SET USED_AT = SYSDATE WHERE ROWID = :P_RID", {"P_RID": rid})
+            return OTP_OK
+        await cur.execute(f"UPDATE {t} SET ATTEMPTS = ATTEMPTS + 1 WHERE ROWID = :P_RID", {"P_RID": rid})
+        return OTP_INVALID
+
+
+class MemoryOtpStore(OtpStore):
+    """
+    프로세스 내 TTL 맵. DB 왕복 없이 발급/검증합니다.
+    만료 항목은 sweep_interval마다 한 번, 발급/검증 호출 때 몰아서 지웁니다(lazy sweep).
+    워커 프로세스끼리 공유되지 않으므로 다중 워커에서는 RedisOtpStore를 쓰세요.
+    """
+
+    def __init__(self, sweep_interval: float = 60, clock=time.monotonic):
+        self._entries = {}  # user_id -> [hash, expires_at(clock), attempts]
+        self._sweep_interval = sweep_interval
+        self._clock = clock  # 테스트에서 가짜 시계로 바꿔 끼움
+        self._next_sweep = clock() + sweep_interval
+
+    def _sweep(self, now: float):
+        if now < self._next_sweep:
+            return
+        for user_id in [u for u, e in self._entries.items() if e[1] <= now]:
+            del self._entries[user_id]
+        self._next_sweep = now + self._sweep_interval
+
+    async def issue(self, cur, user_id: int, code: str, ttl_seconds: int):
+        now = self._clock()
+        self._sweep(now)
+        self._entries[user_id] = [hash_otp(user_id, code), now + ttl_seconds, 0]
+
+    async def verify(self, cur, user_id: int, code: str) -> str:
+        now = self._clock()
+        self._sweep(now)
+        entry = self._entries.get(user_id)
+        if entry is None or entry[1] <= now:
+            self._entries.pop(user_id, None)
+            return OTP_INVALID
+        if entry[2] >= config.OTP_MAX_ATTEMPTS:
+            return OTP_LOCKED
+        if hmac.compare_digest(entry[0], hash_otp(user_id, code)):
+            del self._entries[user_id]
+            return OTP_OK
+        entry[2] += 1
+        return OTP_INVALID
+
+
+class RedisOtpStore(OtpStore):
+    """Redis(또는 Redis 프로토콜 호환 서버) 백엔드. 다중 워커/서버가 OTP를 공유합니다."""
+
+    # 시도 횟수 증가 + 비교 + 사용 처리를 한 번에 (원자적)
+    _VERIFY_LUA = """
+    local h = redis.call('HGET', KEYS[1], 'h')
+    if not h then return 0 end
+    local a = redis.call('HINCRBY', KEYS[1], 'a', 1)
+    if a > tonumber(ARGV[2]) then return -1 end
+    if h == ARGV[1] then redis.call('DEL', KEYS[1]) return 1 end
+    return 0
+    """
+
+    def __init__(self, url: str = None, prefix: str = "otp:", client=None):
+        if client is None:
+            import redis.asyncio as redis  # 선택 의존성: OTP_BACKEND=redis 일 때만 필요
+            client = redis.from_url(url)
+        self.client = client  # 테스트에서는 가짜 클라이언트
+        self.prefix = prefix
+        self._verify = self.client.register_script(self._VERIFY_LUA)
+
+    async def issue(self, cur, user_id: int, code: str, ttl_seconds: int):
+        key = f"{self.prefix}{user_id}"
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping={"h": hash_otp(user_id, code), "a": 0})
+            pipe.expire(key, ttl_seconds)
+            await pipe.execute()
+
+    async def verify(self, cur, user_id: int, code: str) -> str:
+        result = await self._verify(
+            keys=[f"{self.prefix}{user_id}"],
+            args=[hash_otp(user_id, code), config.OTP_MAX_ATTEMPTS],
+        )
+        result = int(result)
+        if result == 1:
+            return OTP_OK
+        if result == -1:
+            return OTP_LOCKED
+        return OTP_INVALID
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+def create_otp_store(backend: str = None) -> OtpStore:
+    backend = (backend or config.OTP_BACKEND).lower()
+    if backend == "memory":
+        return MemoryOtpStore()
+    if backend == "redis":
+        return RedisOtpStore(config.REDIS_URL)
+    if backend == "oracle":
+        return OracleOtpStore()
+    raise ValueError(f"Invalid OTP backend: {backend}. Must be 'oracle', 'memory' or 'redis'.")
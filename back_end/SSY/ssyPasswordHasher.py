@@ -0,0 +1,69 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+from SSY import config
+from SSY.ssyMetrics import SsyMetrics
+
+
+# 프로세스 풀 워커에서 실행되는 함수들 (pickle 가능해야 하므로 모듈 최상위에 둠)
+def _hashpw(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _checkpw(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+class SsyPasswordHasher:
+    """
+    bcrypt 해시/검증 전용 서비스.
+    코어 수만큼의 프로세스 풀에서 돌리므로 로그인이 몰려도 이벤트 루프가 멈추지 않고 여러 코어로 분산됩니다.
+    풀 프로세스는 spawn으로 띄움: 서버/oracledb 스레드가 이미 있는 프로세스를 fork하면 잠긴 락째로 복사될 수 있음
+    """
+    _executor = None
+
+    @classmethod
+    def getExecutor(cls):
+        if cls._executor is None:
+            cls._executor = ProcessPoolExecutor(max_workers=config.PASSWORD_HASH_WORKERS,
+                                                mp_context=multiprocessing.get_context("spawn"))
+        return cls._executor
+
+    @classmethod
+    async def shutdown(cls):
+        # 진행 중인 해시를 기다리는 동안 이벤트 루프를 막지 않도록 스레드에서
+        if cls._executor is not None:
+            executor, cls._executor = cls._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    @classmethod
+    async def hash(cls, password: str) -> str:
+        loop = asyncio.get_running_loop()
+        async with SsyMetrics.atimer("password_hash_duration_seconds", {"op": "hash"}, help="bcrypt time incl. process pool queueing"):
+            return await loop.run_in_executor(cls.getExecutor(), _hashpw, password, config.BCRYPT_ROUNDS)
+
+    @classmethod
+    async def verify(cls, password: str, hashed: str) -> bool:
+        if not hashed:
+            return False
+        loop = asyncio.get_running_loop()
+        try:
+            async with SsyMetrics.atimer("password_hash_duration_seconds", {"op": "verify"}, help="bcrypt time incl. process pool queueing"):
+                return await loop.run_in_executor(cls.getExecutor(), _checkpw, password, hashed)
+        except ValueError:
+            # bcrypt 형식이 아닌 값(손상된 해시 등)
+            return False
+
+    @staticmethod
+    def cost(hashed: str) -> int:
+        # "$2b$12$..." -> 12
+        try:
+            return int(hashed.split("$")[2])
+        except (AttributeError, IndexError, ValueError):
+            return 0
+
+    @classmethod
+    def needs_rehash(cls, hashed: str) -> bool:
+        return cls.cost(hashed) != config.BCRYPT_ROUNDS
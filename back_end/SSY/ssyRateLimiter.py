@@ -0,0 +1,135 @@
+import math
+import time
+
+from fastapi import Request
+
+from SSY import config
+from SSY.ssyApiError import SsyApiError
+
+
+def parse_rule(rule: str):
+    """ "3/600" -> (3, 600.0) : 600초에 3번 (토큰 버킷 용량 3, 초당 3/600 회복) """
+    count, seconds = rule.split("/")
+    return int(count), float(seconds)
+
+
+def client_ip(request: Request) -> str:
+    # 프록시 뒤에서만 X-Forwarded-For를 믿음 (직접 노출 시 위조 가능)
+    if config.TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    """
+    토큰 버킷 요청 제한 인터페이스.
+    hit()은 요청 1회를 소비하고, 허용이면 0, 거부면 다시 시도할 수 있을 때까지의 초를 돌려줍니다.
+    """
+
+    async def hit(self, key: str, capacity: int, window: float) -> float:
+        raise NotImplementedError
+
+    async def check(self, rules) -> float:
+        """rules: [(key, "3/600"), ...] -> 가장 긴 대기 시간(초), 모두 허용이면 0"""
+        retry_after = 0.0
+        for key, rule in rules:
+            if not rule:
+                continue
+            capacity, window = parse_rule(rule)
+            retry_after = max(retry_after, await self.hit(key, capacity, window))
+        return retry_after
+
+    async def aclose(self):
+        pass
+
+
+class MemoryRateLimiter(RateLimiter):
+    """
+    프로세스 내 토큰 버킷. DB/네트워크 없이 판단하므로 요청 폭주에도 비용이 일정합니다.
+    가득 찬(오래 쉰) 버킷은 sweep_interval마다 한 번 몰아서 지웁니다(lazy sweep).
+    워커끼리 공유되지 않으므로 다중 워커에서는 RedisRateLimiter를 쓰세요.
+    """
+
+    def __init__(self, sweep_interval: float = 60, clock=time.monotonic):
+        # clock: 초 단위 단조 시계 (테스트에서는 가짜 시계로 회복을 흉내 냄)
+        self._buckets = {}  # key -> [tokens, updated_at(clock), capacity, rate]
+        self._clock = clock
+        self._sweep_interval = sweep_interval
+        self._next_sweep = clock() + sweep_interval
+
+    def _sweep(self, now: float):
+        if now < self._next_sweep:
+            return
+        for key in [k for k, b in self._buckets.items() if b[0] + (now - b[1]) * b[3] >= b[2]]:
+            del self._buckets[key]
+        self._next_sweep = now + self._sweep_interval
+
+    async def hit(self, key: str, capacity: int, window: float) -> float:
+        now = self._clock()
+        self._sweep(now)
+        rate = capacity / window
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(capacity), now, capacity, rate]
+        tokens = min(float(capacity), bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / rate
+
+
+class RedisRateLimiter(RateLimiter):
+    """Redis 토큰 버킷. 다중 워커/서버가 같은 제한을 공유합니다."""
+
+    # 회복 + 소비를 한 번에 (원자적). 반환: 대기 밀리초 (0이면 허용)
+    _HIT_LUA = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = redis.call('TIME')
+    now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+    local b = redis.call('HMGET', KEYS[1], 't', 'u')
+    local tokens = tonumber(b[1]) or capacity
+    local updated = tonumber(b[2]) or now
+    tokens = math.min(capacity, tokens + (now - updated) * rate)
+    local wait = 0
+    if tokens >= 1 then tokens = tokens - 1 else wait = math.ceil((1 - tokens) / rate * 1000) end
+    redis.call('HSET', KEYS[1], 't', tokens, 'u', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return wait
+    """
+
+    def __init__(self, url: str, prefix: str = "rl:"):
+        import redis.asyncio as redis  # 선택 의존성: RATE_LIMIT_BACKEND=redis 일 때만 필요
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+        self._hit = self.client.register_script(self._HIT_LUA)
+
+    async def hit(self, key: str, capacity: int, window: float) -> float:
+        wait_ms = await self._hit(keys=[f"{self.prefix}{key}"], args=[capacity, capacity / window])
+        return int(wait_ms) / 1000
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+def create_rate_limiter(backend: str = None) -> RateLimiter:
+    backend = (backend or config.RATE_LIMIT_BACKEND).lower()
+    if backend == "memory":
+        return MemoryRateLimiter()
+    if backend == "redis":
+        return RedisRateLimiter(config.REDIS_URL)
+    raise ValueError(f"Invalid rate limit backend: {backend}. Must be 'memory' or 'redis'.")
+
+
+def too_many_requests(retry_after: float) -> SsyApiError:
+    seconds = max(1, math.ceil(retry_after))
+    return SsyApiError(
+        429,
+        f"요청이 너무 많습니다. {seconds}초 후에 다시 시도해 주세요.",
+        headers={"Retry-After": str(seconds)},
+        retry_after=seconds,
+    )
@@ -0,0 +1,129 @@
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import jwt
+from fastapi import Depends, Header
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from SSY import config
+from SSY.ssyApiError import SsyApiError
+
+class SsyTokenManager:
+    """
+    JWT 액세스/리프레시 토큰 발급과 검증.
+    - 서명/만료 검증이 끝난 클레임은 토큰 해시(sha256) 키의 LRU에 보관해 같은 토큰은 다시 디코딩하지 않습니다.
+    - 캐시 항목은 토큰의 exp까지만 유효하므로 만료된 토큰이 캐시로 통과하는 일은 없습니다.
+    - DB를 조회하지 않으므로 요청마다 Oracle 세션을 쓰지 않고 사용자를 식별합니다.
+    """
+    ACCESS = "access"
+    REFRESH = "refresh"
+
+    _cache = OrderedDict()  # sha256(token) -> (claims, exp)
+    _lock = threading.Lock()
+    hits = 0
+    misses = 0
+
+    # === 발급 ===
+    @classmethod
+    def _encode(cls, user_id: int, typ: str, lifetime: timedelta, **claims) -> str:
+        now = datetime.now(timezone.utc)
+        payload = {"sub": str(user_id), "typ": typ, "iat": now, "exp": now + lifetime}
+        payload.update({k: v for k, v in claims.items() if v is not None})
+        return jwt.encode(payload, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM)
+
+    @classmethod
+    def issue(cls, user_id: int, email: str = None) -> dict:
+        return {
+            "access_token": cls._encode(
+                user_id, cls.ACCESS, timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES), email=email
+            ),
+            "refresh_token": cls._encode(
+                user_id, cls.REFRESH, timedelta(hours=config.REFRESH_TOKEN_EXPIRE_HOURS)
+            ),
+            "token_type": "bearer",
+            "expires_in": config.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        }
+
+    # === 검증 (LRU 캐시) ===
+    @classmethod
+    def decode(cls, token: str, typ: str = ACCESS) -> dict:
+        """유효하면 클레임 dict, 아니면 jwt.InvalidTokenError"""
+        key = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+        with cls._lock:
+            entry = cls._cache.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    cls._cache.move_to_end(key)
+                    cls.hits += 1
+                    claims = entry[0]
+                else:
+                    del cls._cache[key]
+                    entry = None
+            if entry is None:
+                cls.misses += 1  # 카운터도 잠금 안에서 (스레드풀에서 동시에 불려도 빠지지 않게)
+        if entry is None:
+            claims = jwt.decode(
+                token,
+                config.JWT_SECRET,
+                algorithms=[config.JWT_ALGORITHM],
+                options={"require": ["exp", "sub", "typ"]},
+            )
+            with cls._lock:
+                cls._cache[key] = (claims, claims["exp"])
+                cls._cache.move_to_end(key)
+                while len(cls._cache) > config.JWT_CACHE_SIZE:
+                    cls._cache.popitem(last=False)
+
+        if claims.get("typ") != typ:
+            raise jwt.InvalidTokenError("token type mismatch")
+        return claims
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._cache.clear()
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {"size": len(cls._cache), "max": config.JWT_CACHE_SIZE, "hits": cls.hits, "misses": cls.misses}
+
+
+# === FastAPI 의존성 ===
+_bearer = HTTPBearer(auto_error=False)
+
+async def current_user_id(credentials: HTTPAuthorizationCredentials = Depends(_bearer)) -> int:
+    """
+    Authorization: Bearer <access_token> 을 검증하고 사용자 ID를 돌려줍니다.
+    async라 스레드풀을 거치지 않고 이벤트 루프에서 바로 실행됩니다 (캐시 적중 시 해시 한 번, 미스여도 HMAC 검증 한 번).
+    """
+    if credentials is None:
+        raise SsyApiError(401, "로그인이 필요합니다.", headers={"WWW-Authenticate": "Bearer"})
+    try:
+        return int(SsyTokenManager.decode(credentials.credentials)["sub"])
+    except (jwt.InvalidTokenError, ValueError):
+        raise SsyApiError(401, "유효하지 않은 토큰입니다.", headers={"WWW-Authenticate": "Bearer"})
+
+
+async def optional_user_id(credentials: HTTPAuthorizationCredentials = Depends(_bearer)) -> Optional[int]:
+    """로그인하지 않아도 되는 라우트용: 토큰이 없으면 None, 있는데 유효하지 않으면 401"""
+    if credentials is None:
+        return None
+    try:
+        return int(SsyTokenManager.decode(credentials.credentials)["sub"])
+    except (jwt.InvalidTokenError, ValueError):
+        raise SsyApiError(401, "유효하지 않은 토큰입니다.", headers={"WWW-Authenticate": "Bearer"})
+
+
+async def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """운영 작업 엔드포인트용: X-Admin-Token 이 config.ADMIN_TOKEN 과 같아야 함 (설정이 없으면 모두 거부)"""
+    expected = config.ADMIN_TOKEN
+    if not expected:
+        raise SsyApiError(403, "운영 엔드포인트가 설정되지 않았습니다.")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), expected.encode()):
+        raise SsyApiError(401, "관리자 토큰이 필요합니다.")
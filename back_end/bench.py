@@ -0,0 +1,782 @@
+"""
+성능 측정 스크립트 (back_end 폴더에서 실행)
+
+  python bench.py micro [--out bench_micro.json] [--baseline 이전.json]
+      DB/외부 API 없이 돌아가는 함수들: 작물 추천, 점수 엔진(--regions x --crops, 기본 1만 x 500), 파일 이름 생성, 토큰 검증(인증 오버헤드), bcrypt 해시/검증,
+      생산 기록 응답 직렬화(--log-rows, 기본 5만 행: JSONResponse vs orjson vs 모델 검증),
+      회원가입(가짜 DB, 왕복마다 --rtt-ms 지연: 거절 경로에 bcrypt가 빠졌는지 확인, bcrypt를 뺀 DB 시간은 이전 signUp의 4 왕복 문장 순서를 같은 가짜 DB로 재생해 비교),
+      코어(해시 프로세스) 수별 초당 로그인 수(bcrypt 검증, 1/2/4.. --max-cores 까지),
+      생산 기록 초당 적재 행 수(행 단위 POST vs /bulk, --bulk-rows),
+      동시 접속 --clients(기본 200)명에서 DB 왕복 --db-ms 인 GET /api/produce-logs 의 p50/p99
+      (실제 앱, 가짜 DAO: async 라우트 vs 이전 스레드풀 sync 라우트의 모델)
+
+  python bench.py load [--duration 30] [--concurrency 20] [--db-ms 2] [--out bench_load.json] [--baseline 이전.json]
+      서버/Oracle/SMTP/날씨 API 없이 이 프로세스에서 create_app()의 실제 라우트를 구동합니다
+      (가짜 Oracle: 왕복마다 --db-ms, 날씨: 로컬 스텁 HTTP 서버, 메일: aiosmtpd 싱크, 요청: httpx.ASGITransport).
+      로그인/추천/생산 기록 읽기·쓰기와 가입 흐름(인증번호 요청 -> 싱크에 도착한 메일의 번호로 인증 -> 가입)을 섞어
+      엔드포인트별(가입 흐름은 단계별로도) 처리량과 p50/p95/p99를 기록
+
+  python bench.py load --url [http://localhost:1234] --email a@b.c --password pw [...]
+      실행 중인 서버로 보냄 (값 없이 --url 만 주면 homeController 기본 포트 1234). 인증번호 메일을 읽을 수 없어 가입 흐름은 빠짐
+      --public 이면 로그인 없이 공개 엔드포인트(작물 추천)만 (DB 없이 워커 수별 처리량 비교용)
+      실제 DB로 200명 동시 접속을 재려면 --concurrency 200
+
+  WEB_WORKERS=N gunicorn -c gunicorn.conf.py homeController:app 로 띄운 뒤 N을 바꿔 load --url --public 을 돌리면
+  워커 수에 따른 처리량 변화를 볼 수 있습니다.
+
+--baseline 을 주면 p95(마이크로는 평균)가 --tolerance(기본 20%) 넘게 느려진 항목을 출력하고 종료 코드 1을 돌려줍니다.
+"""
+import argparse
+import asyncio
+import dataclasses
+import os
+import json
+import random
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {"p50_ms": pick(0.50) * 1000, "p95_ms": pick(0.95) * 1000, "p99_ms": pick(0.99) * 1000}
+
+
+# === 마이크로벤치 ===
+class _FixedWeather:
+    # 외부 호출 없이 항상 같은 날씨 (점수 계산 비용만 잼)
+    async def fetch(self, lat, lon):
+        return {"temp": 21.5, "rain": 70.0}
+
+    async def aclose(self):
+        pass
+
+
+async def _time_async(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def _time_sync(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+async def _auth_overhead():
+    # 보호된 라우트마다 붙는 토큰 검증 비용: LRU 적중(보통의 경우)과 미스(서명 검증)
+    from fastapi.security import HTTPAuthorizationCredentials
+    from SSY.ssyTokenManager import SsyTokenManager, current_user_id
+
+    token = SsyTokenManager.issue(1, "bench@example.com")["access_token"]
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    def miss():
+        SsyTokenManager.clear()
+        SsyTokenManager.decode(token)
+
+    results = {"auth_jwt_miss": _time_sync(miss, 5000)}
+    await current_user_id(credentials)
+    results["auth_jwt_cached"] = await _time_async(lambda: current_user_id(credentials), 20000)
+    return results
+
+
+class _FakeUsersDb:
+    """
+    회원가입 경로만 흉내 내는 DB: 왕복(execute/commit) 한 번마다 rtt초를 기다림 (네트워크 왕복 대신, fetch는 왕복으로 세지 않음)
+    registered=True 면 이미 가입된 이메일(409), 아니면 인증만 끝난 사용자(가입 완료)
+    기동 때의 메타데이터 조회(SsyMetadata.warm)에도 답하므로 DAO는 실제 준비 경로를 그대로 탑니다.
+    """
+    COLUMNS = [("LOCATIONS", "LOCATION_ID"), ("USERS", "ID"), ("USERS", "EMAIL"), ("USERS", "EMAIL_NORM")]
+    PKS = [("LOCATIONS", "LOCATION_ID"), ("USERS", "ID")]
+
+    def __init__(self, rtt: float, registered: bool):
+        self.rtt = rtt
+        self.registered = registered
+        self.round_trips = 0
+
+    class _Var:
+        def __init__(self, value=None):
+            self.value = value
+
+        def getvalue(self):
+            return self.value
+
+    async def _round_trip(self):
+        self.round_trips += 1
+        await asyncio.sleep(self.rtt)
+
+    def _rows(self, sql: str, binds: dict) -> list:
+        text = " ".join(sql.split()).upper()
+        if "O_STATUS" in binds:  # PL/SQL 가입 블록
+            binds["O_STATUS"].value = 409 if self.registered else 200
+            binds["O_LOC_ID"].value = 1
+        elif "P_LOC_OUT" in binds:  # 이전 순서의 INSERT LOCATIONS ... RETURNING
+            binds["P_LOC_OUT"].value = [1]
+        elif "SYS_CONTEXT" in text:
+            return [("BENCH",)]
+        elif "FROM ALL_TAB_COLUMNS" in text:
+            return list(self.COLUMNS)
+        elif "FROM ALL_CONSTRAINTS" in text:
+            return list(self.PKS)
+        elif "WHERE LOWER(EMAIL)" in text:  # 이전 순서의 사용자 조회: (PK, IS_VERIFIED, USERNAME, PASSWORD)
+            return [(1, 1, "bench", "x") if self.registered else (1, 1, None, None)]
+        elif "WHERE EMAIL_NORM" in text:  # 사전 확인: (IS_VERIFIED, 이미 가입)
+            return [(1, 1 if self.registered else 0)]
+        return []
+
+    @asynccontextmanager
+    async def acquire(self):
+        db = self
+
+        class Connection:
+            async def commit(self):
+                await db._round_trip()
+
+            async def rollback(self):
+                await db._round_trip()
+
+        class Cursor:
+            rows = []
+
+            async def execute(self, sql, binds=None):
+                await db._round_trip()
+                self.rows = db._rows(sql, binds or {})
+
+            async def fetchone(self):
+                return self.rows.pop(0) if self.rows else None
+
+            async def fetchall(self):
+                rows, self.rows = self.rows, []
+                return rows
+
+            def var(self, tp):
+                return db._Var()
+
+        yield Connection(), Cursor()
+
+
+@asynccontextmanager
+async def _users_dao_on(db: _FakeUsersDb):
+    # 실제 UsersDAO를 가짜 DB 위에서: 기동 때처럼 SsyMetadata.warm을 먼저 돌리고, 그 왕복은 세지 않음
+    from SSY.ssyAsyncDBManager import SsyAsyncDBManager
+    from SSY.ssyMetadata import SsyMetadata
+    from users.userDAO import UsersDAO
+
+    original = SsyAsyncDBManager.acquire
+    SsyMetadata.invalidate()
+    SsyAsyncDBManager.acquire = db.acquire
+    try:
+        async with db.acquire() as (con, cur):
+            await SsyMetadata.warm(cur)
+        db.round_trips = 0
+        yield UsersDAO()
+    finally:
+        SsyAsyncDBManager.acquire = original
+        SsyMetadata.invalidate()
+
+
+SIGNUP_FORM = dict(username="bench", email="bench@example.com", phone_number="", password="benchmark-password", psa=None,
+                   si_do="서울특별시", si_gun_gu="종로구", dong="청운동", detail_address="1")
+
+
+async def _signup(rtt: float):
+    # 가입 요청 지연: 거절(이미 가입) 경로는 bcrypt 없이 사전 확인 한 번, 완료 경로는 사전 확인 + bcrypt + PL/SQL 한 번
+    from SSY.ssyApiError import SsyApiError
+
+    results = {}
+    async with _users_dao_on(_FakeUsersDb(rtt, registered=True)) as dao:
+        async def rejected():
+            try:
+                await dao.signUp(**SIGNUP_FORM)
+            except SsyApiError:
+                pass
+
+        results["signup_rejected"] = await _time_async(rejected, 200)
+    async with _users_dao_on(_FakeUsersDb(rtt, registered=False)) as dao:
+        results["signup_complete"] = await _time_async(lambda: dao.signUp(**SIGNUP_FORM), 5)
+    return results
+
+
+async def _legacy_signup_statements(dao, hashed_password: str):
+    """
+    이전 signUp의 DB 문장 순서를 그대로 재생 (파일 저장/bcrypt/응답 생성은 뺌):
+    SELECT USERS(LOWER(EMAIL)) -> INSERT LOCATIONS ... RETURNING -> UPDATE USERS -> COMMIT
+    """
+    from SSY.ssyAsyncDBManager import SsyAsyncDBManager
+
+    form = SIGNUP_FORM
+    async with SsyAsyncDBManager.acquire() as (con, cur):
+        await dao._ensure_schema_and_tables(cur)
+        pk = await dao._users_pk_col(cur)
+        await cur.execute(
+            f"""
+            SELECT {pk}, IS_VERIFIED, USERNAME, PASSWORD
+              FROM {dao.T_USERS}
+             WHERE LOWER(EMAIL) = LOWER(:P_EMAIL)
+            """,
+            {"P_EMAIL": form["email"]},
+        )
+        user_id, is_verified, exist_username, exist_pw = await cur.fetchone()
+
+        loc_out = cur.var(int)
+        await cur.execute(
+            f"""
+            INSERT INTO {dao.T_LOCATIONS} (si_do, si_gun_gu, dong, detail_address)
+            VALUES (:P_SIDO, :P_SIGUNGU, :P_DONG, :P_DETAIL_ADDRESS)
+            RETURNING location_id INTO :P_LOC_OUT
+            """,
+            {"P_SIDO": form["si_do"], "P_SIGUNGU": form["si_gun_gu"], "P_DONG": form["dong"],
+             "P_DETAIL_ADDRESS": form["detail_address"], "P_LOC_OUT": loc_out},
+        )
+        location_id = loc_out.getvalue()[0]
+
+        await cur.execute(
+            f"""
+            UPDATE {dao.T_USERS}
+               SET USERNAME = :P_USERNAME,
+                   PHONE_NUMBER = :P_PHONE,
+                   PASSWORD = :P_PASSWORD,
+                   PROFILE_IMAGE_URL = :P_IMG,
+                   LOCATION_ID = :P_LOC_ID
+             WHERE {pk} = :P_USER_ID
+            """,
+            {"P_USERNAME": form["username"], "P_PHONE": form["phone_number"], "P_PASSWORD": hashed_password,
+             "P_IMG": None, "P_LOC_ID": location_id, "P_USER_ID": user_id},
+        )
+        await con.commit()
+
+
+async def _signup_db_path(rtt: float, repeat: int = 50):
+    """
+    가입 완료 경로의 DB 시간만 (bcrypt 제외): 지금(사전 확인 + PL/SQL 블록, 2 왕복) vs
+    이전 signUp의 문장 순서(SELECT USERS -> INSERT LOCATIONS -> UPDATE USERS -> COMMIT, 4 왕복)를
+    같은 가짜 DB/같은 지연에서 실제로 실행해 비교
+    """
+    from SSY.ssyPasswordHasher import SsyPasswordHasher
+
+    hashed = "$2b$12$" + "x" * 53
+
+    async def fixed_hash(password):
+        return hashed
+
+    results = {}
+    original_hash = SsyPasswordHasher.hash
+    try:
+        SsyPasswordHasher.hash = fixed_hash
+        fake = _FakeUsersDb(rtt, registered=False)
+        async with _users_dao_on(fake) as dao:
+            plsql = await _time_async(lambda: dao.signUp(**SIGNUP_FORM), repeat)
+            results["signup_db_plsql"] = {"mean_ms": plsql * 1000, "round_trips": fake.round_trips / repeat}
+    finally:
+        SsyPasswordHasher.hash = original_hash
+
+    fake = _FakeUsersDb(rtt, registered=False)
+    async with _users_dao_on(fake) as dao:
+        legacy = await _time_async(lambda: _legacy_signup_statements(dao, hashed), repeat)
+        results["signup_db_legacy"] = {"mean_ms": legacy * 1000, "round_trips": fake.round_trips / repeat}
+    return results
+
+
+async def _logins_per_core(max_cores: int):
+    # 로그인 처리량의 상한 = bcrypt 검증 처리량. 해시 프로세스 수를 1, 2, 4.. 로 늘려 가며 동시 검증을 몰아넣음
+    from SSY import config
+    from SSY.ssyPasswordHasher import SsyPasswordHasher
+
+    base = config.get_settings()
+    hashed = await SsyPasswordHasher.hash("benchmark-password")
+    results = {}
+    cores = 1
+    try:
+        while cores <= max_cores:
+            await SsyPasswordHasher.shutdown()
+            config.configure(dataclasses.replace(base, PASSWORD_HASH_WORKERS=cores))
+            await asyncio.gather(*(SsyPasswordHasher.verify("benchmark-password", hashed) for _ in range(cores)))  # 워커 기동
+            logins = cores * 4
+            started = time.perf_counter()
+            await asyncio.gather(*(SsyPasswordHasher.verify("benchmark-password", hashed) for _ in range(logins)))
+            per_sec = logins / (time.perf_counter() - started)
+            results[f"logins_{cores}_cores"] = {"logins_per_sec": per_sec, "mean_ms": 1000 / per_sec}
+            cores *= 2
+    finally:
+        await SsyPasswordHasher.shutdown()
+        config.configure(base)
+    return results
+
+
+class _FakeProduceDb:
+    """생산 기록 쓰기만 흉내 내는 DB: execute/executemany/commit 한 번마다 rtt초 (배열 DML도 왕복 한 번)"""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.round_trips = 0
+
+    async def _round_trip(self):
+        self.round_trips += 1
+        await asyncio.sleep(self.rtt)
+
+    @asynccontextmanager
+    async def acquire(self):
+        db = self
+
+        class Connection:
+            async def commit(self):
+                await db._round_trip()
+
+            async def rollback(self):
+                await db._round_trip()
+
+        class Cursor:
+            async def execute(self, sql, binds=None):
+                await db._round_trip()
+
+            async def executemany(self, sql, rows, batcherrors=False):
+                await db._round_trip()
+
+            def getbatcherrors(self):
+                return []
+
+        yield Connection(), Cursor()
+
+
+async def _bulk_vs_per_row(rtt: float, rows: int):
+    # 초당 적재 행 수: POST /api/produce-logs 를 행마다(INSERT+MERGE+COMMIT) vs /bulk (배치마다 같은 3 왕복)
+    from produceLogDAO.produceLogDAO import ProduceLogDAO
+    from SSY.ssyAsyncDBManager import SsyAsyncDBManager
+
+    dao = ProduceLogDAO()
+
+    async def no_metadata(cur):
+        pass
+
+    dao._ensure_schema_and_tables = no_metadata
+    data = [{"cropName": "쌀", "quantity": i % 90 + 1, "productionDate": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}"}
+            for i in range(rows)]
+    per_row = data[:max(1, rows // 10)]  # 행 단위는 느리므로 1/10만
+    original = SsyAsyncDBManager.acquire
+    results = {}
+    try:
+        fake = _FakeProduceDb(rtt)
+        SsyAsyncDBManager.acquire = fake.acquire
+        started = time.perf_counter()
+        for row in per_row:
+            await dao.add_log(1, row["cropName"], row["quantity"], row["productionDate"])
+        results["produce_logs_per_row"] = {"rows_per_sec": len(per_row) / (time.perf_counter() - started),
+                                           "round_trips": fake.round_trips}
+
+        fake = _FakeProduceDb(rtt)
+        SsyAsyncDBManager.acquire = fake.acquire
+        started = time.perf_counter()
+        result = await dao.add_logs_bulk(data, owner_id=1)
+        results["produce_logs_bulk"] = {"rows_per_sec": result["inserted"] / (time.perf_counter() - started),
+                                        "round_trips": fake.round_trips}
+    finally:
+        SsyAsyncDBManager.acquire = original
+    return results
+
+
+class _LatencyLogsDAO:
+    """
+    GET /api/produce-logs 용 가짜 DAO: get_logs 한 번에 DB 왕복 delay초
+    blocking=True 면 그 대기를 Starlette 스레드풀(anyio 기본 토큰 40개)에서 time.sleep으로 -> 이전 sync def 라우트 + 블로킹 드라이버의 모델
+    """
+
+    def __init__(self, delay: float, blocking: bool):
+        self.delay = delay
+        self.blocking = blocking
+        self.page = {"logs": [{"id": i, "crop_name": "쌀", "produce_quantity": 1.5, "prod_date": "2024-05-01"} for i in range(20)],
+                     "next_cursor": None}
+
+    async def get_logs(self, user_id, limit=None, cursor=None, date_from=None, date_to=None):
+        if self.blocking:
+            from starlette.concurrency import run_in_threadpool
+            await run_in_threadpool(time.sleep, self.delay)
+        else:
+            await asyncio.sleep(self.delay)
+        return self.page
+
+
+@asynccontextmanager
+async def _in_process(app):
+    # 서버 없이 앱을 그대로 구동 (lifespan 포함, 요청은 httpx.ASGITransport로 직접 전달)
+    import httpx
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=30) as client:
+            yield client
+
+
+async def _async_vs_threadpool(clients: int, db_ms: float, requests_per_client: int = 5):
+    """
+    동시 접속 clients명일 때 DB 왕복(db_ms)이 있는 GET /api/produce-logs 의 p50/p99.
+    두 쪽 모두 create_app()의 실제 라우트/인증/미들웨어/ETag 경로를 지나고, DAO만 지연을 넣은 가짜입니다.
+    - async_db: 지금 구조 (DB 대기가 이벤트 루프에서 await)
+    - threadpool_sync_db_model: 이전 구조의 모델. 같은 라우트에서 DB 대기만 스레드풀의 블로킹 호출로 바꿔
+      sync def 라우트들이 스레드풀 40개를 나눠 쓰던 상황을 재현 (이전 라우트 자체를 돌린 측정은 아님)
+    """
+    from homeController import create_app
+    from SSY.ssyTokenManager import SsyTokenManager
+
+    token = SsyTokenManager.issue(1, "bench@example.com")["access_token"]
+    auth = {"Authorization": f"Bearer {token}"}
+    results = {}
+    for name, blocking in (("threadpool_sync_db_model", True), ("async_db", False)):
+        app = create_app(users_dao=object(), produce_log_dao=_LatencyLogsDAO(db_ms / 1000, blocking),
+                         weather_provider=_FixedWeather())
+        async with _in_process(app) as client:
+            samples = []
+
+            async def one_client():
+                for _ in range(requests_per_client):
+                    started = time.perf_counter()
+                    (await client.get("/api/produce-logs", params={"user_id": 1}, headers=auth)).raise_for_status()
+                    samples.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(one_client() for _ in range(clients)))
+            elapsed = time.perf_counter() - started
+            results[f"{name}_{clients}_clients"] = {"rps": len(samples) / elapsed, **percentiles(samples)}
+    return results
+
+
+def _logs_serialization(rows: int):
+    # GET /api/produce-logs 응답 rows행 직렬화: 이전 JSONResponse(표준 json) vs 지금 orjson.dumps로 만든 Response,
+    # 그리고 response_model 검증을 거쳤을 때(ProduceLogPage, 다른 JSON 라우트의 경로) 드는 비용
+    import orjson
+    from fastapi import Response
+    from fastapi.responses import JSONResponse
+    from schemas import ProduceLogPage
+
+    payload = {
+        "logs": [{"id": i, "crop_name": "쌀", "produce_quantity": i % 90 + 0.5, "prod_date": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}"}
+                 for i in range(rows)],
+        "next_cursor": None,
+    }
+    return {
+        f"logs_{rows}_rows_json_response": _time_sync(lambda: JSONResponse(payload), 5),
+        f"logs_{rows}_rows_orjson_response": _time_sync(lambda: Response(orjson.dumps(payload), media_type="application/json"), 5),
+        f"logs_{rows}_rows_model_validated": _time_sync(lambda: ProduceLogPage.model_validate(payload).model_dump_json(), 5),
+    }
+
+
+def _scoring_at_scale(n_regions: int, n_crops: int):
+    # 요청 규모(기본 1만 지역 x 500 작물)의 합성 표로 점수 행렬 + 지역별 상위 5개를 한 번에
+    import numpy as np
+    from cropRd.cropScorer import CropScorer
+
+    rng = random.Random(5)
+    crops = {}
+    for c in range(n_crops):
+        t = rng.uniform(0, 30)
+        r = rng.uniform(10, 200)
+        crops[f"crop{c}"] = {"optimal_temp": [t, t + rng.uniform(2, 10)], "optimal_rain": [r, r + rng.uniform(10, 80)]}
+    scorer = CropScorer(crops)
+    data = np.random.default_rng(5)
+    temps = data.uniform(-5, 35, n_regions)
+    rains = data.uniform(0, 250, n_regions)
+    mask = data.random((n_regions, n_crops)) < 0.3  # 지역마다 작물의 30%가 재배 후보
+
+    name = f"score_{n_regions}_regions_x_{n_crops}_crops"
+    return {
+        name: _time_sync(lambda: scorer.score(temps, rains, mask), 5),
+        f"{name}_top5": _time_sync(lambda: scorer.top_n(scorer.score(temps, rains, mask), 5), 3),
+    }
+
+
+async def run_micro(args):
+    from cropRd.cropRd import get_recommendations, score_all_regions, weather
+    from SSY.ssyFileNameGenerator import SsyFileNameGenerator
+    from SSY.ssyPasswordHasher import SsyPasswordHasher
+
+    weather.set_provider(_FixedWeather())
+    await get_recommendations("서울")  # 캐시 채움
+
+    results = {
+        "get_recommendations": await _time_async(lambda: get_recommendations("서울"), 2000),
+        "score_all_regions": await _time_async(score_all_regions, 500),
+        **_scoring_at_scale(args.regions, args.crops),
+        **_logs_serialization(args.log_rows),
+        "filename_ulid": _time_sync(lambda: SsyFileNameGenerator.generate("내 사진.JPG", "ulid"), 20000),
+        "filename_uuid": _time_sync(lambda: SsyFileNameGenerator.generate("photo.jpg", "uuid"), 20000),
+        "filename_hash": _time_sync(lambda: SsyFileNameGenerator.generate("photo.jpg", "hash", "ab" * 32), 20000),
+    }
+    results.update(await _auth_overhead())
+    hashed = await SsyPasswordHasher.hash("benchmark-password")  # 프로세스 풀 기동 포함 첫 호출은 제외
+    results["bcrypt_hash"] = await _time_async(lambda: SsyPasswordHasher.hash("benchmark-password"), 5)
+    results["bcrypt_verify"] = await _time_async(lambda: SsyPasswordHasher.verify("benchmark-password", hashed), 5)
+    results.update(await _signup(args.rtt_ms / 1000))
+    report = {name: {"mean_ms": seconds * 1000} for name, seconds in results.items()}
+    report.update(await _logins_per_core(args.max_cores))  # 이미 {logins_per_sec, mean_ms}
+    report.update(await _async_vs_threadpool(args.clients, args.db_ms))
+    report.update(await _bulk_vs_per_row(args.rtt_ms / 1000, args.bulk_rows))
+    report.update(await _signup_db_path(args.rtt_ms / 1000))
+    await SsyPasswordHasher.shutdown()
+    await weather.aclose()
+    return report
+
+
+# === 부하 테스트 ===
+class _WeatherStub:
+    """OpenWeatherMap /data/2.5/weather 대신 고정 날씨를 돌려주는 로컬 HTTP 서버 (별도 스레드)"""
+
+    def __init__(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps({"main": {"temp": 21.5}, "rain": {"1h": 0.4}}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@asynccontextmanager
+async def _in_process_app(args):
+    """
+    load 기본 모드: 서버/Oracle/SMTP/날씨 API 없이 이 프로세스 안에서 실제 앱을 구동
+    - create_app() + 실제 UsersDAO/ProduceLogDAO, DB는 tests/fake_oracle.FakeOracle (왕복마다 --db-ms)
+    - 날씨: 로컬 스텁 HTTP 서버를 base_url로 둔 OpenWeatherMapProvider
+    - 메일: 실제 SsyMailWorker가 aiosmtpd 싱크(tests/smtp_sink)로 발송, 가입 흐름은 싱크에서 인증번호를 읽음
+    요청은 httpx.ASGITransport로 앱에 바로 전달합니다. (client, 메일 싱크)를 돌려줌
+    """
+    import tempfile
+
+    import httpx
+    from cropRd.weatherProvider import OpenWeatherMapProvider
+    from homeController import create_app
+    from SSY import config
+    from SSY.config import Settings
+    from SSY.ssyAsyncDBManager import SsyAsyncDBManager
+    from SSY.ssyMailWorker import SsyMailWorker
+    from SSY.ssyMetadata import SsyMetadata
+    from SSY.ssyPasswordHasher import SsyPasswordHasher
+    from tests.fake_oracle import FakeOracle
+    from tests.smtp_sink import SinkController
+
+    sink = SinkController().start()
+    stub = _WeatherStub().start()
+    upload_dir = tempfile.TemporaryDirectory()
+    settings = dataclasses.replace(
+        Settings(), SMTP_STARTTLS=False, MAIL_PROVIDERS=["naver"], NAVER_SMTP_HOST="127.0.0.1",
+        NAVER_SMTP_PORT=sink.port, NAVER_SMTP_USER="noreply@bench.test",
+        TRUST_FORWARDED_FOR=True,  # 가입 흐름의 방문자마다 다른 IP (프록시 뒤 가정)
+        WEATHER_API_KEY="bench", WEATHER_API_URL=stub.url, UPLOAD_DIR=upload_dir.name,
+    )
+    db = FakeOracle(latency=args.db_ms / 1000)
+    original_acquire = SsyAsyncDBManager.acquire
+    SsyAsyncDBManager.acquire = db.acquire
+    SsyMetadata.invalidate()
+    provider = OpenWeatherMapProvider("bench", base_url=stub.url)
+    app = create_app(settings, weather_provider=provider)
+    try:
+        async with app.router.lifespan_context(app):
+            # 로그인/기록 요청용 사용자 (가입 완료 + 생산 기록 200건)
+            user_id = db.add_user(args.email, 1, USERNAME="load", PASSWORD=await SsyPasswordHasher.hash(args.password))
+            for i in range(200):
+                day = datetime(2024, i % 12 + 1, i % 28 + 1)
+                db.insert_log(user_id, "쌀", i % 90 + 0.5, day)
+                db.add_to_rollups(user_id, "쌀", day, i % 90 + 0.5, 1)
+            db.commit()
+
+            SsyMailWorker.start()  # DSN이 없으면 lifespan이 띄우지 않으므로 직접
+            try:
+                async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench",
+                                             timeout=30) as client:
+                    yield client, sink.handler
+            finally:
+                await SsyMailWorker.stop(timeout=10)
+    finally:
+        await provider.aclose()  # 넘겨준 공급자는 앱이 닫지 않음
+        SsyAsyncDBManager.acquire = original_acquire
+        SsyMetadata.invalidate()
+        stub.stop()
+        sink.stop()
+        upload_dir.cleanup()
+        config.configure(None)
+
+
+async def _signup_funnel(client, sink, timed):
+    # 새 방문자 한 명: 인증번호 요청 -> 메일로 받은 번호로 인증 -> 가입 (단계별로도 기록)
+    email = f"load-{random.getrandbits(48):012x}@example.com"
+    headers = {"X-Forwarded-For": f"10.{random.randrange(256)}.{random.randrange(256)}.{random.randrange(1, 255)}"}
+    r = await timed("POST /users/auth-email", client.post("/users/auth-email", json={"email": email}, headers=headers))
+    if r is None or r.status_code >= 400:
+        return r
+    code = await timed("OTP mail delivered", sink.wait_otp(email))  # 메일 큐 -> 워커 -> SMTP 까지
+    if code is None:
+        return None
+    r = await timed("POST /users/verify-otp", client.post("/users/verify-otp", json={"email": email, "code": code},
+                                                          headers=headers))
+    if r is None or r.status_code >= 400:
+        return r
+    return await timed("POST /users/sign-up", client.post("/users/sign-up", headers=headers, data={
+        "username": "load", "email": email, "password": "load-password", "si_do": "서울특별시",
+        "si_gun_gu": "종로구", "dong": "청운동", "detail_address": str(random.randrange(100))}))
+
+
+async def _user_mix(client, args, sink, timed):
+    r = await client.post("/users/login", json={"email": args.email, "password": args.password})
+    r.raise_for_status()
+    login = r.json()
+    auth = {"Authorization": f"Bearer {login['access_token']}"}
+    user_id = login["user_id"]
+
+    # 실제 사용 비율에 가깝게: 읽기 위주, 로그인은 가끔, 신규 가입은 드물게 (메일을 읽을 수 있을 때만)
+    mix = [
+        ("GET /api/recommend-crop", 30, lambda: client.get("/api/recommend-crop", params={"location": random.choice(["서울", "부산", "대전", "제주"])})),
+        ("GET /api/produce-logs", 30, lambda: client.get("/api/produce-logs", params={"user_id": user_id, "limit": 50}, headers=auth)),
+        ("GET /api/produce-stats/crops", 15, lambda: client.get("/api/produce-stats/crops", params={"user_id": user_id}, headers=auth)),
+        ("POST /api/produce-logs", 15, lambda: client.post("/api/produce-logs", headers=auth, json={
+            "cropName": "쌀", "quantity": round(random.uniform(1, 100), 1), "productionDate": time.strftime("%Y-%m-%d")})),
+        ("POST /users/login", 10, lambda: client.post("/users/login", json={"email": args.email, "password": args.password})),
+    ]
+    if sink is not None:
+        mix.append(("signup funnel", 3, lambda: _signup_funnel(client, sink, timed)))
+    return mix
+
+
+async def _drive(client, args, sink):
+    import httpx
+
+    samples, errors = {}, {}
+
+    async def timed(name, awaitable):
+        # 성공하면 지연을 기록하고 결과를, 실패(4xx/5xx, 연결 오류, 메일 대기 초과)면 None을 돌려줌
+        started = time.perf_counter()
+        try:
+            result = await awaitable
+            ok = result is not None and getattr(result, "status_code", 200) < 400
+        except (httpx.HTTPError, TimeoutError):
+            result, ok = None, False
+        if ok:
+            samples.setdefault(name, []).append(time.perf_counter() - started)
+        else:
+            errors[name] = errors.get(name, 0) + 1
+        return result if ok else None
+
+    # (이름, 가중치, 요청 함수)
+    if args.public:
+        mix = [
+            ("GET /api/recommend-crop", 80, lambda: client.get("/api/recommend-crop", params={"location": random.choice(["서울", "부산", "대전", "제주"])})),
+            ("GET /api/recommend-crop/all", 20, lambda: client.get("/api/recommend-crop/all")),
+        ]
+    else:
+        mix = await _user_mix(client, args, sink, timed)
+
+    names = [m[0] for m in mix]
+    weights = [m[1] for m in mix]
+    calls = {m[0]: m[2] for m in mix}
+    deadline = time.monotonic() + args.duration
+
+    async def worker():
+        while time.monotonic() < deadline:
+            name = random.choices(names, weights)[0]
+            await timed(name, calls[name]())
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+    report = {}
+    for name in list(dict.fromkeys(names + list(samples) + list(errors))):
+        if samples.get(name):
+            report[name] = {"rps": len(samples[name]) / args.duration, "errors": errors.get(name, 0), **percentiles(samples[name])}
+        else:
+            report[name] = {"rps": 0, "errors": errors.get(name, 0)}
+    return report
+
+
+async def run_load(args):
+    if args.url:
+        import httpx
+
+        async with httpx.AsyncClient(base_url=args.url, timeout=30) as client:
+            return await _drive(client, args, sink=None)
+    async with _in_process_app(args) as (client, sink):
+        return await _drive(client, args, sink)
+
+
+# === 기준선 비교 ===
+def compare(report, baseline, metric, tolerance):
+    regressions = []
+    for name, now in report.items():
+        before = baseline.get("results", {}).get(name, {})
+        if metric in now and before.get(metric):
+            ratio = now[metric] / before[metric]
+            if ratio > 1 + tolerance:
+                regressions.append(f"{name}: {metric} {before[metric]:.2f} -> {now[metric]:.2f} (+{(ratio - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="datafarm back_end 성능 측정")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    micro = sub.add_parser("micro")
+    load = sub.add_parser("load")
+    load.add_argument("--url", nargs="?", const="http://localhost:1234",
+                      help="실행 중인 서버로 보냄 (값 없이 주면 homeController 기본 포트 1234). 없으면 이 프로세스에서 구동")
+    load.add_argument("--email", help="로그인 사용자 (프로세스 안 구동 시 이 값으로 미리 만들어 둠)")
+    load.add_argument("--password")
+    load.add_argument("--db-ms", type=float, default=2, help="프로세스 안 구동 시 가짜 DB 왕복 지연")
+    load.add_argument("--public", action="store_true")
+    load.add_argument("--duration", type=float, default=30)
+    load.add_argument("--concurrency", type=int, default=20)
+    micro.add_argument("--regions", type=int, default=10000, help="점수 엔진 측정용 합성 지역 수")
+    micro.add_argument("--crops", type=int, default=500, help="점수 엔진 측정용 합성 작물 수")
+    micro.add_argument("--rtt-ms", type=float, default=1.0, help="가짜 DB 왕복 지연 (회원가입/대량 적재 측정용)")
+    micro.add_argument("--bulk-rows", type=int, default=10000, help="대량 적재 측정 행 수 (행 단위 경로는 1/10)")
+    micro.add_argument("--log-rows", type=int, default=50000, help="생산 기록 응답 직렬화 측정 행 수")
+    micro.add_argument("--clients", type=int, default=200, help="동시 접속 수 (sync/async 라우트 지연 비교)")
+    micro.add_argument("--db-ms", type=float, default=20, help="sync/async 라우트 비교용 DB 왕복 지연")
+    micro.add_argument("--max-cores", type=int, default=os.cpu_count() or 1, help="로그인 처리량을 잴 최대 해시 프로세스 수")
+    for p in (micro, load):
+        p.add_argument("--out")
+        p.add_argument("--baseline")
+        p.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    if args.mode == "load" and not args.url:
+        args.email = args.email or "load@example.com"
+        args.password = args.password or "load-password"
+    if args.mode == "load" and not args.public and not (args.email and args.password):
+        parser.error("load --url: --email/--password 또는 --public 이 필요합니다")
+
+    report = asyncio.run(run_micro(args) if args.mode == "micro" else run_load(args))
+    result = {"mode": args.mode, "python": sys.version.split()[0], "results": report}
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, "mean_ms" if args.mode == "micro" else "p95_ms", args.tolerance)
+        for line in regressions:
+            print("느려짐:", line)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+USERS.EMAIL_NORM 조회가 UX_USERS_EMAIL_NORM 인덱스를 타는지 확인 (back_end 폴더에서, 개발용 Oracle에 대해 실행)
+
+  python check_email_index.py [--table USERS] [--index UX_USERS_EMAIL_NORM]
+
+sql/users_email_norm.sql 적용 후 UsersDAO가 보내는 이메일 조회 문장마다 EXPLAIN PLAN을 떠서
+INDEX (UNIQUE) SCAN <인덱스>가 있는지 봅니다. 하나라도 없으면 계획을 출력하고 종료 코드 1.
+비교용으로 예전 WHERE LOWER(EMAIL) = ... 의 계획도 출력합니다 (보통 TABLE ACCESS FULL).
+통계가 없으면 옵티마이저가 작은 테이블을 FULL로 읽을 수 있으니 먼저 DBMS_STATS.GATHER_TABLE_STATS를 돌리세요.
+"""
+import argparse
+import sys
+import uuid
+
+# UsersDAO와 같은 조건의 문장 (선택 컬럼은 계획에 영향이 없어 PK 대신 고정 컬럼 사용)
+STATEMENTS = {
+    "send_otp / verify_otp": "SELECT IS_VERIFIED FROM {table} WHERE EMAIL_NORM = :P_EMAIL_NORM",
+    "signUp 사전 확인 / PL/SQL 블록": "SELECT NVL(IS_VERIFIED, 0), USERNAME, PASSWORD FROM {table} WHERE EMAIL_NORM = :P_EMAIL_NORM",
+    "login": "SELECT EMAIL, PASSWORD FROM {table} WHERE EMAIL_NORM = :P_EMAIL_NORM",
+}
+LEGACY = "SELECT EMAIL, PASSWORD FROM {table} WHERE LOWER(EMAIL) = :P_EMAIL"
+
+
+def uses_index(plan_rows, index: str) -> bool:
+    """plan_rows: PLAN_TABLE의 (OPERATION, OPTIONS, OBJECT_NAME) 목록"""
+    return any(op == "INDEX" and (name or "").upper() == index.upper() for op, _, name in plan_rows)
+
+
+def explain(cur, sql: str):
+    statement_id = uuid.uuid4().hex[:30]
+    cur.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {sql}")
+    cur.execute(
+        "SELECT OPERATION, OPTIONS, OBJECT_NAME FROM PLAN_TABLE WHERE STATEMENT_ID = :P_ID ORDER BY ID",
+        {"P_ID": statement_id},
+    )
+    rows = cur.fetchall()
+    cur.execute("DELETE FROM PLAN_TABLE WHERE STATEMENT_ID = :P_ID", {"P_ID": statement_id})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EMAIL_NORM 인덱스 사용 확인")
+    parser.add_argument("--table", default="USERS")
+    parser.add_argument("--index", default="UX_USERS_EMAIL_NORM")
+    args = parser.parse_args()
+
+    from SSY.ssyDBManager import SsyDBManager
+
+    failed = False
+    with SsyDBManager.acquire() as (con, cur):
+        for name, sql in STATEMENTS.items():
+            rows = explain(cur, sql.format(table=args.table))
+            ok = uses_index(rows, args.index)
+            failed |= not ok
+            print(f"[{'OK' if ok else '인덱스 안 탐'}] {name}")
+            for op, options, obj in rows:
+                print(f"    {op} {options or ''} {obj or ''}".rstrip())
+        print("[참고] 예전 LOWER(EMAIL) 조회")
+        for op, options, obj in explain(cur, LEGACY.format(table=args.table)):
+            print(f"    {op} {options or ''} {obj or ''}".rstrip())
+        con.commit()
+    SsyDBManager.closePool()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,16 @@
-import requests
+import asyncio
 import os
 
-# 날씨 API 키를 환경 변수에서 가져옵니다.
-WEATHER_API_KEY = os.environ.get("WEATHER_API_KEY")
+from cropRd.cropScorer import CropScorer
+from cropRd.regionIndex import RegionIndex
+from cropRd.weatherProvider import WeatherCache, OpenWeatherMapProvider
+from SSY import config
 
-#  주요 도시의 위도/경도 데이터
-locations = {
-    '서울': {'lat': 37.5665, 'lon': 126.9780},
-    '부산': {'lat': 35.1796, 'lon': 129.0756},
-    '대전': {'lat': 36.3504, 'lon': 127.3845},
-    '제주': {'lat': 33.4996, 'lon': 126.5312},
-}
+#  추천 지역 색인 (지역명/행정구역명 + 위도/경도 중심점, regions.json)
+region_finder = RegionIndex.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), "regions.json"))
+
+#  지역별 위도/경도 데이터
+locations = {r['name']: {'lat': r['lat'], 'lon': r['lon']} for r in region_finder.regions}
 
 #  농작물 데이터 (생육 최적 조건)
 crop_data = {
@@ -32,43 +32,97 @@ crop_data = {
     },
 }
 
-#  OpenWeatherMap API에서 실시간 날씨 데이터 가져오기
-def get_weather_data(lat: float, lon: float):
-    try:
-        url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={WEATHER_API_KEY}&units=metric"
-        response = requests.get(url)
-        response.raise_for_status() # HTTP 오류가 발생하면 예외 발생
-        data = response.json()
-        
-        temp = data['main']['temp']
-        rain = data.get('rain', {}).get('1h', 0) or data.get('rain', {}).get('3h', 0) or 0
-        
-        return {'temp': temp, 'rain': rain}
-    except requests.exceptions.RequestException as e:
-        print(f"날씨 API 호출 실패: {e}")
-        return None
-
-#  농작물 추천 함수
-def get_recommendations(location: str):
+#  날씨 캐시 (공급자는 앱 기동 시 configure_weather()로 연결, 테스트에서는 weather.set_provider()로 교체)
+weather = WeatherCache(None)
+
+def configure_weather(provider=None):
+    # 공급자를 주지 않으면 설정(WEATHER_*)으로 OpenWeatherMap 공급자를 만듦 (HTTP 클라이언트도 이때 생성)
+    weather.ttl = config.WEATHER_CACHE_TTL
+    weather.stale_ttl = config.WEATHER_STALE_TTL
+    if provider is None:
+        provider = OpenWeatherMapProvider(
+            config.WEATHER_API_KEY,
+            base_url=config.WEATHER_API_URL,
+            timeout=config.WEATHER_TIMEOUT,
+        )
+    weather.set_provider(provider)
+    return weather
+
+#  실시간 날씨 데이터 가져오기 (위치별 캐시/동시 요청 합치기)
+async def get_weather_data(lat: float, lon: float):
+    return await weather.get(lat, lon)
+
+#  전체 지역 날씨를 주기적으로 미리 받아 둠 (앱 기동 시 호출)
+def start_weather_refresher():
+    return weather.start_refresher([(c['lat'], c['lon']) for c in locations.values()])
+
+#  작물별 조건 표 (crop_data의 지역별 목록을 합친 것) + 점수 엔진
+crops = {}
+for _region_crops in crop_data.values():
+    crops.update(_region_crops)
+scorer = CropScorer(crops)
+
+#  지역 순서 / 지역별 재배 후보 마스크 (crop_data에 없는 지역은 모든 작물이 후보)
+region_names = list(locations.keys())
+region_index = {name: i for i, name in enumerate(region_names)}
+region_mask = scorer.mask([
+    list(crop_data[name].keys()) if name in crop_data else None for name in region_names
+])
+
+#  지역 결정: 지역명(별칭 포함) > 좌표(최근접 지역) > 주소(시도/시군구) 순
+def resolve_region(location: str = None, lat: float = None, lon: float = None,
+                   si_do: str = None, si_gun_gu: str = None):
+    region = None
+    if location:
+        region = region_finder.by_name(location)
+    if region is None and lat is not None and lon is not None:
+        region = region_finder.nearest(lat, lon)
+    if region is None and si_do:
+        region = region_finder.by_address(si_do, si_gun_gu)
+    return region['name'] if region else None
+
+#  농작물 추천 함수 (적합도 점수 상위 top_n)
+async def get_recommendations(location: str, top_n: int = 5):
+    location = resolve_region(location) or location
     location_coords = locations.get(location)
     if not location_coords:
         return {'recommendations': ['유효하지 않은 지역입니다.']}
-        
-    weather_data = get_weather_data(location_coords['lat'], location_coords['lon'])
+
+    weather_data = await get_weather_data(location_coords['lat'], location_coords['lon'])
     if not weather_data:
         return {'recommendations': ['날씨 데이터를 가져오는 데 실패했습니다.']}
-        
-    recommendations = []
-    location_data = crop_data.get(location, {})
-    
-    for crop, conditions in location_data.items():
-        if (weather_data['temp'] >= conditions['optimal_temp'][0] and
-            weather_data['temp'] <= conditions['optimal_temp'][1] and
-            weather_data['rain'] >= conditions['optimal_rain'][0] and
-            weather_data['rain'] <= conditions['optimal_rain'][1]):
-            recommendations.append(crop)
-
-    if not recommendations:
-        return {'recommendations': ['해당 지역에 추천할 농작물이 없습니다.']}
-
-    return {'recommendations': recommendations}
\ No newline at end of file
+
+    r = region_index[location]
+    scores = scorer.score([weather_data['temp']], [weather_data['rain']], region_mask[r:r + 1])
+    ranked = scorer.top_n(scores, top_n)[0]
+
+    if not ranked:
+        return {'region': location, 'recommendations': ['해당 지역에 추천할 농작물이 없습니다.'], 'scores': []}
+
+    return {'region': location, 'recommendations': [item['crop'] for item in ranked], 'scores': ranked}
+
+#  추천 결과를 클라이언트가 캐시해도 되는 시간(초) = 그 지역 날씨 캐시의 남은 TTL
+def recommendation_max_age(region: str = None) -> int:
+    if region is None:
+        # 전체 지역: 가장 먼저 만료되는 지역 기준
+        return min((recommendation_max_age(name) for name in region_names), default=0)
+    coords = locations.get(region)
+    return int(weather.ttl_left(coords['lat'], coords['lon'])) if coords else 0
+
+#  전체 지역 일괄 추천 (날씨는 캐시에서, 점수는 한 번의 배열 연산으로)
+async def score_all_regions(top_n: int = 5):
+    weathers = await asyncio.gather(*(
+        get_weather_data(locations[name]['lat'], locations[name]['lon']) for name in region_names
+    ))
+    ok = [i for i, w in enumerate(weathers) if w]
+    failed = [region_names[i] for i, w in enumerate(weathers) if not w]
+    if not ok:
+        return {'regions': {}, 'failed': failed}
+
+    scores = scorer.score(
+        [weathers[i]['temp'] for i in ok],
+        [weathers[i]['rain'] for i in ok],
+        region_mask[ok],
+    )
+    ranked = scorer.top_n(scores, top_n)
+    return {'regions': {region_names[i]: ranked[j] for j, i in enumerate(ok)}, 'failed': failed}
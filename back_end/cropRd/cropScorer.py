@@ -0,0 +1,78 @@
+import numpy as np
+
+
+#  작물 적합도 점수 엔진
+#  작물별 최적 조건 범위를 배열로 들고 있다가, 지역 × 작물 전체 점수를 한 번의 배열 연산으로 계산합니다.
+#
+#  점수 = 기온 적합도 × 강수 적합도 (0.0 ~ 1.0)
+#  - 최적 범위 안이면 1.0
+#  - 범위를 벗어나면 벗어난 정도에 비례해 줄어들고, tolerance(범위 폭 × tolerance_ratio) 만큼 벗어나면 0.0
+class CropScorer:
+    def __init__(self, crops: dict, tolerance_ratio: float = 0.5):
+        """
+        crops: {'쌀': {'optimal_temp': [15, 25], 'optimal_rain': [50, 100]}, ...}
+        """
+        self.names = list(crops.keys())
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+        temp = np.array([crops[n]['optimal_temp'] for n in self.names], dtype=np.float32).reshape(-1, 2)
+        rain = np.array([crops[n]['optimal_rain'] for n in self.names], dtype=np.float32).reshape(-1, 2)
+        self.temp_lo, self.temp_hi = temp[:, 0], temp[:, 1]
+        self.rain_lo, self.rain_hi = rain[:, 0], rain[:, 1]
+        # 폭이 0인 범위도 나눗셈이 되도록 최소 1.0
+        self.temp_tol = np.maximum((self.temp_hi - self.temp_lo) * tolerance_ratio, 1.0)
+        self.rain_tol = np.maximum((self.rain_hi - self.rain_lo) * tolerance_ratio, 1.0)
+
+    @staticmethod
+    def _fit(x, lo, hi, tol):
+        # x: (R, 1), lo/hi/tol: (C,) -> (R, C)
+        outside = np.maximum(np.maximum(lo - x, x - hi), 0.0)
+        return np.clip(1.0 - outside / tol, 0.0, 1.0)
+
+    def mask(self, region_crops: list):
+        """
+        region_crops: 지역별 재배 후보 작물 이름 목록의 리스트 (지역 순서대로)
+        -> (R, C) bool 배열. None이 든 지역은 모든 작물이 후보입니다.
+        """
+        m = np.zeros((len(region_crops), len(self.names)), dtype=bool)
+        for r, names in enumerate(region_crops):
+            if names is None:
+                m[r, :] = True
+            else:
+                m[r, [self.index[n] for n in names if n in self.index]] = True
+        return m
+
+    def score(self, temps, rains, mask=None):
+        """
+        temps, rains: 지역별 관측값 (R,)
+        mask: (R, C) bool, 후보가 아닌 작물은 0점
+        -> (R, C) float32 점수 행렬
+        """
+        t = np.asarray(temps, dtype=np.float32).reshape(-1, 1)
+        r = np.asarray(rains, dtype=np.float32).reshape(-1, 1)
+        scores = self._fit(t, self.temp_lo, self.temp_hi, self.temp_tol)
+        scores *= self._fit(r, self.rain_lo, self.rain_hi, self.rain_tol)
+        if mask is not None:
+            scores *= mask
+        return scores
+
+    def top_n(self, scores, n: int = 5):
+        """
+        scores: (R, C) 점수 행렬 -> 지역별 [{'crop': 이름, 'score': 점수}, ...] (점수 내림차순, 0점 제외)
+        """
+        scores = np.atleast_2d(scores)
+        n = max(1, min(n, scores.shape[1]))
+        # 행마다 전체 정렬 대신 상위 n개만 골라낸 뒤 그 안에서 정렬
+        top = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        results = []
+        for idx_row, score_row in zip(top.tolist(), top_scores.tolist()):
+            results.append([
+                {'crop': self.names[i], 'score': round(s, 4)}
+                for i, s in zip(idx_row, score_row) if s > 0
+            ])
+        return results
@@ -0,0 +1,111 @@
+import json
+import math
+
+
+#  추천 지역 색인
+#  - 이름 색인: 지역명/행정구역명(별칭) -> 지역 (해시 조회)
+#  - 좌표 색인: 위도/경도 격자(grid)에 지역 중심점을 나눠 담아, 가까운 칸부터 찾아 나가는 최근접 탐색
+#  외부 지오코딩 호출 없이 로컬 데이터 파일(regions.json)만으로 동작합니다.
+class RegionIndex:
+    def __init__(self, regions: list, cell_deg: float = 0.5, margin_deg: float = 1.0):
+        """
+        regions: [{'name': '서울', 'lat': 37.56, 'lon': 126.97, 'aliases': ['서울특별시', ...]}, ...]
+        cell_deg: 격자 한 칸의 크기(도). 지역 간격과 비슷하게 잡으면 탐색 칸 수가 가장 적습니다.
+        margin_deg: 지역 중심점들의 범위(bounding box)를 이만큼 넓힌 곳까지만 좌표 검색을 받습니다.
+        """
+        self.regions = regions
+        self.cell_deg = cell_deg
+        self._names = {}
+        self._grid = {}
+
+        for i, region in enumerate(regions):
+            for name in [region['name']] + region.get('aliases', []):
+                self._names[self.normalize(name)] = i
+            self._grid.setdefault(self._cell(region['lat'], region['lon']), []).append(i)
+
+        # 좌표 검색 범위와, 그 안에서 경도 1도의 최소 길이 비율 (거리 하한 계산용)
+        self.bounds = None
+        self._cos_min = 1.0
+        if regions:
+            lats = [r['lat'] for r in regions]
+            lons = [r['lon'] for r in regions]
+            self.bounds = (min(lats) - margin_deg, max(lats) + margin_deg,
+                           min(lons) - margin_deg, max(lons) + margin_deg)
+            self._cos_min = math.cos(math.radians(min(89.0, max(abs(self.bounds[0]), abs(self.bounds[1])))))
+            cells = list(self._grid)
+            self._cell_range = (min(c[0] for c in cells), max(c[0] for c in cells),
+                                min(c[1] for c in cells), max(c[1] for c in cells))
+
+    @classmethod
+    def load(cls, path: str, **kwargs):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)['regions'], **kwargs)
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        return "".join((name or "").split())
+
+    def _cell(self, lat: float, lon: float):
+        return (math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg))
+
+    @staticmethod
+    def _dist2(lat1, lon1, lat2, lon2):
+        # 근거리용 등장방형 근사 (비교용이므로 제곱 거리)
+        x = (lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+        y = lat2 - lat1
+        return x * x + y * y
+
+    # === 이름 -> 지역 ===
+    def by_name(self, name: str):
+        i = self._names.get(self.normalize(name))
+        return self.regions[i] if i is not None else None
+
+    # === 주소(시도/시군구) -> 지역 : 더 구체적인 이름부터 시도 ===
+    def by_address(self, si_do: str, si_gun_gu: str = None):
+        if si_gun_gu:
+            region = self.by_name(f"{si_do}{si_gun_gu}")
+            if region:
+                return region
+        return self.by_name(si_do)
+
+    # === 좌표 검색 범위 ===
+    def covers(self, lat: float, lon: float) -> bool:
+        if self.bounds is None:
+            return False
+        lat_min, lat_max, lon_min, lon_max = self.bounds
+        return lat_min <= lat <= lat_max and lon_min <= lon <= lon_max
+
+    def _ring(self, ci: int, cj: int, ring: int):
+        # 중심 칸에서 체비셰프 거리 ring 인 테두리 칸만 (안쪽 칸은 이전 고리에서 이미 봄)
+        if ring == 0:
+            yield ci, cj
+            return
+        for dj in range(-ring, ring + 1):
+            yield ci - ring, cj + dj
+            yield ci + ring, cj + dj
+        for di in range(-ring + 1, ring):
+            yield ci + di, cj - ring
+            yield ci + di, cj + ring
+
+    # === 좌표 -> 가장 가까운 지역 ===
+    def nearest(self, lat: float, lon: float):
+        """범위(bounds) 밖의 좌표는 None (먼 좌표로 격자 전체를 훑지 않도록)"""
+        if not self.covers(lat, lon):
+            return None
+        ci, cj = self._cell(lat, lon)
+        imin, imax, jmin, jmax = self._cell_range
+        last_ring = max(ci - imin, imax - ci, cj - jmin, jmax - cj)  # 이보다 바깥 고리에는 지역이 없음
+        best, best_d = None, float("inf")
+        for ring in range(last_ring + 1):
+            for cell in self._ring(ci, cj, ring):
+                for i in self._grid.get(cell, ()):
+                    r = self.regions[i]
+                    d = self._dist2(lat, lon, r['lat'], r['lon'])
+                    if d < best_d:
+                        best, best_d = r, d
+            # 다음 고리의 지역은 위도 또는 경도로 최소 ring 칸만큼 떨어져 있음.
+            # 경도 차이는 cos(위도)배로 줄어드는데, 범위 안 위도에서 가장 작은 cos 값으로 잡으면 항상 하한이 됨
+            reach = ring * self.cell_deg * self._cos_min
+            if best is not None and reach * reach >= best_d:
+                break
+        return best
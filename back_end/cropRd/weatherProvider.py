@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import time
+
+import httpx
+
+from SSY.ssyMetrics import SsyMetrics
+
+logger = logging.getLogger(__name__)
+
+
+#  날씨 공급자 인터페이스
+#  fetch()는 {'temp': 섭씨, 'rain': mm} 또는 실패 시 None을 돌려줍니다.
+#  테스트에서는 base_url을 로컬 스텁 서버로 바꾸거나 이 클래스를 상속해 갈아끼우면 됩니다.
+class WeatherProvider:
+    async def fetch(self, lat: float, lon: float):
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
+
+
+#  OpenWeatherMap 공급자 (커넥션 재사용 + 타임아웃)
+class OpenWeatherMapProvider(WeatherProvider):
+    def __init__(self, api_key: str, base_url: str = "https://api.openweathermap.org",
+                 timeout: float = 3.0, max_connections: int = 20):
+        self.api_key = api_key
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def fetch(self, lat: float, lon: float):
+        try:
+            async with SsyMetrics.atimer("external_call_duration_seconds", {"service": "openweathermap"},
+                                         help="Outbound call duration (weather API, SMTP)"):
+                response = await self.client.get(
+                    "/data/2.5/weather",
+                    params={"lat": lat, "lon": lon, "appid": self.api_key, "units": "metric"},
+                )
+            response.raise_for_status()  # HTTP 오류가 발생하면 예외 발생
+            data = response.json()
+
+            temp = data['main']['temp']
+            rain = data.get('rain', {}).get('1h', 0) or data.get('rain', {}).get('3h', 0) or 0
+
+            return {'temp': temp, 'rain': rain}
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            SsyMetrics.inc("external_call_errors_total", {"service": "openweathermap"}, help="Failed outbound calls")
+            logger.warning("날씨 API 호출 실패: %s", e)
+            return None
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+#  위치별 TTL 캐시
+#  - ttl 이내: 캐시 그대로 반환
+#  - ttl 지남 ~ stale_ttl 이내: 묵은 값을 바로 돌려주고 뒤에서 갱신
+#  - 그 이후/없음: 새로 가져옴
+#  같은 위치에 대한 동시 요청은 진행 중인 하나의 fetch를 함께 기다립니다.
+class WeatherCache:
+    def __init__(self, provider: WeatherProvider, ttl: float = 600, stale_ttl: float = 1800,
+                 concurrency: int = 8):
+        self.provider = provider
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.concurrency = concurrency
+        self._entries = {}   # key -> (data, fetched_at)
+        self._inflight = {}  # key -> asyncio.Task
+        self._refresher = None
+
+    @staticmethod
+    def key(lat: float, lon: float):
+        # 약 1km 격자로 묶어 같은 지역 요청을 한 키로 모읍니다.
+        return (round(lat, 2), round(lon, 2))
+
+    def set_provider(self, provider: WeatherProvider):
+        self.provider = provider
+        self._entries.clear()
+
+    def ttl_left(self, lat: float, lon: float) -> float:
+        """캐시된 값이 신선한(ttl 이내) 남은 초, 없으면 0"""
+        entry = self._entries.get(self.key(lat, lon))
+        if not entry:
+            return 0.0
+        return max(0.0, self.ttl - (time.monotonic() - entry[1]))
+
+    async def get(self, lat: float, lon: float):
+        k = self.key(lat, lon)
+        entry = self._entries.get(k)
+        if entry:
+            data, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                return data
+            if age < self.stale_ttl:
+                self._fetch(k, lat, lon)  # 뒤에서 갱신만 걸어둠
+                return data
+        return await self._fetch(k, lat, lon)
+
+    def _fetch(self, k, lat, lon):
+        task = self._inflight.get(k)
+        if task is None:
+            task = asyncio.ensure_future(self._load(k, lat, lon))
+            self._inflight[k] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(k, None))
+        return task
+
+    async def _load(self, k, lat, lon):
+        data = await self.provider.fetch(lat, lon)
+        if data is not None:
+            self._entries[k] = (data, time.monotonic())
+            return data
+        # 실패 시 stale 범위 안의 이전 값이 있으면 그걸로 버팁니다.
+        entry = self._entries.get(k)
+        if entry and time.monotonic() - entry[1] < self.stale_ttl:
+            return entry[0]
+        return None
+
+    async def refresh_all(self, coords):
+        """coords: [(lat, lon), ...] 를 동시에(최대 concurrency개) 새로 가져옵니다."""
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def one(lat, lon):
+            async with sem:
+                await self._fetch(self.key(lat, lon), lat, lon)
+
+        await asyncio.gather(*(one(lat, lon) for lat, lon in coords), return_exceptions=True)
+
+    def start_refresher(self, coords, interval: float = None):
+        """ttl보다 조금 일찍 주기적으로 전체 위치를 미리 데워 둡니다."""
+        if self._refresher is None:
+            self._refresher = asyncio.create_task(self._refresh_loop(list(coords), interval or self.ttl * 0.8))
+        return self._refresher
+
+    async def _refresh_loop(self, coords, interval):
+        while True:
+            try:
+                await self.refresh_all(coords)
+            except Exception:
+                logger.exception("weather refresh failed")
+            await asyncio.sleep(interval)
+
+    async def stop_refresher(self):
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+
+    async def aclose(self):
+        """갱신 작업을 멈추고 공급자(HTTP 클라이언트)까지 닫음"""
+        await self.stop_refresher()
+        if self.provider is not None:
+            await self.provider.aclose()
@@ -0,0 +1,32 @@
+# 운영 서버 설정 (back_end 폴더에서 실행)
+#
+#   gunicorn -c gunicorn.conf.py homeController:app
+#
+# - 워커 수: WEB_WORKERS (0이면 CPU 수). 개발용은 python homeController.py (단일 프로세스 + reload)
+# - preload_app: 마스터가 앱을 한 번 import 해 두고 fork 하므로 작물 표/지역 색인 같은 읽기 전용 데이터를
+#   워커들이 복사 없이 공유합니다. DB 풀/HTTP 클라이언트/메일 워커는 워커마다 lifespan에서 따로 만듭니다.
+# - 세션 풀: DB_POOL_BUDGET(전체 상한)을 워커 수로 나눠 워커당 max를 정합니다 (Settings.db_pool_limits).
+# - SIGTERM: 새 연결을 받지 않고 진행 중 요청을 마친 뒤 lifespan 종료(메일 발송 마무리 -> 트랜잭션 반납 대기 -> 풀 닫기).
+#   GRACEFUL_TIMEOUT 안에 끝나지 않으면 강제 종료됩니다.
+from SSY.config import get_settings
+
+_settings = get_settings()  # 이름이 gunicorn 설정(config)과 겹치지 않게
+
+bind = _settings.SERVER_BIND
+workers = _settings.WEB_WORKERS
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+graceful_timeout = _settings.GRACEFUL_TIMEOUT + 5  # lifespan 종료 정리 시간 여유
+timeout = 60
+keepalive = 5
+
+
+def on_starting(server):
+    pool_min, pool_max = _settings.db_pool_limits()
+    server.log.info("web workers=%s, db pool per worker=%s..%s", workers, pool_min, pool_max)
+    if workers > 1:
+        # 프로세스 내 저장소는 워커끼리 공유되지 않음 (버전 저장소는 Settings가 기동 자체를 막음)
+        if _settings.RATE_LIMIT_BACKEND == "memory":
+            server.log.warning("RATE_LIMIT_BACKEND=memory: 요청 제한이 워커마다 따로 계산됩니다 (redis 권장)")
+        if _settings.OTP_BACKEND == "memory":
+            server.log.warning("OTP_BACKEND=memory: 다른 워커에서 발급한 OTP는 검증되지 않습니다 (oracle/redis 사용)")
@@ -1,13 +1,40 @@
-import uvicorn
-from typing import Optional
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional
 
-from fastapi import FastAPI, Form, UploadFile, File, Body
+import orjson
+from fastapi import APIRouter, FastAPI, Form, UploadFile, File, Body, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, EmailStr
+from starlette.datastructures import MutableHeaders
 
 from users.userDAO import UsersDAO
-from cropRd.cropRd import get_recommendations
+from cropRd.cropRd import (
+    configure_weather, get_recommendations, recommendation_max_age, region_finder, resolve_region, score_all_regions,
+    start_weather_refresher, weather,
+)
 from produceLogDAO.produceLogDAO import ProduceLogDAO
+from SSY.ssyAsyncDBManager import SsyAsyncDBManager
+from SSY.ssyMetadata import SsyMetadata
+from SSY.ssyMailWorker import SsyMailWorker
+from SSY.ssyPasswordHasher import SsyPasswordHasher
+from SSY.ssyTokenManager import SsyTokenManager, current_user_id, optional_user_id, require_admin_token
+from SSY.ssyFileStore import SsyFileStore
+from SSY.ssyLocationCache import SsyLocationCache
+from SSY.ssyHttpCache import VersionStore, create_version_store, make_etag, not_modified, not_modified_response
+from SSY.ssyRateLimiter import RateLimiter, create_rate_limiter, client_ip, too_many_requests
+from SSY.ssyApiError import SsyApiError, register_error_handlers
+from SSY.ssyMetrics import SsyMetrics, COUNT_BUCKETS
+from SSY import config
+from SSY.config import Settings
+from schemas import (
+    ResultOut, TokenOut, LoginOut, ProduceLogPage, BulkInsertOut, CropTotalsOut, PeriodTotalsOut,
+    RegionTotalsOut, YearOverYearOut, RebuildOut, RecommendOut, RecommendAllOut, DbPoolStatsOut, MetadataRefreshOut,
+)
+
+logger = logging.getLogger(__name__)
 
 # ===== JSON Body Models =====
 class EmailIn(BaseModel):
@@ -20,37 +47,220 @@ class OtpIn(BaseModel):
 class LoginIn(BaseModel):
     email: EmailStr
     password: str
+
+class RefreshIn(BaseModel):
+    refresh_token: str
+
 class ProduceLogIn(BaseModel):
-    userId: int
+    userId: Optional[int] = None  # 생략하면 로그인 사용자
     cropName: str
     quantity: float
     productionDate: str # "YYYY-MM-DD" 형식
 
-app = FastAPI()
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # 개발 중엔 * 허용(운영은 도메인 제한 권장)
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+def owned_user_id(user_id: Optional[int], me: int) -> int:
+    # 조회 대상 user_id가 없으면 로그인 사용자, 다른 사용자면 403 (토큰만으로 판단, DB 조회 없음)
+    if user_id is not None and user_id != me:
+        raise SsyApiError(403, "다른 사용자의 기록에는 접근할 수 없습니다.")
+    return me
+
+async def warm_metadata():
+    # 스키마/PK/컬럼 메타데이터와 주소 캐시를 첫 요청 전에 미리 조회 (실패하면 첫 요청 때 지연 조회)
+    try:
+        async with SsyAsyncDBManager.acquire() as (con, cur):
+            await SsyMetadata.warm(cur)
+            await SsyLocationCache.warm(cur)
+    except Exception:
+        logger.exception("metadata warm-up failed")
+
+# === 앱 상태의 공유 자원 (lifespan에서 준비, 테스트에서는 가짜로 교체) ===
+def users_dao(request: Request) -> UsersDAO:
+    return request.app.state.users_dao
+
+def produce_log_dao(request: Request) -> ProduceLogDAO:
+    return request.app.state.produce_log_dao
+
+def rate_limiter(request: Request) -> RateLimiter:
+    return request.app.state.limiter  # OTP 발송/검증 요청 제한 (config.RATE_LIMIT_BACKEND)
+
+def data_versions(request: Request) -> VersionStore:
+    return request.app.state.versions  # ETag용 데이터 버전 (config.CACHE_VERSION_BACKEND)
+
+# === HTTP 캐시 ===
+# 생산 기록: 브라우저가 저장해 두고 매번 If-None-Match로 재검증 -> 안 바뀌었으면 DB 조회 없이 304
+LOGS_CACHE_CONTROL = "private, no-cache"
+LOGS_VARY = "Authorization"  # 같은 URL이라도 토큰(사용자)마다 다른 응답
+
+def logs_version_key(user_id: int) -> str:
+    return f"produce-logs:{user_id}"
+
+def cached_json(request: Request, response: Response, body, max_age: int, scope: str = "public"):
+    # 날씨 기반 추천: 날씨 캐시가 신선한 동안은 그대로 재사용, 그 뒤엔 ETag로 재검증 (실패/오류 결과는 저장 안 함)
+    if max_age <= 0:
+        response.headers["Cache-Control"] = "no-store"
+        return body
+    cache_control = f"{scope}, max-age={max_age}"
+    etag = make_etag(orjson.dumps(body).decode())
+    if not_modified(request, etag):
+        return not_modified_response(etag, cache_control)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return body
 
-uDAO = UsersDAO()
-pDAO = ProduceLogDAO()
+# === 요청 지표: 라우트별 처리 시간 + 요청당 DB 왕복 수/시간 ===
+class MetricsMiddleware:
+    """
+    순수 ASGI 미들웨어. 처리 시간은 마지막 본문 조각(more_body=False)을 보낸 시점까지 재므로
+    StreamingResponse(기록 스트리밍 등)도 본문을 다 보낼 때까지가 잡힙니다. DB 왕복도 본문 전송 중의 것까지 셈.
+    Server-Timing 헤더는 응답 시작(http.response.start) 시점까지의 값입니다 (헤더는 본문보다 먼저 나가므로).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = SsyMetrics.begin_request()
+        started = time.perf_counter()
+        status = 500
+        finished = None
+
+        async def send_timed(message):
+            nonlocal status, finished
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if status != 500:
+                    round_trips, db_seconds = SsyMetrics.request_stats()
+                    MutableHeaders(scope=message).append("Server-Timing", (
+                        f'db;dur={db_seconds * 1000:.1f};desc="{round_trips} round trips", '
+                        f'app;dur={(time.perf_counter() - started) * 1000:.1f}'
+                    ))
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                finished = time.perf_counter()  # 이후의 BackgroundTasks는 포함하지 않음
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            elapsed = (finished or time.perf_counter()) - started
+            round_trips, db_seconds = SsyMetrics.end_request(token)
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"  # 템플릿 경로라 라벨 수가 고정됨
+            SsyMetrics.observe("http_request_duration_seconds", elapsed,
+                               {"method": scope["method"], "route": path, "status": status},
+                               help="Request latency by route (until the last body chunk is sent)")
+            SsyMetrics.observe("http_request_db_round_trips", round_trips, {"route": path},
+                               buckets=COUNT_BUCKETS, help="Oracle round trips per request")
+            SsyMetrics.observe("http_request_db_seconds", db_seconds, {"route": path},
+                               help="Time spent in Oracle per request")
+
+router = APIRouter()
+
+def create_app(
+    settings: Optional[Settings] = None,
+    *,
+    users_dao: Optional[UsersDAO] = None,
+    produce_log_dao: Optional[ProduceLogDAO] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    version_store: Optional[VersionStore] = None,
+    weather_provider=None,
+) -> FastAPI:
+    """
+    앱 팩토리. 여기서는 라우트/미들웨어만 붙이고, 자원(DB 풀, 날씨 HTTP 클라이언트, 메일 워커, 캐시)은 lifespan에서 만들고 닫습니다.
+    - settings: 주면 프로세스 설정으로 사용 (없으면 처음 쓰일 때 .env/환경 변수에서 읽음)
+    - users_dao/produce_log_dao/rate_limiter/version_store/weather_provider: 테스트용 가짜 (넘긴 것은 앱이 닫지 않음)
+    ORACLE_DSN이 없으면 세션 풀/메타데이터 준비와 메일 워커를 건너뛰므로 DB 없이도 기동됩니다.
+    """
+    if settings is not None:
+        config.configure(settings)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        use_db = config.get_settings().db_configured
+        if use_db:
+            # 기동 시 세션 풀을 미리 만들고(min 세션 오픈), 종료 시 닫습니다.
+            SsyAsyncDBManager.getPool()
+            await warm_metadata()
+        app.state.users_dao = users_dao or UsersDAO()
+        app.state.produce_log_dao = produce_log_dao or ProduceLogDAO()
+        app.state.limiter = rate_limiter or create_rate_limiter()
+        app.state.versions = version_store or create_version_store()
+        configure_weather(weather_provider)
+        if weather_provider is not None or config.WEATHER_API_KEY:
+            start_weather_refresher()
+        if use_db:
+            SsyMailWorker.start()
+        yield
+        # 종료(SIGTERM) 시: 서버가 진행 중 요청을 마친 뒤 여기로 옴 -> 발송할 메일을 마저 보내고, 남은 트랜잭션이 끝나면 풀을 닫음
+        if use_db:
+            await SsyMailWorker.stop(timeout=config.GRACEFUL_TIMEOUT / 2)
+        if users_dao is None:
+            await app.state.users_dao.otp.aclose()
+        if rate_limiter is None:
+            await app.state.limiter.aclose()
+        if version_store is None:
+            await app.state.versions.aclose()
+        if weather_provider is None:
+            await weather.aclose()
+        else:
+            await weather.stop_refresher()  # 넘겨받은 공급자는 호출자가 닫음
+        if use_db:
+            await SsyAsyncDBManager.closePool(timeout=config.GRACEFUL_TIMEOUT / 4)
+        await SsyPasswordHasher.shutdown()
+        await SsyFileStore.shutdown()
+
+    # JSON 응답은 라우트의 response_model로 FastAPI(Pydantic)가 바로 직렬화 (기록 목록/스트리밍만 orjson)
+    app = FastAPI(lifespan=lifespan)
+    register_error_handlers(app)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # 개발 중엔 * 허용(운영은 도메인 제한 권장)
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(router)
+    return app
 
 # === OTP 전송(JSON) ===
-@app.post("/users/auth-email")
-def auth_email_route(body: EmailIn = Body(...)):
-    return uDAO.send_otp(body.email)
+@router.post("/users/auth-email", response_model=ResultOut)
+async def auth_email_route(
+    request: Request,
+    body: EmailIn = Body(...),
+    uDAO: UsersDAO = Depends(users_dao),
+    limiter: RateLimiter = Depends(rate_limiter),
+):
+    # DB/SMTP 작업 전에 이메일별·IP별로 제한
+    retry_after = await limiter.check([
+        (f"otp-send:email:{body.email.strip().lower()}", config.OTP_SEND_LIMIT_PER_EMAIL),
+        (f"otp-send:ip:{client_ip(request)}", config.OTP_SEND_LIMIT_PER_IP),
+    ])
+    if retry_after:
+        raise too_many_requests(retry_after)
+    return await uDAO.send_otp(body.email)
 
 # === OTP 검증(JSON) ===
-@app.post("/users/verify-otp")
-def verify_otp_route(body: OtpIn = Body(...)):
-    return uDAO.verify_otp(body.email, body.code)
+@router.post("/users/verify-otp", response_model=ResultOut)
+async def verify_otp_route(
+    request: Request,
+    body: OtpIn = Body(...),
+    uDAO: UsersDAO = Depends(users_dao),
+    limiter: RateLimiter = Depends(rate_limiter),
+):
+    retry_after = await limiter.check([
+        (f"otp-verify:email:{body.email.strip().lower()}", config.OTP_VERIFY_LIMIT_PER_EMAIL),
+        (f"otp-verify:ip:{client_ip(request)}", config.OTP_VERIFY_LIMIT_PER_IP),
+    ])
+    if retry_after:
+        raise too_many_requests(retry_after)
+    return await uDAO.verify_otp(body.email, body.code)
 
 # === 회원가입(FormData + 파일) ===
-@app.post("/users/sign-up")
+@router.post("/users/sign-up", response_model=ResultOut)
 async def signup_route(
+    request: Request,
     username: str = Form(...),
     email: EmailStr = Form(...),
     phone_number: str = Form(""),
@@ -60,7 +270,16 @@ async def signup_route(
     si_gun_gu: str = Form(...),
     dong: str = Form(...),
     detail_address:str =Form(...),
+    uDAO: UsersDAO = Depends(users_dao),
+    limiter: RateLimiter = Depends(rate_limiter),
 ):
+    # DB 조회/bcrypt/파일 저장 전에 이메일별·IP별로 제한
+    retry_after = await limiter.check([
+        (f"signup:email:{email.strip().lower()}", config.SIGNUP_LIMIT_PER_EMAIL),
+        (f"signup:ip:{client_ip(request)}", config.SIGNUP_LIMIT_PER_IP),
+    ])
+    if retry_after:
+        raise too_many_requests(retry_after)
     return await uDAO.signUp(
         username=username,
         email=email,
@@ -71,34 +290,223 @@ async def signup_route(
     )
 
 # 로그인 엔드포인트
-@app.post("/users/login")
-def login_route(body: LoginIn = Body(...)):
-    return uDAO.login(body.email, body.password)
+@router.post("/users/login", response_model=LoginOut)
+async def login_route(body: LoginIn = Body(...), uDAO: UsersDAO = Depends(users_dao)):
+    return await uDAO.login(body.email, body.password)
+
+# === 프로필 이미지 (내용 주소 파일, 장기 캐시) ===
+@router.get("/psa/thumbs/{file_name}")
+async def profile_thumbnail_route(file_name: str):
+    response = SsyFileStore.response(file_name, thumb=True)
+    if response is None:
+        raise SsyApiError(404, "파일을 찾을 수 없습니다.")
+    return response
+
+@router.get("/psa/{file_name}")
+async def profile_image_route(file_name: str):
+    response = SsyFileStore.response(file_name)
+    if response is None:
+        raise SsyApiError(404, "파일을 찾을 수 없습니다.")
+    return response
+
+# 액세스 토큰 재발급
+@router.post("/users/refresh", response_model=TokenOut)
+async def refresh_route(body: RefreshIn = Body(...), uDAO: UsersDAO = Depends(users_dao)):
+    return await uDAO.refresh(body.refresh_token)
 
 # === 농작물 추천 엔드포인트 ===
-@app.get("/api/recommend-crop")
-def recommend_crop_route(location: str):
-    return get_recommendations(location)
+@router.get("/api/recommend-crop", response_model=RecommendOut)
+async def recommend_crop_route(
+    request: Request,
+    response: Response,
+    location: Optional[str] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    top_n: int = 5,
+    me: Optional[int] = Depends(optional_user_id),  # 지역/좌표가 없으면 로그인 사용자가 가입 시 저장한 주소로
+    uDAO: UsersDAO = Depends(users_dao),
+):
+    if lat is not None and lon is not None and not region_finder.covers(lat, lon):
+        # 색인 범위 밖 좌표는 가장 가까운 지역이 의미 없으므로 거부
+        raise SsyApiError(422, "지원하지 않는 지역의 좌표입니다.")
+    si_do = si_gun_gu = None
+    by_address = not location and (lat is None or lon is None) and me is not None
+    if by_address:
+        address = await uDAO.get_address(me) or {}
+        si_do, si_gun_gu = address.get("si_do"), address.get("si_gun_gu")
+    region = resolve_region(location, lat, lon, si_do, si_gun_gu)
+    result = await get_recommendations(region or location or "", top_n)
+    max_age = recommendation_max_age(result["region"]) if result.get("scores") else 0
+    # 주소로 찾은 결과는 그 사용자에 따른 것이라 공유 캐시(프록시)에는 두지 않음
+    return cached_json(request, response, result, max_age, "private" if by_address else "public")
+
+@router.get("/api/recommend-crop/all", response_model=RecommendAllOut, summary="전체 지역 작물 적합도 상위 N개")
+async def recommend_crop_all_route(request: Request, response: Response, top_n: int = 5):
+    result = await score_all_regions(top_n)
+    return cached_json(request, response, result, 0 if result["failed"] else recommendation_max_age())
 
 #  produceLogDAO 기능
-@app.get("/api/produce-logs", summary="특정 사용자의 모든 생산량 기록 조회")
-def get_produce_logs(user_id: int):
-    return pDAO.get_logs(user_id)
-
-@app.post("/api/produce-logs", summary="새 생산량 기록 추가")
-def add_produce_log(body: ProduceLogIn = Body(...)):
-    return pDAO.add_log(
-        user_id=body.userId,
-        crop_name=body.cropName,
-        quantity=body.quantity,
-        production_date=body.productionDate
-    )
+@router.get("/api/produce-logs", response_model=ProduceLogPage, summary="특정 사용자의 생산량 기록 조회")
+async def get_produce_logs(
+    request: Request,
+    user_id: Optional[int] = None,
+    limit: Optional[int] = None,      # 지정 시 keyset 페이지 단위 (응답의 next_cursor로 다음 페이지)
+    cursor: Optional[str] = None,
+    date_from: Optional[str] = None,  # "YYYY-MM-DD"
+    date_to: Optional[str] = None,
+    me: int = Depends(current_user_id),
+    pDAO: ProduceLogDAO = Depends(produce_log_dao),
+    versions: VersionStore = Depends(data_versions),
+):
+    uid = owned_user_id(user_id, me)
+    # 버전을 조회 전에 읽음 (조회 중에 쓰기가 끼어들어도 다음 요청의 ETag가 달라져 다시 받게 됨)
+    # 사용자 ID도 섞어서 버전 값이 우연히 같아도 다른 사용자의 ETag로는 304가 나지 않게
+    etag = make_etag(uid, await versions.get(logs_version_key(uid)), limit, cursor, date_from, date_to)
+    if not_modified(request, etag):
+        return not_modified_response(etag, LOGS_CACHE_CONTROL, LOGS_VARY)
+    logs = await pDAO.get_logs(uid, limit=limit, cursor=cursor, date_from=date_from, date_to=date_to)
+    # 행 수만큼 커지는 응답이라 모델 검증 없이 바로 orjson으로 (스키마 문서는 response_model 그대로)
+    return Response(orjson.dumps(logs), media_type="application/json",
+                    headers={"ETag": etag, "Cache-Control": LOGS_CACHE_CONTROL, "Vary": LOGS_VARY})
+
+@router.get("/api/produce-logs/stream", summary="생산량 기록 스트리밍 (NDJSON 또는 JSON 배열)")
+async def stream_produce_logs(
+    user_id: Optional[int] = None,
+    format: str = "ndjson",           # "ndjson" | "json"
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    me: int = Depends(current_user_id),
+    pDAO: ProduceLogDAO = Depends(produce_log_dao),
+):
+    return pDAO.stream_logs(owned_user_id(user_id, me), fmt=format, date_from=date_from, date_to=date_to)
+
+@router.post("/api/produce-logs", status_code=201, response_model=ResultOut, summary="새 생산량 기록 추가")
+async def add_produce_log(
+    body: ProduceLogIn = Body(...),
+    me: int = Depends(current_user_id),
+    pDAO: ProduceLogDAO = Depends(produce_log_dao),
+    versions: VersionStore = Depends(data_versions),
+):
+    uid = owned_user_id(body.userId, me)
+    try:
+        return await pDAO.add_log(
+            user_id=uid,
+            crop_name=body.cropName,
+            quantity=body.quantity,
+            production_date=body.productionDate
+        )
+    finally:
+        # 기록 목록 ETag 무효화 (실패해도 올림: 한 번 더 받는 것뿐이라 안전한 쪽으로)
+        await versions.bump(logs_version_key(uid))
+
+@router.post("/api/produce-logs/bulk", response_model=BulkInsertOut, summary="생산량 기록 대량 추가 (JSON 배열)")
+async def add_produce_logs_bulk(
+    rows: List[dict] = Body(...),
+    batch_size: Optional[int] = None,
+    me: int = Depends(current_user_id),
+    pDAO: ProduceLogDAO = Depends(produce_log_dao),
+    versions: VersionStore = Depends(data_versions),
+):
+    # 행 단위로 검증/거부하기 위해 모델 대신 dict 목록으로 받음 (필드는 ProduceLogIn과 동일)
+    try:
+        return await pDAO.add_logs_bulk(rows, batch_size, owner_id=me)
+    finally:
+        await versions.bump(logs_version_key(me))  # 중간 배치에서 실패해도 앞 배치는 이미 commit됨
+
+@router.post("/api/produce-logs/bulk-csv", response_model=BulkInsertOut, summary="생산량 기록 대량 추가 (CSV 업로드)")
+async def add_produce_logs_csv(
+    file: UploadFile = File(...),
+    batch_size: Optional[int] = None,
+    me: int = Depends(current_user_id),
+    pDAO: ProduceLogDAO = Depends(produce_log_dao),
+    versions: VersionStore = Depends(data_versions),
+):
+    try:
+        return await pDAO.add_logs_csv(file, batch_size, owner_id=me)
+    finally:
+        await versions.bump(logs_version_key(me))
+
+@router.delete("/api/produce-logs/{log_id}", response_model=ResultOut, summary="생산량 기록 삭제")
+async def delete_produce_log(
+    log_id: int,
+    me: int = Depends(current_user_id),
+    pDAO: ProduceLogDAO = Depends(produce_log_dao),
+    versions: VersionStore = Depends(data_versions),
+):
+    try:
+        return await pDAO.delete_log(log_id, owner_id=me)
+    finally:
+        await versions.bump(logs_version_key(me))
+
+#  생산량 집계 (rollup 기반)
+@router.get("/api/produce-stats/crops", response_model=CropTotalsOut, summary="작물별 생산량 합계")
+async def produce_stats_crops(
+    user_id: Optional[int] = None,
+    year: Optional[int] = None,
+    me: int = Depends(current_user_id),
+    pDAO: ProduceLogDAO = Depends(produce_log_dao),
+):
+    return await pDAO.get_totals_by_crop(owned_user_id(user_id, me), year)
+
+@router.get("/api/produce-stats/periods", response_model=PeriodTotalsOut, summary="주별/월별/연별 생산량 합계")
+async def produce_stats_periods(
+    user_id: Optional[int] = None,
+    period: str = "month",            # "week" | "month" | "year"
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    crop_name: Optional[str] = None,
+    me: int = Depends(current_user_id),
+    pDAO: ProduceLogDAO = Depends(produce_log_dao),
+):
+    return await pDAO.get_totals_by_period(owned_user_id(user_id, me), period, date_from, date_to, crop_name)
+
+@router.get("/api/produce-stats/regions", response_model=RegionTotalsOut, summary="지역(시/도)별 생산량 합계")
+async def produce_stats_regions(
+    year: Optional[int] = None,
+    crop_name: Optional[str] = None,
+    level: str = "si_do",             # "si_do" | "si_gun_gu"
+    me: int = Depends(current_user_id),  # 전체 사용자 합계라 로그인 사용자에게만
+    pDAO: ProduceLogDAO = Depends(produce_log_dao),
+):
+    return await pDAO.get_totals_by_region(year, crop_name, level)
+
+@router.get("/api/produce-stats/yoy", response_model=YearOverYearOut, summary="전년 동월 대비 생산량")
+async def produce_stats_yoy(year: int, user_id: Optional[int] = None, me: int = Depends(current_user_id), pDAO: ProduceLogDAO = Depends(produce_log_dao)):
+    return await pDAO.get_year_over_year(owned_user_id(user_id, me), year)
+
+@router.post("/api/produce-stats/rebuild", response_model=RebuildOut, summary="생산량 집계 재계산")
+async def produce_stats_rebuild(user_id: Optional[int] = None, me: int = Depends(current_user_id), pDAO: ProduceLogDAO = Depends(produce_log_dao)):
+    # 로그인 사용자 본인 집계만 재계산 (전체 재계산은 rebuild_rollups()를 운영 작업으로 직접 호출)
+    return await pDAO.rebuild_rollups(owned_user_id(user_id, me))
+
+# === Prometheus 지표 (스크레이퍼 설정에 X-Admin-Token 헤더) ===
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_admin_token)])
+async def metrics():
+    return PlainTextResponse(SsyMetrics.render(), media_type="text/plain; version=0.0.4")
+
+# === DB 세션 풀 지표 (풀 크기 조정용) ===
+@router.get("/api/db-pool-stats", response_model=DbPoolStatsOut, summary="Oracle 세션 풀 사용 현황",
+            dependencies=[Depends(require_admin_token)])
+async def db_pool_stats():
+    return SsyAsyncDBManager.stats()
+
+# === 테이블 구조 변경(배포/마이그레이션) 후 메타데이터 다시 읽기 ===
+@router.post("/api/metadata/refresh", response_model=MetadataRefreshOut, summary="스키마/테이블 메타데이터 캐시 갱신",
+             dependencies=[Depends(require_admin_token)])
+async def metadata_refresh(limiter: RateLimiter = Depends(rate_limiter)):
+    # 데이터 사전 조회 + 주소 전체 적재라 무거움: 관리자 토큰 + 전체 합산 요청 제한
+    retry_after = await limiter.check([("metadata-refresh", config.METADATA_REFRESH_LIMIT)])
+    if retry_after:
+        raise too_many_requests(retry_after)
+    SsyMetadata.invalidate()
+    await warm_metadata()
+    return {"schema": SsyMetadata.schema(), "ready": SsyMetadata.ready(), "locations": SsyLocationCache.size()}
 
-@app.delete("/api/produce-logs/{log_id}", summary="생산량 기록 삭제")
-def delete_produce_log(log_id: int):
-    return pDAO.delete_log(log_id)
 
+# uvicorn homeController:app 호환 (설정/자원은 기동 시 lifespan에서)
+app = create_app()
 
 if __name__ == "__main__":
-    uvicorn.run("homeController:app", host="0.0.0.0", port=1234, reload=True)
+    import uvicorn
+    uvicorn.run("homeController:create_app", factory=True, host="0.0.0.0", port=1234, reload=True)
 
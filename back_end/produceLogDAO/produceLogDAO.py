@@ -1,107 +1,580 @@
-from fastapi.responses import JSONResponse
-from SSY.ssyDBManager import SsyDBManager
+import base64
+import csv
+import io
+import logging
+from datetime import datetime
+
+import orjson
+from fastapi.responses import StreamingResponse
+from SSY.ssyApiError import SsyApiError
+from SSY.ssyAsyncDBManager import SsyAsyncDBManager
+from SSY.ssyMetadata import SsyMetadata
+from SSY.ssyLocationCache import SsyLocationCache
 from SSY import config
 
+# 집계 기간 종류 -> Oracle TRUNC 포맷
+PERIOD_FORMATS = {"W": "IW", "M": "MM", "Y": "YYYY"}
+PERIOD_NAMES = {"week": "W", "month": "M", "year": "Y"}
+DUP_KEY_ERROR = 1  # ORA-00001 (unique constraint violated)
+
+logger = logging.getLogger(__name__)
+
+
+def _is_dup_key(error: Exception) -> bool:
+    # oracledb.DatabaseError.args[0] 은 _Error (code = ORA 번호)
+    return bool(error.args) and getattr(error.args[0], "code", None) == DUP_KEY_ERROR
+
+
 class ProduceLogDAO:
     def __init__(self):
-        self.db = SsyDBManager()
+        self.db = SsyAsyncDBManager()
         self._schema = None
         self.T_PRODUCE_LOGS = "PRODUCE_LOGS"
+        self.T_ROLLUPS = "PRODUCE_LOG_ROLLUPS"
+        self.T_USERS = "USERS"
+        self.T_LOCATIONS = "LOCATIONS"
+
+    async def _ensure_schema_and_tables(self, cur):
+        await SsyMetadata.ensure(cur)
+        self._schema = SsyMetadata.schema()
+        self.T_PRODUCE_LOGS = SsyMetadata.table("PRODUCE_LOGS")
+        self.T_ROLLUPS = SsyMetadata.table("PRODUCE_LOG_ROLLUPS")
+        self.T_USERS = SsyMetadata.table("USERS")
+        self.T_LOCATIONS = SsyMetadata.table("LOCATIONS")
+
+    # === 집계(rollup) 증감: 기록 1건당 주/월/연 3개 버킷을 MERGE ===
+    # binds: P_USER_ID, P_CROP_NAME, P_PROD_DATE(date), P_DELTA_QTY, P_DELTA_CNT
+    def _rollup_merge_sql(self) -> str:
+        periods = " UNION ALL ".join(
+            f"SELECT '{t}' PERIOD_TYPE, '{fmt}' FMT FROM dual" for t, fmt in PERIOD_FORMATS.items()
+        )
+        return f"""
+            MERGE INTO {self.T_ROLLUPS} r
+            USING (
+                SELECT :P_USER_ID USER_ID, :P_CROP_NAME CROP_NAME, p.PERIOD_TYPE,
+                       TRUNC(:P_PROD_DATE, p.FMT) PERIOD_START
+                  FROM ({periods}) p
+            ) s
+            ON (r.USER_ID = s.USER_ID AND r.CROP_NAME = s.CROP_NAME
+                AND r.PERIOD_TYPE = s.PERIOD_TYPE AND r.PERIOD_START = s.PERIOD_START)
+            WHEN MATCHED THEN UPDATE
+                SET r.TOTAL_QUANTITY = r.TOTAL_QUANTITY + :P_DELTA_QTY,
+                    r.LOG_COUNT = r.LOG_COUNT + :P_DELTA_CNT
+            WHEN NOT MATCHED THEN INSERT (USER_ID, CROP_NAME, PERIOD_TYPE, PERIOD_START, TOTAL_QUANTITY, LOG_COUNT)
+                VALUES (s.USER_ID, s.CROP_NAME, s.PERIOD_TYPE, s.PERIOD_START, :P_DELTA_QTY, :P_DELTA_CNT)
+        """
 
-    def _makeConCur(self):
-        return SsyDBManager.makeConCur()
-
-    def _closeConCur(self, con, cur):
-        SsyDBManager.closeConCur(con, cur)
-    
-    def _ensure_schema_and_tables(self, cur):
-        if self._schema is None:
-            cfg_schema = getattr(config, "DB_SCHEMA", None)
-            if cfg_schema:
-                self._schema = cfg_schema.upper()
-            else:
-                cur.execute("SELECT SYS_CONTEXT('USERENV','CURRENT_SCHEMA') FROM dual")
-                self._schema = (cur.fetchone()[0] or "").upper()
-
-            if self._schema:
-                self.T_PRODUCE_LOGS = f"{self._schema}.PRODUCE_LOGS"
-
-    # === 모든 기록 조회 ===
-    def get_logs(self, user_id: int):
-        h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
+    async def _apply_rollups(self, cur, deltas: list):
+        # 같은 버킷의 첫 기록이 동시에 들어오면 두 MERGE가 모두 NOT MATCHED로 INSERT를 시도해
+        # 나중 쪽이 ORA-00001로 실패합니다. 실패한 문장(행)만 취소되므로(문장 단위 롤백)
+        # 먼저 들어간 행이 commit된 뒤인 그 시점에 한 번 더 MERGE하면 MATCHED(UPDATE)로 반영됩니다.
+        sql = self._rollup_merge_sql()
+        if len(deltas) == 1:
+            try:
+                await cur.execute(sql, deltas[0])
+            except Exception as e:
+                if not _is_dup_key(e):
+                    raise
+                await cur.execute(sql, deltas[0])
+        elif deltas:
+            # 배열 DML은 행마다 따로 성공/실패하므로 ORA-00001 난 행만 다시
+            await cur.executemany(sql, deltas, batcherrors=True)
+            errors = cur.getbatcherrors()
+            if any(err.code != DUP_KEY_ERROR for err in errors):
+                raise RuntimeError(f"rollup merge failed: {errors[0].message}")
+            if errors:
+                await cur.executemany(sql, [deltas[err.offset] for err in errors])
+
+    # === 조회 조건 (사용자 + 기간 + keyset 커서) ===
+    @staticmethod
+    def encode_cursor(prod_date: str, log_id: int) -> str:
+        return base64.urlsafe_b64encode(f"{prod_date}|{log_id}".encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prod_date, log_id = raw.split("|")
+        datetime.strptime(prod_date, "%Y-%m-%d")  # 형식 검증
+        return prod_date, int(log_id)
+
+    def _log_filters(self, user_id: int, date_from: str = None, date_to: str = None, cursor: str = None):
+        """잘못된 날짜/커서, 또는 date_from > date_to 이면 ValueError"""
+        where = ["USER_ID = :P_USER_ID"]
+        binds = {"P_USER_ID": user_id}
+        parsed_from = datetime.strptime(date_from, "%Y-%m-%d") if date_from else None
+        parsed_to = datetime.strptime(date_to, "%Y-%m-%d") if date_to else None
+        if parsed_from and parsed_to and parsed_from > parsed_to:
+            raise ValueError("date_from is after date_to")
+        if date_from:
+            where.append("PRODUCTION_DATE >= TO_DATE(:P_FROM, 'YYYY-MM-DD')")
+            binds["P_FROM"] = date_from
+        if date_to:
+            where.append("PRODUCTION_DATE <= TO_DATE(:P_TO, 'YYYY-MM-DD')")
+            binds["P_TO"] = date_to
+        if cursor:
+            # (PRODUCTION_DATE, ID) 내림차순에서 커서 다음 행부터
+            c_date, c_id = self.decode_cursor(cursor)
+            where.append(
+                "(PRODUCTION_DATE < TO_DATE(:P_C_DATE, 'YYYY-MM-DD')"
+                " OR (PRODUCTION_DATE = TO_DATE(:P_C_DATE, 'YYYY-MM-DD') AND ID < :P_C_ID))"
+            )
+            binds["P_C_DATE"] = c_date
+            binds["P_C_ID"] = c_id
+        return " AND ".join(where), binds
+
+    def _select_logs_sql(self, where: str, limit: int = None) -> str:
+        sql = f"""
+            SELECT ID, CROP_NAME, PRODUCE_QUANTITY, TO_CHAR(PRODUCTION_DATE, 'YYYY-MM-DD') AS PROD_DATE
+            FROM {self.T_PRODUCE_LOGS}
+            WHERE {where}
+            ORDER BY PRODUCTION_DATE DESC, ID DESC
+        """
+        if limit:
+            sql += " FETCH FIRST :P_LIMIT ROWS ONLY"
+        return sql
+
+    # === 기록 조회 (limit 지정 시 keyset 페이지 단위) ===
+    async def get_logs(self, user_id: int, limit: int = None, cursor: str = None,
+                       date_from: str = None, date_to: str = None):
         try:
-            con, cur = self._makeConCur()
-            self._ensure_schema_and_tables(cur)
-
-            sql = f"""
-                SELECT ID, CROP_NAME, PRODUCE_QUANTITY, TO_CHAR(PRODUCTION_DATE, 'YYYY-MM-DD') AS PROD_DATE
-                FROM {self.T_PRODUCE_LOGS}
-                WHERE USER_ID = :P_USER_ID
-                ORDER BY PRODUCTION_DATE DESC
-            """
-            cur.execute(sql, {"P_USER_ID": user_id})
-            
-            # 컬럼 이름을 키로 하는 딕셔너리 리스트로 변환
-            columns = [desc[0].lower() for desc in cur.description]
-            logs = [dict(zip(columns, row)) for row in cur.fetchall()]
-            
-            return JSONResponse({"logs": logs}, headers=h)
+            where, binds = self._log_filters(user_id, date_from, date_to, cursor)
+        except ValueError:
+            raise SsyApiError(422, "잘못된 조회 조건입니다.")
+
+        try:
+            async with SsyAsyncDBManager.acquire() as (con, cur):
+                await self._ensure_schema_and_tables(cur)
+
+                if limit:
+                    limit = max(1, min(limit, config.PRODUCE_LOG_MAX_LIMIT))
+                    binds["P_LIMIT"] = limit + 1  # 한 행 더 읽어 다음 페이지 유무 확인
+                await cur.execute(self._select_logs_sql(where, limit), binds)
+
+                # 컬럼 이름을 키로 하는 딕셔너리 리스트로 변환
+                columns = [desc[0].lower() for desc in cur.description]
+                logs = [dict(zip(columns, row)) for row in await cur.fetchall()]
+
+            next_cursor = None
+            if limit and len(logs) > limit:
+                logs = logs[:limit]
+                last = logs[-1]
+                next_cursor = self.encode_cursor(last["prod_date"], last["id"])
+
+            return {"logs": logs, "next_cursor": next_cursor}
+
+        except Exception:
+            logger.exception("get_logs failed (user_id=%s)", user_id)
+            raise SsyApiError(500, "기록 조회 실패")
+
+    # === 기록 스트리밍 (arraysize 단위로 읽어 바로 내보냄: 이력 크기와 무관하게 메모리 일정) ===
+    def stream_logs(self, user_id: int, fmt: str = "ndjson", date_from: str = None, date_to: str = None):
+        try:
+            where, binds = self._log_filters(user_id, date_from, date_to)
+        except ValueError:
+            raise SsyApiError(422, "잘못된 조회 조건입니다.")
 
-        except Exception as e:
-            print("get_logs error:", e)
-            return JSONResponse({"result": "기록 조회 실패"}, status_code=500, headers=h)
-        finally:
-            self._closeConCur(con, cur)
+        ndjson = fmt != "json"
+
+        async def chunks():
+            first = True
+            if not ndjson:
+                yield b"["
+            try:
+                async with SsyAsyncDBManager.acquire() as (con, cur):
+                    await self._ensure_schema_and_tables(cur)
+                    cur.arraysize = config.DB_STREAM_ARRAYSIZE
+                    await cur.execute(self._select_logs_sql(where), binds)
+                    columns = [desc[0].lower() for desc in cur.description]
+
+                    while True:
+                        rows = await cur.fetchmany()
+                        if not rows:
+                            break
+                        encoded = [orjson.dumps(dict(zip(columns, row))) for row in rows]
+                        if ndjson:
+                            yield b"\n".join(encoded) + b"\n"
+                        else:
+                            yield (b"" if first else b",") + b",".join(encoded)
+                        first = False
+            except Exception:
+                # 이미 200 헤더가 나간 뒤라 상태 코드는 바꿀 수 없음. 닫는 "]"를 보내면 잘린 목록이 정상처럼 보이므로
+                # 예외를 다시 올려 서버가 연결을 끊게 함 (클라이언트는 불완전한 응답으로 인식)
+                logger.exception("stream_logs failed mid-stream (user_id=%s)", user_id)
+                raise
+            if not ndjson:
+                yield b"]"
+
+        media_type = "application/x-ndjson" if ndjson else "application/json"
+        return StreamingResponse(chunks(), media_type=media_type)
 
     # === 새 기록 추가 ===
-    def add_log(self, user_id: int, crop_name: str, quantity: float, production_date: str):
-        h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
+    async def add_log(self, user_id: int, crop_name: str, quantity: float, production_date: str):
         try:
-            con, cur = self._makeConCur()
-            self._ensure_schema_and_tables(cur)
-
-            sql = f"""
-                INSERT INTO {self.T_PRODUCE_LOGS} (USER_ID, CROP_NAME, PRODUCE_QUANTITY, PRODUCTION_DATE)
-                VALUES (:P_USER_ID, :P_CROP_NAME, :P_QUANTITY, TO_DATE(:P_PROD_DATE, 'YYYY-MM-DD'))
-            """
-            cur.execute(sql, {
-                "P_USER_ID": user_id,
-                "P_CROP_NAME": crop_name,
-                "P_QUANTITY": quantity,
-                "P_PROD_DATE": production_date
-            })
-            con.commit()
-            return JSONResponse({"result": "기록이 성공적으로 추가되었습니다."}, status_code=201, headers=h)
+            async with SsyAsyncDBManager.acquire() as (con, cur):
+                await self._ensure_schema_and_tables(cur)
+
+                sql = f"""
+                    INSERT INTO {self.T_PRODUCE_LOGS} (USER_ID, CROP_NAME, PRODUCE_QUANTITY, PRODUCTION_DATE)
+                    VALUES (:P_USER_ID, :P_CROP_NAME, :P_QUANTITY, TO_DATE(:P_PROD_DATE, 'YYYY-MM-DD'))
+                """
+                await cur.execute(sql, {
+                    "P_USER_ID": user_id,
+                    "P_CROP_NAME": crop_name,
+                    "P_QUANTITY": quantity,
+                    "P_PROD_DATE": production_date
+                })
+                await self._apply_rollups(cur, [{
+                    "P_USER_ID": user_id,
+                    "P_CROP_NAME": crop_name,
+                    "P_PROD_DATE": datetime.strptime(production_date, "%Y-%m-%d"),
+                    "P_DELTA_QTY": quantity,
+                    "P_DELTA_CNT": 1,
+                }])
+                await con.commit()
+                return {"result": "기록이 성공적으로 추가되었습니다."}
+
+        except Exception:
+            # rollback은 SsyAsyncDBManager.acquire()가 처리합니다
+            logger.exception("add_log failed")
+            raise SsyApiError(500, "기록 추가 실패")
+
+    # === 대량 기록 추가 (JSON 배열 / CSV 공통) ===
+    @staticmethod
+    def _parse_bulk_row(raw: dict, owner_id: int = None) -> dict:
+        # owner_id(로그인 사용자)가 주어지면 userId는 생략 가능하고, 다른 사용자 행은 거부
+        user_id = int(raw.get("userId") or owner_id) if owner_id is not None else int(raw["userId"])
+        if owner_id is not None and user_id != owner_id:
+            raise ValueError("userId does not match the logged-in user")
+        crop_name = str(raw["cropName"]).strip()
+        quantity = float(raw["quantity"])
+        production_date = str(raw["productionDate"]).strip()
+        datetime.strptime(production_date, "%Y-%m-%d")  # 형식 검증
+        if not crop_name:
+            raise ValueError("cropName is empty")
+        return {
+            "P_USER_ID": user_id,
+            "P_CROP_NAME": crop_name,
+            "P_QUANTITY": quantity,
+            "P_PROD_DATE": production_date,
+        }
 
-        except Exception as e:
-            if con: con.rollback()
-            print("add_log error:", e)
-            return JSONResponse({"result": "기록 추가 실패"}, status_code=500, headers=h)
-        finally:
-            self._closeConCur(con, cur)
+    async def add_logs_bulk(self, rows: list, batch_size: int = None, owner_id: int = None):
+        """
+        rows: [{'userId':.., 'cropName':.., 'quantity':.., 'productionDate': 'YYYY-MM-DD'}, ...]
+        owner_id: 로그인 사용자. 지정하면 그 사용자의 행만 받습니다.
+        batch_size행씩 executemany(batcherrors) 한 번 + commit 한 번.
+        잘못된 행은 그 행만 거부하고 나머지는 넣습니다. 거부 행은 입력 순번(index)과 사유를 돌려줍니다.
+        """
+        if len(rows) > config.PRODUCE_LOG_BULK_MAX_ROWS:
+            raise SsyApiError(413, f"한 번에 최대 {config.PRODUCE_LOG_BULK_MAX_ROWS}행까지 등록할 수 있습니다.")
+        batch_size = max(1, min(batch_size or config.PRODUCE_LOG_BULK_BATCH_SIZE, config.PRODUCE_LOG_BULK_MAX_ROWS))
+
+        # 1) 형식 검사 (DB에 가기 전에 걸러냄)
+        valid, valid_index, rejected = [], [], []
+        for i, raw in enumerate(rows):
+            try:
+                valid.append(self._parse_bulk_row(raw, owner_id))
+                valid_index.append(i)
+            except (KeyError, TypeError, ValueError) as e:
+                rejected.append({"index": i, "error": f"invalid row: {e}"})
+
+        # 2) 배치 단위 적재
+        inserted = 0
+        try:
+            async with SsyAsyncDBManager.acquire() as (con, cur):
+                await self._ensure_schema_and_tables(cur)
+                sql = f"""
+                    INSERT INTO {self.T_PRODUCE_LOGS} (USER_ID, CROP_NAME, PRODUCE_QUANTITY, PRODUCTION_DATE)
+                    VALUES (:P_USER_ID, :P_CROP_NAME, :P_QUANTITY, TO_DATE(:P_PROD_DATE, 'YYYY-MM-DD'))
+                """
+                for start in range(0, len(valid), batch_size):
+                    batch = valid[start:start + batch_size]
+                    try:
+                        await cur.executemany(sql, batch, batcherrors=True)
+                        errors = cur.getbatcherrors()
+                        # 들어간 행만 집계에 반영 (같은 트랜잭션)
+                        failed = {err.offset for err in errors}
+                        await self._apply_rollups(cur, [{
+                            "P_USER_ID": row["P_USER_ID"],
+                            "P_CROP_NAME": row["P_CROP_NAME"],
+                            "P_PROD_DATE": datetime.strptime(row["P_PROD_DATE"], "%Y-%m-%d"),
+                            "P_DELTA_QTY": row["P_QUANTITY"],
+                            "P_DELTA_CNT": 1,
+                        } for j, row in enumerate(batch) if j not in failed])
+                        await con.commit()
+                    except Exception as e:
+                        # 배치 전체 실패 (연결 오류 등): 이 배치만 거부 처리하고 다음 배치 진행
+                        await con.rollback()
+                        logger.exception("add_logs_bulk batch failed (rows %d-%d)", start, start + len(batch) - 1)
+                        rejected.extend({"index": valid_index[start + j], "error": str(e)} for j in range(len(batch)))
+                        continue
+                    for err in errors:
+                        rejected.append({"index": valid_index[start + err.offset], "error": err.message})
+                    inserted += len(batch) - len(errors)
+        except Exception:
+            logger.exception("add_logs_bulk failed (inserted=%d)", inserted)
+            raise SsyApiError(500, "대량 기록 추가 실패", inserted=inserted)
+
+        rejected.sort(key=lambda r: r["index"])
+        return {
+            "result": f"{inserted}건 추가, {len(rejected)}건 거부",
+            "inserted": inserted,
+            "rejected": rejected,
+        }
+
+    # === CSV 대량 추가 (헤더: userId,cropName,quantity,productionDate) ===
+    async def add_logs_csv(self, upload, batch_size: int = None, owner_id: int = None):
+        """
+        upload: UploadFile. 청크 단위로 읽으면서 PRODUCE_LOG_CSV_MAX_BYTES를 넘으면 바로 413,
+        행도 PRODUCE_LOG_BULK_MAX_ROWS를 넘는 순간 파싱을 멈추고 413 (파일 전체를 dict 목록으로 만들지 않음)
+        """
+        max_bytes = config.PRODUCE_LOG_CSV_MAX_BYTES
+        buf = bytearray()
+        while True:
+            chunk = await upload.read(config.UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            if len(buf) + len(chunk) > max_bytes:
+                raise SsyApiError(413, f"CSV 파일은 최대 {max_bytes // (1024 * 1024)}MB까지 올릴 수 있습니다.")
+            buf += chunk
+
+        max_rows = config.PRODUCE_LOG_BULK_MAX_ROWS
+        rows = []
+        try:
+            for row in csv.DictReader(io.StringIO(buf.decode("utf-8-sig"))):
+                if len(rows) == max_rows:
+                    raise SsyApiError(413, f"한 번에 최대 {max_rows}행까지 등록할 수 있습니다.")
+                rows.append(row)
+        except (UnicodeDecodeError, csv.Error) as e:
+            logger.warning("add_logs_csv: unreadable CSV: %s", e)
+            raise SsyApiError(400, "CSV 파일을 읽을 수 없습니다.")
+        del buf
+        return await self.add_logs_bulk(rows, batch_size, owner_id)
 
     # === 기록 삭제 ===
-    def delete_log(self, log_id: int):
-        h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
+    async def delete_log(self, log_id: int, owner_id: int = None):
+        try:
+            async with SsyAsyncDBManager.acquire() as (con, cur):
+                await self._ensure_schema_and_tables(cur)
+
+                out_user = cur.var(int)
+                out_crop = cur.var(str)
+                out_qty = cur.var(float)
+                out_date = cur.var(datetime)
+                # owner_id가 있으면 본인 기록만 (남의 기록은 "찾을 수 없음"과 같게 처리)
+                owner_cond = "AND USER_ID = :P_OWNER_ID" if owner_id is not None else ""
+                binds = {"P_OWNER_ID": owner_id} if owner_id is not None else {}
+                sql = f"""
+                    DELETE FROM {self.T_PRODUCE_LOGS} WHERE ID = :P_LOG_ID {owner_cond}
+                    RETURNING USER_ID, CROP_NAME, PRODUCE_QUANTITY, PRODUCTION_DATE
+                         INTO :O_USER, :O_CROP, :O_QTY, :O_DATE
+                """
+                await cur.execute(sql, {
+                    "P_LOG_ID": log_id,
+                    "O_USER": out_user, "O_CROP": out_crop, "O_QTY": out_qty, "O_DATE": out_date,
+                    **binds,
+                })
+
+                if cur.rowcount == 0:
+                    raise SsyApiError(404, "삭제할 기록을 찾을 수 없습니다.")
+
+                # 지운 기록만큼 집계 차감 후, 비게 된 버킷 정리
+                user_id, crop_name = out_user.getvalue()[0], out_crop.getvalue()[0]
+                await self._apply_rollups(cur, [{
+                    "P_USER_ID": user_id,
+                    "P_CROP_NAME": crop_name,
+                    "P_PROD_DATE": out_date.getvalue()[0],
+                    "P_DELTA_QTY": -(out_qty.getvalue()[0] or 0),
+                    "P_DELTA_CNT": -1,
+                }])
+                await cur.execute(
+                    f"""
+                    DELETE FROM {self.T_ROLLUPS}
+                     WHERE USER_ID = :P_USER_ID AND CROP_NAME = :P_CROP_NAME AND LOG_COUNT <= 0
+                    """,
+                    {"P_USER_ID": user_id, "P_CROP_NAME": crop_name},
+                )
+                await con.commit()
+                return {"result": "기록이 삭제되었습니다."}
+
+        except SsyApiError:
+            raise
+        except Exception:
+            logger.exception("delete_log failed")
+            raise SsyApiError(500, "기록 삭제 실패")
+
+
+    # =====================================================================
+    # 생산량 집계 조회: 원본 기록 대신 rollup 버킷(O(버킷 수))만 읽습니다.
+    # =====================================================================
+    async def _query_dicts(self, build_sql, binds: dict):
+        # build_sql()은 스키마 확정 후에 불러야 테이블 이름이 완전수식됨
+        async with SsyAsyncDBManager.acquire() as (con, cur):
+            await self._ensure_schema_and_tables(cur)
+            await cur.execute(build_sql(), binds)
+            columns = [desc[0].lower() for desc in cur.description]
+            return [dict(zip(columns, row)) for row in await cur.fetchall()]
+
+    # === 작물별 합계 (연도 지정 가능) ===
+    async def get_totals_by_crop(self, user_id: int, year: int = None):
+        binds = {"P_USER_ID": user_id}
+        year_cond = ""
+        if year:
+            year_cond = "AND PERIOD_START = TO_DATE(:P_YEAR || '-01-01', 'YYYY-MM-DD')"
+            binds["P_YEAR"] = str(year)
+        try:
+            totals = await self._query_dicts(lambda: f"""
+                SELECT CROP_NAME, SUM(TOTAL_QUANTITY) AS TOTAL_QUANTITY, SUM(LOG_COUNT) AS LOG_COUNT
+                  FROM {self.T_ROLLUPS}
+                 WHERE USER_ID = :P_USER_ID AND PERIOD_TYPE = 'Y' {year_cond}
+                 GROUP BY CROP_NAME
+                 ORDER BY TOTAL_QUANTITY DESC
+            """, binds)
+            return {"totals": totals}
+        except Exception:
+            logger.exception("get_totals_by_crop failed")
+            raise SsyApiError(500, "집계 조회 실패")
+
+    # === 주별/월별 합계 ===
+    async def get_totals_by_period(self, user_id: int, period: str = "month", date_from: str = None,
+                                   date_to: str = None, crop_name: str = None):
+        period_type = PERIOD_NAMES.get(period)
+        if period_type is None:
+            raise SsyApiError(400, "period는 week, month, year 중 하나여야 합니다.")
+
+        where = ["USER_ID = :P_USER_ID", "PERIOD_TYPE = :P_TYPE"]
+        binds = {"P_USER_ID": user_id, "P_TYPE": period_type}
+        if date_from:
+            where.append(f"PERIOD_START >= TRUNC(TO_DATE(:P_FROM, 'YYYY-MM-DD'), '{PERIOD_FORMATS[period_type]}')")
+            binds["P_FROM"] = date_from
+        if date_to:
+            where.append("PERIOD_START <= TO_DATE(:P_TO, 'YYYY-MM-DD')")
+            binds["P_TO"] = date_to
+        if crop_name:
+            where.append("CROP_NAME = :P_CROP_NAME")
+            binds["P_CROP_NAME"] = crop_name
+        try:
+            totals = await self._query_dicts(lambda: f"""
+                SELECT TO_CHAR(PERIOD_START, 'YYYY-MM-DD') AS PERIOD_START, CROP_NAME, TOTAL_QUANTITY, LOG_COUNT
+                  FROM {self.T_ROLLUPS}
+                 WHERE {" AND ".join(where)}
+                 ORDER BY PERIOD_START, CROP_NAME
+            """, binds)
+            return {"period": period, "totals": totals}
+        except Exception:
+            logger.exception("get_totals_by_period failed")
+            raise SsyApiError(500, "집계 조회 실패")
+
+    # === 지역(시/도)별 합계 ===
+    async def get_totals_by_region(self, year: int = None, crop_name: str = None, level: str = "si_do"):
+        """
+        level: "si_do" | "si_gun_gu"
+        DB에서는 주소 ID(USERS.LOCATION_ID)별로만 묶고, 주소 이름은 SsyLocationCache로 붙여 지역 단위로 합칩니다.
+        """
+        if level not in ("si_do", "si_gun_gu"):
+            raise SsyApiError(400, "level은 si_do, si_gun_gu 중 하나여야 합니다.")
+        where = ["r.PERIOD_TYPE = 'Y'"]
+        binds = {}
+        if year:
+            where.append("r.PERIOD_START = TO_DATE(:P_YEAR || '-01-01', 'YYYY-MM-DD')")
+            binds["P_YEAR"] = str(year)
+        if crop_name:
+            where.append("r.CROP_NAME = :P_CROP_NAME")
+            binds["P_CROP_NAME"] = crop_name
+        try:
+            async with SsyAsyncDBManager.acquire() as (con, cur):
+                await self._ensure_schema_and_tables(cur)
+                await cur.execute(f"""
+                    SELECT u.LOCATION_ID, r.CROP_NAME, SUM(r.TOTAL_QUANTITY), SUM(r.LOG_COUNT)
+                      FROM {self.T_ROLLUPS} r
+                      JOIN {self.T_USERS} u ON u.{SsyMetadata.pk("USERS")} = r.USER_ID
+                     WHERE {" AND ".join(where)}
+                     GROUP BY u.LOCATION_ID, r.CROP_NAME
+                """, binds)
+                rows = await cur.fetchall()
+                if any(loc is not None and SsyLocationCache.address(loc) is None for loc, _, _, _ in rows):
+                    await SsyLocationCache.refresh(cur)
+
+            grouped = {}
+            for loc, crop, qty, cnt in rows:
+                address = SsyLocationCache.address(loc) or {}
+                region = address.get("si_do")
+                if level == "si_gun_gu" and region:
+                    region = f"{region} {address.get('si_gun_gu') or ''}".strip()
+                bucket = grouped.setdefault((region, crop), [0, 0])
+                bucket[0] += qty or 0
+                bucket[1] += cnt or 0
+
+            totals = [
+                {"region": region, "crop_name": crop, "total_quantity": qty, "log_count": cnt}
+                for (region, crop), (qty, cnt) in grouped.items()
+            ]
+            # 기존 정렬과 같게: 지역 이름순(NULL은 마지막), 지역 안에서는 합계 내림차순
+            totals.sort(key=lambda t: (t["region"] is None, t["region"] or "", -t["total_quantity"]))
+            return {"totals": totals}
+        except Exception:
+            logger.exception("get_totals_by_region failed")
+            raise SsyApiError(500, "집계 조회 실패")
+
+    # === 전년 동월 대비 (year년 vs year-1년, 작물별 월 합계) ===
+    async def get_year_over_year(self, user_id: int, year: int):
+        try:
+            rows = await self._query_dicts(lambda: f"""
+                SELECT EXTRACT(YEAR FROM PERIOD_START) AS YR, EXTRACT(MONTH FROM PERIOD_START) AS MON,
+                       CROP_NAME, TOTAL_QUANTITY
+                  FROM {self.T_ROLLUPS}
+                 WHERE USER_ID = :P_USER_ID AND PERIOD_TYPE = 'M'
+                   AND PERIOD_START >= TO_DATE(:P_PREV || '-01-01', 'YYYY-MM-DD')
+                   AND PERIOD_START < TO_DATE(:P_NEXT || '-01-01', 'YYYY-MM-DD')
+            """, {"P_USER_ID": user_id, "P_PREV": str(year - 1), "P_NEXT": str(year + 1)})
+        except Exception:
+            logger.exception("get_year_over_year failed")
+            raise SsyApiError(500, "집계 조회 실패")
+
+        # (작물, 월) -> [작년, 올해]
+        table = {}
+        for r in rows:
+            slot = table.setdefault((r["crop_name"], int(r["mon"])), [0, 0])
+            slot[1 if int(r["yr"]) == year else 0] += r["total_quantity"] or 0
+
+        comparisons = []
+        for (crop, month), (last_year, this_year) in sorted(table.items()):
+            comparisons.append({
+                "crop_name": crop,
+                "month": month,
+                "this_year": this_year,
+                "last_year": last_year,
+                "change_pct": round((this_year - last_year) / last_year * 100, 2) if last_year else None,
+            })
+        return {"year": year, "comparisons": comparisons}
+
+    # === 집계 재계산 (원본 기록에서 처음부터) ===
+    async def rebuild_rollups(self, user_id: int = None):
+        user_cond = "WHERE USER_ID = :P_USER_ID" if user_id is not None else ""
+        log_cond = "WHERE l.USER_ID = :P_USER_ID" if user_id is not None else ""
+        binds = {"P_USER_ID": user_id} if user_id is not None else {}
+        periods = " UNION ALL ".join(
+            f"SELECT '{t}' PERIOD_TYPE, '{fmt}' FMT FROM dual" for t, fmt in PERIOD_FORMATS.items()
+        )
         try:
-            con, cur = self._makeConCur()
-            self._ensure_schema_and_tables(cur)
-
-            sql = f"DELETE FROM {self.T_PRODUCE_LOGS} WHERE ID = :P_LOG_ID"
-            cur.execute(sql, {"P_LOG_ID": log_id})
-
-            if cur.rowcount == 0:
-                return JSONResponse({"result": "삭제할 기록을 찾을 수 없습니다."}, status_code=404, headers=h)
-            
-            con.commit()
-            return JSONResponse({"result": "기록이 삭제되었습니다."}, headers=h)
-
-        except Exception as e:
-            if con: con.rollback()
-            print("delete_log error:", e)
-            return JSONResponse({"result": "기록 삭제 실패"}, status_code=500, headers=h)
-        finally:
-            self._closeConCur(con, cur)
\ No newline at end of file
+            async with SsyAsyncDBManager.acquire() as (con, cur):
+                await self._ensure_schema_and_tables(cur)
+                await cur.execute(f"DELETE FROM {self.T_ROLLUPS} {user_cond}", binds)
+                await cur.execute(
+                    f"""
+                    INSERT INTO {self.T_ROLLUPS} (USER_ID, CROP_NAME, PERIOD_TYPE, PERIOD_START, TOTAL_QUANTITY, LOG_COUNT)
+                    SELECT l.USER_ID, l.CROP_NAME, p.PERIOD_TYPE, TRUNC(l.PRODUCTION_DATE, p.FMT),
+                           SUM(l.PRODUCE_QUANTITY), COUNT(*)
+                      FROM {self.T_PRODUCE_LOGS} l
+                     CROSS JOIN ({periods}) p
+                     {log_cond}
+                     GROUP BY l.USER_ID, l.CROP_NAME, p.PERIOD_TYPE, TRUNC(l.PRODUCTION_DATE, p.FMT)
+                    """,
+                    binds,
+                )
+                buckets = cur.rowcount
+                await con.commit()
+            return {"result": "집계를 다시 계산했습니다.", "buckets": buckets}
+        except Exception:
+            logger.exception("rebuild_rollups failed")
+            raise SsyApiError(500, "집계 재계산 실패")
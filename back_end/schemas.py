@@ -0,0 +1,105 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+# ===== 응답 모델 =====
+# DAO는 평범한 dict/list를 돌려주고, 라우트의 response_model이 모양을 검증/문서화합니다.
+# 실패 응답은 SsyApiError 처리기가 {"result": 메시지} 로 통일합니다.
+
+class ResultOut(BaseModel):
+    result: str
+
+class TokenOut(ResultOut):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+class LoginOut(TokenOut):
+    user_id: int
+    email: str
+
+# --- 생산 기록 ---
+class ProduceLogOut(BaseModel):
+    id: int
+    crop_name: str
+    produce_quantity: float
+    prod_date: str  # "YYYY-MM-DD"
+
+class ProduceLogPage(BaseModel):
+    logs: List[ProduceLogOut]
+    next_cursor: Optional[str] = None
+
+class BulkRejectedRow(BaseModel):
+    index: int
+    error: str
+
+class BulkInsertOut(ResultOut):
+    inserted: int
+    rejected: List[BulkRejectedRow]
+
+# --- 생산량 집계 ---
+class CropTotal(BaseModel):
+    crop_name: str
+    total_quantity: float
+    log_count: int
+
+class CropTotalsOut(BaseModel):
+    totals: List[CropTotal]
+
+class PeriodTotal(CropTotal):
+    period_start: str  # "YYYY-MM-DD"
+
+class PeriodTotalsOut(BaseModel):
+    period: str
+    totals: List[PeriodTotal]
+
+class RegionTotal(CropTotal):
+    region: Optional[str] = None
+
+class RegionTotalsOut(BaseModel):
+    totals: List[RegionTotal]
+
+class YearOverYearRow(BaseModel):
+    crop_name: str
+    month: int
+    this_year: float
+    last_year: float
+    change_pct: Optional[float] = None
+
+class YearOverYearOut(BaseModel):
+    year: int
+    comparisons: List[YearOverYearRow]
+
+class RebuildOut(ResultOut):
+    buckets: int
+
+# --- 작물 추천 ---
+class CropScoreOut(BaseModel):
+    crop: str
+    score: float
+
+class RecommendOut(BaseModel):
+    region: Optional[str] = None
+    recommendations: List[str]
+    scores: List[CropScoreOut] = []
+
+class RecommendAllOut(BaseModel):
+    regions: Dict[str, List[CropScoreOut]]
+    failed: List[str]
+
+# --- 운영 ---
+class DbPoolStatsOut(BaseModel):
+    min: int
+    max: int
+    increment: int
+    open: int
+    busy: int
+    acquires: int
+    wait_avg_ms: float
+    wait_max_ms: float
+
+class MetadataRefreshOut(BaseModel):
+    schema_: Optional[str] = Field(None, alias="schema")
+    ready: bool
+    locations: int
@@ -0,0 +1,3 @@
+-- OTP 검증 시도 횟수 (OTP_MAX_ATTEMPTS 초과 시 잠금)
+-- TOKEN에는 이제 OTP 원문 대신 HMAC 해시(43자)가 저장됩니다.
+ALTER TABLE EMAIL_TOKENS ADD (ATTEMPTS NUMBER DEFAULT 0 NOT NULL);
@@ -0,0 +1,38 @@
+-- LOCATIONS를 주소 차원 테이블로: 같은 주소는 한 행만 두고 USERS가 함께 참조합니다.
+-- 예전 signUp은 가입 요청마다(미인증/중복 가입 포함) 새 행을 넣었으므로 먼저 정리합니다.
+-- 상세주소가 NULL인 행끼리도 같은 주소로 봅니다 (DECODE는 NULL을 같은 값으로 취급).
+
+-- 1) 사용자가 가리키는 주소를 같은 주소 중 가장 작은 LOCATION_ID로 옮김
+UPDATE USERS u
+   SET u.LOCATION_ID = NVL((
+        SELECT MIN(d.LOCATION_ID)
+          FROM LOCATIONS l
+          JOIN LOCATIONS d
+            ON d.SI_DO = l.SI_DO
+           AND d.SI_GUN_GU = l.SI_GUN_GU
+           AND d.DONG = l.DONG
+           AND DECODE(d.DETAIL_ADDRESS, l.DETAIL_ADDRESS, 1, 0) = 1
+         WHERE l.LOCATION_ID = u.LOCATION_ID
+       ), u.LOCATION_ID)  -- 시도/시군구/동이 비어 비교가 안 되는 행은 그대로
+ WHERE u.LOCATION_ID IS NOT NULL;
+
+-- 2) 중복 행과 아무도 참조하지 않는 고아 행 삭제
+DELETE FROM LOCATIONS l
+ WHERE NOT EXISTS (SELECT 1 FROM USERS u WHERE u.LOCATION_ID = l.LOCATION_ID)
+    OR l.LOCATION_ID <> (
+        SELECT MIN(d.LOCATION_ID)
+          FROM LOCATIONS d
+         WHERE d.SI_DO = l.SI_DO
+           AND d.SI_GUN_GU = l.SI_GUN_GU
+           AND d.DONG = l.DONG
+           AND DECODE(d.DETAIL_ADDRESS, l.DETAIL_ADDRESS, 1, 0) = 1
+    );
+
+COMMIT;
+
+-- 3) 같은 주소가 다시 들어오지 못하게 UNIQUE 키
+--    (signUp PL/SQL 블록은 동시 INSERT로 DUP_VAL_ON_INDEX가 나면 기존 행을 다시 조회해 씁니다)
+CREATE UNIQUE INDEX UX_LOCATIONS_ADDRESS ON LOCATIONS (SI_DO, SI_GUN_GU, DONG, DETAIL_ADDRESS);
+
+-- 4) 사용자 -> 주소 조인/조회용
+CREATE INDEX IX_USERS_LOCATION_ID ON USERS (LOCATION_ID);
@@ -0,0 +1,29 @@
+-- 메일 발송 큐 (outbox)
+-- 요청 처리 트랜잭션 안에서 INSERT 하고, SsyMailWorker가 꺼내 SMTP로 발송합니다.
+-- STATUS: PENDING(대기) -> SENDING(워커가 가져감) -> SENT / FAILED(재시도 한도 초과)
+-- BODY_HTML: SENT/FAILED가 되면 비웁니다(인증번호가 DB에 남지 않도록). 끝난 행은 MAIL_RETENTION_HOURS 뒤 삭제.
+-- EXPIRES_AT: 이 시각이 지나면 보내지 않고 삭제(만료된 인증번호 메일), NULL이면 기한 없음
+CREATE TABLE MAIL_OUTBOX (
+    ID               NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    TO_EMAIL         VARCHAR2(320)  NOT NULL,
+    SUBJECT          VARCHAR2(500)  NOT NULL,
+    BODY_HTML        CLOB,
+    STATUS           VARCHAR2(10)   DEFAULT 'PENDING' NOT NULL,
+    ATTEMPTS         NUMBER         DEFAULT 0 NOT NULL,
+    NEXT_ATTEMPT_AT  TIMESTAMP      DEFAULT SYSTIMESTAMP NOT NULL,
+    LOCKED_AT        TIMESTAMP,
+    PROVIDER         VARCHAR2(20),
+    LAST_ERROR       VARCHAR2(1000),
+    CREATED_AT       TIMESTAMP      DEFAULT SYSTIMESTAMP NOT NULL,
+    SENT_AT          TIMESTAMP,
+    EXPIRES_AT       TIMESTAMP,
+    CONSTRAINT CK_MAIL_OUTBOX_STATUS CHECK (STATUS IN ('PENDING', 'SENDING', 'SENT', 'FAILED'))
+);
+
+CREATE INDEX IX_MAIL_OUTBOX_DUE ON MAIL_OUTBOX (STATUS, NEXT_ATTEMPT_AT);
+
+-- 이미 만든 테이블에 적용할 때
+-- ALTER TABLE MAIL_OUTBOX MODIFY (BODY_HTML NULL);
+-- ALTER TABLE MAIL_OUTBOX ADD (EXPIRES_AT TIMESTAMP);
+-- UPDATE MAIL_OUTBOX SET BODY_HTML = NULL WHERE STATUS IN ('SENT', 'FAILED');
+-- COMMIT;
@@ -0,0 +1,27 @@
+-- 생산량 집계(rollup) 테이블
+-- ProduceLogDAO.add_log / add_logs_bulk / delete_log 가 같은 트랜잭션 안에서 증감합니다.
+-- PERIOD_TYPE: 'W' = 주(ISO, 월요일 시작), 'M' = 월, 'Y' = 연
+CREATE TABLE PRODUCE_LOG_ROLLUPS (
+    USER_ID         NUMBER        NOT NULL,
+    CROP_NAME       VARCHAR2(100) NOT NULL,
+    PERIOD_TYPE     CHAR(1)       NOT NULL,
+    PERIOD_START    DATE          NOT NULL,
+    TOTAL_QUANTITY  NUMBER        DEFAULT 0 NOT NULL,
+    LOG_COUNT       NUMBER        DEFAULT 0 NOT NULL,
+    CONSTRAINT PK_PRODUCE_LOG_ROLLUPS PRIMARY KEY (USER_ID, PERIOD_TYPE, PERIOD_START, CROP_NAME),
+    CONSTRAINT CK_PRODUCE_LOG_ROLLUPS_TYPE CHECK (PERIOD_TYPE IN ('W', 'M', 'Y'))
+);
+
+-- 지역/전체 집계용 (사용자 구분 없이 기간으로 훑을 때)
+CREATE INDEX IX_PRODUCE_LOG_ROLLUPS_PERIOD ON PRODUCE_LOG_ROLLUPS (PERIOD_TYPE, PERIOD_START);
+
+-- 기존 기록으로 처음 채우기 (POST /api/produce-stats/rebuild 와 같은 계산)
+INSERT INTO PRODUCE_LOG_ROLLUPS (USER_ID, CROP_NAME, PERIOD_TYPE, PERIOD_START, TOTAL_QUANTITY, LOG_COUNT)
+SELECT l.USER_ID, l.CROP_NAME, p.PERIOD_TYPE, TRUNC(l.PRODUCTION_DATE, p.FMT),
+       SUM(l.PRODUCE_QUANTITY), COUNT(*)
+  FROM PRODUCE_LOGS l
+ CROSS JOIN (SELECT 'W' PERIOD_TYPE, 'IW' FMT FROM dual
+             UNION ALL SELECT 'M', 'MM' FROM dual
+             UNION ALL SELECT 'Y', 'YYYY' FROM dual) p
+ GROUP BY l.USER_ID, l.CROP_NAME, p.PERIOD_TYPE, TRUNC(l.PRODUCTION_DATE, p.FMT);
+COMMIT;
@@ -0,0 +1,16 @@
+-- 대소문자 구분 없는 이메일 조회를 인덱스로 처리하기 위한 정규화 컬럼
+-- WHERE LOWER(EMAIL) = ... 는 EMAIL 일반 인덱스를 못 타서 USERS 전체를 훑습니다.
+-- UsersDAO는 파이썬에서 같은 규칙(strip + lower)으로 정규화한 값을 EMAIL_NORM과 비교합니다.
+--
+-- 가상 컬럼이라 기존 INSERT/UPDATE는 그대로 두면 되고, 저장 공간도 인덱스만 늘어납니다.
+-- 대소문자만 다른 중복 이메일이 이미 있으면 UNIQUE 인덱스 생성이 실패하므로 먼저 확인:
+--   SELECT LOWER(TRIM(EMAIL)), COUNT(*) FROM USERS GROUP BY LOWER(TRIM(EMAIL)) HAVING COUNT(*) > 1;
+ALTER TABLE USERS ADD (EMAIL_NORM GENERATED ALWAYS AS (LOWER(TRIM(EMAIL))) VIRTUAL);
+
+CREATE UNIQUE INDEX UX_USERS_EMAIL_NORM ON USERS (EMAIL_NORM);
+
+-- 실행 계획 확인 (INDEX UNIQUE SCAN UX_USERS_EMAIL_NORM 이어야 함)
+--   back_end 폴더에서 python check_email_index.py  (UsersDAO의 이메일 조회 문장마다 확인, 아니면 종료 코드 1)
+--   직접 보려면:
+--   EXPLAIN PLAN FOR SELECT ID, EMAIL, PASSWORD FROM USERS WHERE EMAIL_NORM = :P_EMAIL_NORM;
+--   SELECT * FROM TABLE(DBMS_XPLAN.DISPLAY);
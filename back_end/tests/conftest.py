@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# back_end 폴더에서 python -m pytest 로 실행 (모듈은 back_end 기준으로 import)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SSY import config
+from SSY.config import Settings
+
+
+def pytest_configure(config):
+    # 폐기 예정 API(ORJSONResponse 등)를 다시 쓰면 테스트가 실패하도록
+    config.addinivalue_line("filterwarnings", "error::fastapi.exceptions.FastAPIDeprecationWarning")
+
+
+@pytest.fixture(autouse=True)
+def settings():
+    # .env 없이 기본값으로 (ORACLE_DSN이 없으므로 앱은 DB 없이 기동)
+    config.configure(Settings())
+    yield config.get_settings()
+    config.configure(None)
@@ -0,0 +1,388 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+from SSY.ssyAsyncDBManager import SsyAsyncDBManager
+
+# ProduceLogDAO/UsersDAO/OracleOtpStore/SsyMailWorker가 보내는 SQL만 알아듣는 Oracle 대역
+# (USERS + LOCATIONS + PRODUCE_LOGS + PRODUCE_LOG_ROLLUPS + EMAIL_TOKENS + MAIL_OUTBOX, 메타데이터 조회는 스키마 없음으로 답함)
+# 세션 간 격리는 없음: commit/rollback은 저장소 전체를 스냅숏/복원합니다. latency를 주면 왕복(execute/executemany/commit)마다 그만큼 기다림 (bench.py load).
+# 문장 종류는 앞부분으로 구분하고, 집계 버킷 계산(TRUNC IW/MM/YYYY)은 파이썬으로 흉내 냅니다.
+
+
+class OraError:
+    def __init__(self, code: int, message: str):
+        self.code = code
+        self.message = message
+
+
+class DatabaseError(Exception):
+    pass
+
+
+class BatchError:
+    def __init__(self, offset: int, error: OraError):
+        self.offset = offset
+        self.code = error.code
+        self.message = error.message
+
+
+def dup_key_error():
+    return DatabaseError(OraError(1, "ORA-00001: unique constraint (PK_PRODUCE_LOG_ROLLUPS) violated"))
+
+
+def period_start(period_type: str, day: datetime) -> datetime:
+    day = datetime(day.year, day.month, day.day)
+    if period_type == "W":
+        return day - timedelta(days=day.weekday())  # ISO 주: 월요일 시작
+    if period_type == "M":
+        return day.replace(day=1)
+    return day.replace(month=1, day=1)
+
+
+class FakeVar:
+    def __init__(self):
+        self.value = None
+        self.plsql = False  # PL/SQL OUT 바인드는 값 하나, DML RETURNING은 행 목록
+
+    def getvalue(self):
+        return self.value if self.plsql else [self.value]
+
+
+class FakeOracle:
+    def __init__(self, latency: float = 0):
+        self.latency = latency
+        self.users = {}     # id -> {EMAIL, IS_VERIFIED, USERNAME, PASSWORD, PHONE_NUMBER, PROFILE_IMAGE_URL, LOCATION_ID}
+        self.locations = {}  # id -> (si_do, si_gun_gu, dong, detail_address)
+        self.logs = {}      # id -> (user_id, crop_name, quantity, production_date)
+        self.rollups = {}   # (user_id, crop_name, period_type, period_start) -> [quantity, count]
+        self.next_id = 1
+        self.concurrent_first_insert = []  # MERGE 직전에 다른 세션이 먼저 넣을 기록 (경합 재현)
+        self.email_tokens = {}  # rowid -> {USER_ID, TOKEN, PURPOSE, EXPIRES_AT, USED_AT, ATTEMPTS}
+        self.mail_outbox = {}   # id -> {TO_EMAIL, SUBJECT, BODY_HTML, STATUS, ATTEMPTS, NEXT_ATTEMPT_AT, EXPIRES_AT, ...}
+        self._committed = self._state()
+
+    def _state(self):
+        # 행 값이 tuple이면 그대로, dict/list면 한 단계만 복사 (deepcopy는 기록이 쌓일수록 commit마다 느려짐)
+        return (
+            {k: dict(v) for k, v in self.users.items()}, dict(self.locations), dict(self.logs),
+            {k: list(v) for k, v in self.rollups.items()}, self.next_id,
+            {k: dict(v) for k, v in self.email_tokens.items()}, {k: dict(v) for k, v in self.mail_outbox.items()},
+        )
+
+    def commit(self):
+        self._committed = self._state()
+
+    def rollback(self):
+        (self.users, self.locations, self.logs, self.rollups, self.next_id,
+         self.email_tokens, self.mail_outbox) = self._committed
+        self._committed = self._state()  # 복원한 객체와 스냅숏이 같은 객체를 공유하지 않게
+
+    async def round_trip(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def add_user(self, email: str, is_verified: int = 0, **columns) -> int:
+        user_id = max(self.users, default=0) + 1
+        self.users[user_id] = {"EMAIL": email, "IS_VERIFIED": is_verified, "USERNAME": None, "PASSWORD": None,
+                               "PHONE_NUMBER": None, "PROFILE_IMAGE_URL": None, "LOCATION_ID": None, **columns}
+        return user_id
+
+    def user_by_email(self, email_norm: str):
+        for user_id, u in self.users.items():
+            if u["EMAIL"].strip().lower() == email_norm:
+                return user_id, u
+        return None, None
+
+    def insert_log(self, user_id, crop_name, quantity, production_date: datetime):
+        self.logs[self.next_id] = (user_id, crop_name, quantity, production_date)
+        self.next_id += 1
+
+    def add_to_rollups(self, user_id, crop_name, day, quantity, count, insert_only=False):
+        for period_type in ("W", "M", "Y"):
+            key = (user_id, crop_name, period_type, period_start(period_type, day))
+            if key in self.rollups:
+                if insert_only:
+                    raise dup_key_error()
+                self.rollups[key][0] += quantity
+                self.rollups[key][1] += count
+            else:
+                self.rollups[key] = [quantity, count]
+
+    def recompute(self):
+        """PRODUCE_LOGS에서 처음부터 계산한 집계 (rebuild_rollups와 같은 계산)"""
+        expected = {}
+        for user_id, crop_name, quantity, day in self.logs.values():
+            for period_type in ("W", "M", "Y"):
+                bucket = expected.setdefault((user_id, crop_name, period_type, period_start(period_type, day)), [0, 0])
+                bucket[0] += quantity
+                bucket[1] += 1
+        return expected
+
+    @asynccontextmanager
+    async def acquire(self):
+        cur = FakeCursor(self)
+        try:
+            yield FakeConnection(self), cur
+        except Exception:
+            self.rollback()
+            raise
+
+    def install(self, monkeypatch):
+        monkeypatch.setattr(SsyAsyncDBManager, "acquire", self.acquire)
+        return self
+
+
+class FakeConnection:
+    def __init__(self, db: FakeOracle):
+        self.db = db
+
+    async def commit(self):
+        await self.db.round_trip()
+        self.db.commit()
+
+    async def rollback(self):
+        await self.db.round_trip()
+        self.db.rollback()
+
+
+class FakeCursor:
+    def __init__(self, db: FakeOracle):
+        self.db = db
+        self.rowcount = 0
+        self.description = None
+        self.arraysize = 100
+        self._batch_errors = []
+        self._rowcounts = []
+        self._rows = []
+
+    def var(self, tp):
+        return FakeVar()
+
+    def getbatcherrors(self):
+        return self._batch_errors
+
+    def getarraydmlrowcounts(self):
+        return self._rowcounts
+
+    async def executemany(self, sql, rows, batcherrors=False, arraydmlrowcounts=False):
+        await self.db.round_trip()
+        self._batch_errors = []
+        self._rowcounts = []
+        for offset, binds in enumerate(rows):
+            self.rowcount = 0
+            try:
+                self._run(sql, binds)
+            except DatabaseError as e:
+                if not batcherrors:
+                    raise
+                self._batch_errors.append(BatchError(offset, e.args[0]))
+            self._rowcounts.append(self.rowcount)
+
+    async def execute(self, sql, binds=None):
+        await self.db.round_trip()
+        self._rows = []
+        self.description = None
+        self._run(sql, binds or {})
+
+    async def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    async def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def _run(self, sql, b):
+        statement = " ".join(sql.split()).upper()
+        db = self.db
+        if statement.startswith("SELECT SYS_CONTEXT"):
+            self._rows = [("",)]  # SsyMetadata.warm: 스키마 없음 -> 테이블 이름을 수식 없이 씀
+        elif "FROM ALL_TAB_COLUMNS" in statement or "FROM ALL_CONSTRAINTS" in statement:
+            self._rows = []
+        elif "EMAIL_TOKENS" in statement:
+            self._email_tokens(statement, b)
+        elif "MAIL_OUTBOX" in statement:
+            self._mail_outbox(statement, b)
+        elif statement.startswith("DECLARE") and "O_STATUS" in b:
+            self._signup_block(b)
+        elif " USERS " in f"{statement} ":
+            self._users(statement, b)
+        elif statement.startswith("SELECT ID, CROP_NAME, PRODUCE_QUANTITY, TO_CHAR(PRODUCTION_DATE"):
+            self._select_logs(b)
+        elif statement.startswith("SELECT CROP_NAME, SUM(TOTAL_QUANTITY)"):
+            self._totals_by_crop(b)
+        elif statement.startswith("INSERT INTO PRODUCE_LOGS "):
+            day = datetime.strptime(b["P_PROD_DATE"], "%Y-%m-%d")
+            db.insert_log(b["P_USER_ID"], b["P_CROP_NAME"], b["P_QUANTITY"], day)
+            self.rowcount = 1
+        elif statement.startswith("MERGE INTO PRODUCE_LOG_ROLLUPS"):
+            if db.concurrent_first_insert:
+                # 다른 세션이 같은 버킷의 첫 기록을 먼저 commit -> 이번 MERGE는 NOT MATCHED로 판단했다가 ORA-00001
+                other = db.concurrent_first_insert.pop(0)
+                db.insert_log(*other)
+                db.add_to_rollups(other[0], other[1], other[3], other[2], 1)
+                db.commit()
+                raise dup_key_error()
+            db.add_to_rollups(b["P_USER_ID"], b["P_CROP_NAME"], b["P_PROD_DATE"], b["P_DELTA_QTY"], b["P_DELTA_CNT"])
+        elif statement.startswith("DELETE FROM PRODUCE_LOGS "):
+            log = db.logs.get(b["P_LOG_ID"])
+            if log is None or ("P_OWNER_ID" in b and log[0] != b["P_OWNER_ID"]):
+                self.rowcount = 0
+                return
+            del db.logs[b["P_LOG_ID"]]
+            for name, value in zip(("O_USER", "O_CROP", "O_QTY", "O_DATE"), log):
+                b[name].value = value
+            self.rowcount = 1
+        elif statement.startswith("DELETE FROM PRODUCE_LOG_ROLLUPS"):
+            empty = [k for k, (_, count) in db.rollups.items()
+                     if k[0] == b["P_USER_ID"] and k[1] == b["P_CROP_NAME"] and count <= 0]
+            for k in empty:
+                del db.rollups[k]
+            self.rowcount = len(empty)
+        else:
+            raise NotImplementedError(statement[:60])
+
+    def _email_tokens(self, statement, b):
+        tokens = self.db.email_tokens
+        if statement.startswith("INSERT INTO EMAIL_TOKENS"):
+            rowid = f"AAA{len(tokens) + 1}"
+            tokens[rowid] = {"USER_ID": b["P_USER_ID"], "TOKEN": b["P_TOKEN"], "PURPOSE": "OTP",
+                             "EXPIRES_AT": b["P_EXPIRES_AT"], "USED_AT": None, "ATTEMPTS": 0}
+        elif statement.startswith("UPDATE EMAIL_TOKENS SET USED_AT = SYSDATE WHERE USER_ID"):
+            for t in tokens.values():
+                if t["USER_ID"] == b["P_USER_ID"] and t["USED_AT"] is None:
+                    t["USED_AT"] = datetime.now()
+        elif statement.startswith("UPDATE EMAIL_TOKENS SET USED_AT = SYSDATE WHERE ROWID"):
+            tokens[b["P_RID"]]["USED_AT"] = datetime.now()
+        elif statement.startswith("UPDATE EMAIL_TOKENS SET ATTEMPTS = ATTEMPTS + 1 WHERE ROWID"):
+            tokens[b["P_RID"]]["ATTEMPTS"] += 1
+        elif statement.startswith("SELECT ROWID, TOKEN, ATTEMPTS FROM EMAIL_TOKENS"):
+            now = datetime.now()
+            live = sorted(((rid, t) for rid, t in tokens.items()
+                           if t["USER_ID"] == b["P_USER_ID"] and t["USED_AT"] is None and t["EXPIRES_AT"] > now),
+                          key=lambda item: item[1]["EXPIRES_AT"], reverse=True)
+            self._rows = [(rid, t["TOKEN"], t["ATTEMPTS"]) for rid, t in live[:1]]
+        else:
+            raise NotImplementedError(statement[:60])
+
+    def _mail_outbox(self, statement, b):
+        outbox = self.db.mail_outbox
+        now = datetime.now()
+        if statement.startswith("INSERT INTO MAIL_OUTBOX"):
+            msg_id = max(outbox, default=0) + 1
+            expires = None if b["P_TTL"] is None else now + timedelta(seconds=b["P_TTL"])
+            outbox[msg_id] = {"TO_EMAIL": b["P_TO"], "SUBJECT": b["P_SUBJECT"], "BODY_HTML": b["P_BODY"],
+                              "STATUS": "PENDING", "ATTEMPTS": 0, "NEXT_ATTEMPT_AT": now, "EXPIRES_AT": expires,
+                              "LOCKED_AT": None, "PROVIDER": None, "LAST_ERROR": None, "SENT_AT": None, "CREATED_AT": now}
+        elif statement.startswith("UPDATE MAIL_OUTBOX SET STATUS = 'PENDING', LOCKED_AT = NULL WHERE STATUS = 'SENDING'"):
+            for m in outbox.values():
+                if m["STATUS"] == "SENDING" and m["LOCKED_AT"] < now - timedelta(seconds=b["P_STALE"]):
+                    m["STATUS"], m["LOCKED_AT"] = "PENDING", None
+        elif statement.startswith("DELETE FROM MAIL_OUTBOX WHERE STATUS = 'PENDING' AND EXPIRES_AT"):
+            for msg_id in [i for i, m in outbox.items()
+                           if m["STATUS"] == "PENDING" and m["EXPIRES_AT"] is not None and m["EXPIRES_AT"] <= now]:
+                del outbox[msg_id]
+        elif statement.startswith("DELETE FROM MAIL_OUTBOX WHERE STATUS IN ('SENT', 'FAILED')"):
+            old = [i for i, m in outbox.items()
+                   if m["STATUS"] in ("SENT", "FAILED") and m["CREATED_AT"] < now - timedelta(hours=b["P_HOURS"])]
+            for msg_id in old:
+                del outbox[msg_id]
+            self.rowcount = len(old)
+        elif statement.startswith("SELECT ID FROM MAIL_OUTBOX"):
+            due = sorted((m["NEXT_ATTEMPT_AT"], i) for i, m in outbox.items()
+                         if m["STATUS"] == "PENDING" and m["NEXT_ATTEMPT_AT"] <= now)
+            self._rows = [(i,) for _, i in due[:b["P_N"]]]
+        elif statement.startswith("UPDATE MAIL_OUTBOX SET STATUS = 'SENDING'"):
+            m = outbox.get(b["P_ID"])
+            self.rowcount = 0
+            if m is not None and m["STATUS"] == "PENDING":
+                m["STATUS"], m["LOCKED_AT"] = "SENDING", now
+                self.rowcount = 1
+        elif statement.startswith("SELECT ID, TO_EMAIL, SUBJECT, BODY_HTML, ATTEMPTS"):
+            ids = sorted(v for k, v in b.items() if k.startswith("P_ID"))
+            self._rows = [(i, outbox[i]["TO_EMAIL"], outbox[i]["SUBJECT"], outbox[i]["BODY_HTML"], outbox[i]["ATTEMPTS"],
+                           None if outbox[i]["EXPIRES_AT"] is None else (outbox[i]["EXPIRES_AT"] - now).total_seconds())
+                          for i in ids]
+        elif statement.startswith("UPDATE MAIL_OUTBOX SET STATUS = 'SENT'"):
+            outbox[b["P_ID"]].update(STATUS="SENT", SENT_AT=now, LOCKED_AT=None, BODY_HTML=None,
+                                     ATTEMPTS=b["P_ATTEMPTS"], PROVIDER=b["P_PROVIDER"], LAST_ERROR=None)
+        elif statement.startswith("UPDATE MAIL_OUTBOX SET STATUS = 'PENDING', LOCKED_AT = NULL, ATTEMPTS"):
+            outbox[b["P_ID"]].update(STATUS="PENDING", LOCKED_AT=None, ATTEMPTS=b["P_ATTEMPTS"],
+                                     NEXT_ATTEMPT_AT=now + timedelta(seconds=b["P_DELAY"]), LAST_ERROR=b["P_ERROR"])
+        elif statement.startswith("UPDATE MAIL_OUTBOX SET STATUS = 'FAILED'"):
+            outbox[b["P_ID"]].update(STATUS="FAILED", LOCKED_AT=None, BODY_HTML=None,
+                                     ATTEMPTS=b["P_ATTEMPTS"], LAST_ERROR=b["P_ERROR"])
+        else:
+            raise NotImplementedError(statement[:60])
+
+    def _users(self, statement, b):
+        db = self.db
+        if statement.startswith("SELECT ID, IS_VERIFIED FROM USERS WHERE EMAIL_NORM"):
+            user_id, u = db.user_by_email(b["P_EMAIL_NORM"])
+            self._rows = [(user_id, u["IS_VERIFIED"])] if u else []
+        elif statement.startswith("INSERT INTO USERS (EMAIL, IS_VERIFIED)"):
+            b["P_ID_OUT"].value = db.add_user(b["P_EMAIL"])
+        elif statement.startswith("UPDATE USERS SET IS_VERIFIED = 1"):
+            db.users[b["P_USER_ID"]]["IS_VERIFIED"] = 1
+        elif statement.startswith("SELECT NVL(IS_VERIFIED, 0), CASE"):  # 가입 사전 확인
+            _, u = db.user_by_email(b["P_EMAIL_NORM"])
+            self._rows = [(u["IS_VERIFIED"] or 0, int(bool(u["USERNAME"] and u["PASSWORD"])))] if u else []
+        elif statement.startswith("SELECT ID, EMAIL, PASSWORD FROM USERS WHERE EMAIL_NORM"):
+            user_id, u = db.user_by_email(b["P_EMAIL_NORM"])
+            self._rows = [(user_id, u["EMAIL"], u["PASSWORD"])] if u else []
+        elif statement.startswith("UPDATE USERS SET PASSWORD = :P_PASSWORD"):
+            db.users[b["P_USER_ID"]]["PASSWORD"] = b["P_PASSWORD"]
+        else:
+            raise NotImplementedError(statement[:60])
+
+    def _signup_block(self, b):
+        # UsersDAO._signup_plsql과 같은 판단 (블록 안에서 COMMIT까지)
+        db = self.db
+        for name in ("O_STATUS", "O_LOC_ID"):
+            b[name].plsql = True
+        user_id, u = db.user_by_email(b["P_EMAIL_NORM"])
+        if u is None:
+            b["O_STATUS"].value = 404
+        elif (u["IS_VERIFIED"] or 0) != 1:
+            b["O_STATUS"].value = 403
+        elif u["USERNAME"] is not None and u["PASSWORD"] is not None:
+            b["O_STATUS"].value = 409
+        else:
+            address = (b["P_SIDO"], b["P_SIGUNGU"], b["P_DONG"], b["P_DETAIL_ADDRESS"])
+            loc_id = b["P_LOC_ID"] or next((i for i, a in db.locations.items() if a == address), None)
+            if loc_id is None:
+                loc_id = max(db.locations, default=0) + 1
+                db.locations[loc_id] = address
+            u.update(USERNAME=b["P_USERNAME"], PHONE_NUMBER=b["P_PHONE"], PASSWORD=b["P_PASSWORD"],
+                     PROFILE_IMAGE_URL=b["P_IMG"], LOCATION_ID=loc_id)
+            db.commit()
+            b["O_LOC_ID"].value = loc_id
+            b["O_STATUS"].value = 200
+
+    def _select_logs(self, b):
+        rows = []
+        for log_id, (user_id, crop_name, quantity, day) in self.db.logs.items():
+            if user_id != b["P_USER_ID"]:
+                continue
+            prod_date = day.strftime("%Y-%m-%d")
+            if ("P_FROM" in b and prod_date < b["P_FROM"]) or ("P_TO" in b and prod_date > b["P_TO"]):
+                continue
+            if "P_C_DATE" in b and (prod_date, log_id) >= (b["P_C_DATE"], b["P_C_ID"]):
+                continue
+            rows.append((log_id, crop_name, quantity, prod_date))
+        rows.sort(key=lambda r: (r[3], r[0]), reverse=True)
+        self.description = [("ID",), ("CROP_NAME",), ("PRODUCE_QUANTITY",), ("PROD_DATE",)]
+        self._rows = rows[:b["P_LIMIT"]] if "P_LIMIT" in b else rows
+
+    def _totals_by_crop(self, b):
+        totals = {}
+        for (user_id, crop_name, period_type, start), (quantity, count) in self.db.rollups.items():
+            if user_id != b["P_USER_ID"] or period_type != "Y":
+                continue
+            if "P_YEAR" in b and start.year != int(b["P_YEAR"]):
+                continue
+            slot = totals.setdefault(crop_name, [0, 0])
+            slot[0] += quantity
+            slot[1] += count
+        self.description = [("CROP_NAME",), ("TOTAL_QUANTITY",), ("LOG_COUNT",)]
+        self._rows = sorted(((c, q, n) for c, (q, n) in totals.items()), key=lambda r: r[1], reverse=True)
@@ -0,0 +1,63 @@
+import asyncio
+import email
+import re
+import socket
+
+from aiosmtpd.controller import Controller
+
+# 메일 발송 테스트/부하 측정용 로컬 SMTP 싱크 (aiosmtpd, STARTTLS/로그인 없이 받기만 함)
+
+OTP_PATTERN = re.compile(r">(\d{6})<")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Sink:
+    """받은 메일을 모아 두는 aiosmtpd 핸들러"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+    def html_to(self, to_email: str) -> list:
+        bodies = []
+        for envelope in list(self.messages):
+            if to_email in envelope.rcpt_tos:
+                bodies.append(email.message_from_bytes(envelope.content).get_payload(decode=True).decode("utf-8"))
+        return bodies
+
+    async def wait_otp(self, to_email: str, timeout: float = 10) -> str:
+        # 메일 워커가 보낼 때까지 기다렸다가 가장 최근 인증번호를 돌려줌
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            codes = [m.group(1) for html in self.html_to(to_email) for m in [OTP_PATTERN.search(html)] if m]
+            if codes:
+                return codes[-1]
+            if loop.time() >= deadline:
+                raise TimeoutError(f"no OTP mail for {to_email}")
+            await asyncio.sleep(0.01)
+
+
+class SinkController(Controller):
+    # 연결마다 factory()가 불리므로 그 횟수 = 받은 SMTP 연결 수
+    connections = 0
+
+    def __init__(self, **smtp_kwargs):
+        super().__init__(Sink(), hostname="127.0.0.1", port=free_port(), **smtp_kwargs)
+
+    def factory(self):
+        self.connections += 1
+        return super().factory()
+
+    def start(self):
+        super().start()
+        self.connections = 0  # start()가 기동 확인용으로 한 번 붙음
+        return self
@@ -0,0 +1,21 @@
+from fastapi.testclient import TestClient
+
+from cropRd.weatherProvider import WeatherProvider
+from homeController import create_app
+
+
+class StubWeather(WeatherProvider):
+    closed = False
+
+    async def fetch(self, lat, lon):
+        return {"temp": 20.0, "rain": 50.0}
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_injected_weather_provider_is_left_open():
+    provider = StubWeather()
+    with TestClient(create_app(users_dao=object(), produce_log_dao=object(), weather_provider=provider)) as client:
+        assert client.get("/api/recommend-crop", params={"location": "서울"}).status_code == 200
+    assert not provider.closed  # 넘긴 자원은 호출자가 닫음
@@ -0,0 +1,22 @@
+import pytest
+
+from SSY.config import Settings
+
+
+def test_default_jwt_secret_is_refused_with_a_database():
+    Settings()  # DB 없이(테스트/개발)는 기본값 허용
+    with pytest.raises(ValueError, match="JWT_SECRET"):
+        Settings(ORACLE_DSN="db:1521/dev")
+    Settings(ORACLE_DSN="db:1521/dev", JWT_SECRET="s" * 32, OTP_HASH_SECRET="o" * 32)
+
+
+def test_default_otp_hash_secret_is_refused_with_a_database():
+    with pytest.raises(ValueError, match="OTP_HASH_SECRET"):
+        Settings(ORACLE_DSN="db:1521/dev", JWT_SECRET="s" * 32)
+
+
+def test_memory_version_store_is_refused_with_several_workers():
+    Settings(WEB_WORKERS=1)
+    with pytest.raises(ValueError, match="CACHE_VERSION_BACKEND"):
+        Settings(WEB_WORKERS=4)
+    Settings(WEB_WORKERS=4, CACHE_VERSION_BACKEND="redis")
@@ -0,0 +1,10 @@
+from check_email_index import uses_index
+
+
+def test_uses_index_reads_plan_table_rows():
+    indexed = [("SELECT STATEMENT", None, None), ("TABLE ACCESS", "BY INDEX ROWID", "USERS"),
+               ("INDEX", "UNIQUE SCAN", "UX_USERS_EMAIL_NORM")]
+    full = [("SELECT STATEMENT", None, None), ("TABLE ACCESS", "FULL", "USERS")]
+    assert uses_index(indexed, "ux_users_email_norm")
+    assert not uses_index(full, "UX_USERS_EMAIL_NORM")
+    assert not uses_index([("INDEX", "RANGE SCAN", "IX_USERS_EMAIL")], "UX_USERS_EMAIL_NORM")
@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+
+from SSY.ssyFileNameGenerator import SsyFileNameGenerator
+
+
+def test_ulids_are_unique_and_monotonic_across_threads():
+    threads, per_thread = 8, 12_500  # 10만 개
+    batches = [None] * threads
+    start = threading.Barrier(threads)
+
+    def work(n):
+        start.wait()  # 최대한 같은 밀리초에 몰리도록
+        batches[n] = [SsyFileNameGenerator.ulid() for _ in range(per_thread)]
+
+    workers = [threading.Thread(target=work, args=(n,)) for n in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    all_ids = [i for batch in batches for i in batch]
+    assert len(all_ids) == threads * per_thread
+    assert len(set(all_ids)) == len(all_ids)
+    assert all(len(i) == 26 for i in all_ids)
+    for batch in batches:
+        assert batch == sorted(batch)  # 스레드 안에서는 만든 순서 = 사전순
+        assert len(set(batch)) == len(batch)
+
+
+def test_ulid_file_name_is_sanitized_and_sortable():
+    first = SsyFileNameGenerator.generate("내 사진 (1).JPG", "ulid")
+    second = SsyFileNameGenerator.generate("../../etc/passwd", "ulid")
+    assert first.endswith("_내_사진_1.jpg")
+    assert "/" not in second and ".." not in second
+    assert first < second
+
+
+def test_hash_mode_and_shards():
+    digest = "ab" * 32
+    assert SsyFileNameGenerator.generate("photo.PNG", "hash", digest) == f"{digest}.png"
+    assert SsyFileNameGenerator.shard(f"{digest}.png") == "ab/ab"
+    with pytest.raises(ValueError):
+        SsyFileNameGenerator.generate("photo.png", "hash")
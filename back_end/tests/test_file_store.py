@@ -0,0 +1,78 @@
+import asyncio
+import dataclasses
+import io
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import UploadFile
+from fastapi.testclient import TestClient
+
+from homeController import create_app
+from SSY import config
+from SSY.ssyAsyncDBManager import SsyAsyncDBManager
+from SSY.ssyFileStore import SsyFileStore
+from users.userDAO import UsersDAO
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+@pytest.fixture
+def store(settings, tmp_path):
+    config.configure(dataclasses.replace(settings, UPLOAD_DIR=str(tmp_path), THUMBNAIL_SIZES=[]))
+    yield
+    SsyFileStore._refs.clear()
+
+
+def save(data=PNG, name="a.png"):
+    return asyncio.run(SsyFileStore.save(UploadFile(file=io.BytesIO(data), filename=name)))
+
+
+def test_discard_keeps_file_another_upload_still_uses(store):
+    # A가 새로 저장 -> B가 같은 내용을 올림(created=False) -> A의 가입 실패로 되돌려도 B의 파일은 남아야 함
+    name, created_a = save()
+    same, created_b = save(name="b.png")
+    assert (same, created_a, created_b) == (name, True, False)
+
+    SsyFileStore.release(name, discard=True)
+    assert SsyFileStore.find(name)
+    SsyFileStore.release(name)
+    assert SsyFileStore.find(name)
+    assert name not in SsyFileStore._refs
+
+
+def test_discard_removes_unshared_file(store):
+    name, created = save()
+    SsyFileStore.release(name, discard=created)
+    assert SsyFileStore.find(name) is None
+
+
+def test_sign_up_rollback_keeps_file_referenced_by_committed_user(store, monkeypatch):
+    # B가 이미 가입을 마쳐(참조 해제) 진행 중 표시가 없어도 USERS에 남은 참조를 보고 지우지 않음
+    @asynccontextmanager
+    async def acquire():
+        class Cursor:
+            async def execute(self, sql, binds=None):
+                assert binds == {"P_IMG": name}
+
+            async def fetchone(self):
+                return (1,)
+        yield None, Cursor()
+
+    monkeypatch.setattr(SsyAsyncDBManager, "acquire", acquire)
+    dao = UsersDAO.__new__(UsersDAO)
+    dao.T_USERS = "USERS"
+    name, created = save()
+    asyncio.run(dao._release_upload(name, discard=created))
+    assert SsyFileStore.find(name)
+
+
+def test_file_response_leaves_cors_to_middleware(store):
+    name, _ = save()
+    SsyFileStore.release(name)
+    app = create_app(users_dao=object(), produce_log_dao=object())
+    with TestClient(app) as client:
+        plain = client.get(f"/psa/{name}")
+        cross = client.get(f"/psa/{name}", headers={"Origin": "http://example.com"})
+    assert plain.status_code == 200 and "access-control-allow-origin" not in plain.headers
+    assert cross.headers["access-control-allow-origin"] in ("*", "http://example.com")
+    assert "immutable" in plain.headers["cache-control"]
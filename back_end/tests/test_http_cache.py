@@ -0,0 +1,58 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from homeController import create_app
+from SSY.ssyHttpCache import MemoryVersionStore, make_etag
+from SSY.ssyTokenManager import SsyTokenManager
+
+
+class FakeProduceLogDAO:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_logs(self, user_id, **kwargs):
+        self.calls += 1
+        return {"logs": [], "next_cursor": None}
+
+
+def _auth(user_id):
+    return {"Authorization": f"Bearer {SsyTokenManager.issue(user_id)['access_token']}"}
+
+
+def test_make_etag_is_stable_and_input_sensitive():
+    assert make_etag("v1", 50, None) == make_etag("v1", 50, None)
+    assert make_etag("v1", 50, None) != make_etag("v1", 50, "cursor")
+    assert make_etag(None, "a") != make_etag("a", None)
+
+
+def test_unseen_keys_get_distinct_versions():
+    async def scenario():
+        store = MemoryVersionStore()
+        first, second = await store.get("produce-logs:1"), await store.get("produce-logs:2")
+        assert first != second
+        assert await store.get("produce-logs:1") == first  # 쓰기 전까지 그대로
+        await store.bump("produce-logs:1")
+        assert await store.get("produce-logs:1") != first
+
+    asyncio.run(scenario())
+
+
+def test_produce_logs_etag_is_per_user():
+    dao = FakeProduceLogDAO()
+    app = create_app(users_dao=object(), produce_log_dao=dao, version_store=MemoryVersionStore())
+    with TestClient(app) as client:
+        first = client.get("/api/produce-logs", params={"limit": 50}, headers=_auth(1))
+        assert first.status_code == 200
+        assert "Authorization" in first.headers["Vary"]
+        etag = first.headers["ETag"]
+
+        # 같은 조회 조건이라도 다른 사용자는 다른 ETag -> 남의 ETag로는 304가 나지 않음
+        other = client.get("/api/produce-logs", params={"limit": 50}, headers={**_auth(2), "If-None-Match": etag})
+        assert other.status_code == 200
+        assert other.headers["ETag"] != etag
+
+        again = client.get("/api/produce-logs", params={"limit": 50}, headers={**_auth(1), "If-None-Match": etag})
+        assert again.status_code == 304
+        assert "Authorization" in again.headers["Vary"]
+    assert dao.calls == 2
@@ -0,0 +1,44 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from SSY.ssyAsyncDBManager import SsyAsyncDBManager
+from SSY.ssyPasswordHasher import SsyPasswordHasher
+from users.userDAO import UsersDAO
+
+
+def test_login_succeeds_when_rehash_update_fails(monkeypatch):
+    class Cursor:
+        async def execute(self, sql, binds=None):
+            if sql.lstrip().startswith("UPDATE"):
+                raise ConnectionError("DPY-4011: connection closed")
+
+        async def fetchone(self):
+            return (5, "kim@example.com", "$2b$04$" + "a" * 53)  # 설정(12)과 다른 cost -> 재해시 대상
+
+    @asynccontextmanager
+    async def acquire():
+        yield None, Cursor()
+
+    async def verify(password, hashed):
+        return True
+
+    async def fast_hash(password):
+        return "$2b$12$" + "b" * 53
+
+    async def no_metadata(cur):
+        pass
+
+    async def pk_col(cur):
+        return "ID"
+
+    monkeypatch.setattr(SsyAsyncDBManager, "acquire", acquire)
+    monkeypatch.setattr(SsyPasswordHasher, "verify", verify)
+    monkeypatch.setattr(SsyPasswordHasher, "hash", fast_hash)
+    dao = UsersDAO.__new__(UsersDAO)
+    dao.T_USERS = "USERS"
+    monkeypatch.setattr(dao, "_ensure_schema_and_tables", no_metadata)
+    monkeypatch.setattr(dao, "_users_pk_col", pk_col)
+
+    result = asyncio.run(dao.login("kim@example.com", "pw"))
+    assert result["user_id"] == 5
+    assert result["access_token"]
@@ -0,0 +1,157 @@
+import asyncio
+import dataclasses
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from SSY import config
+from SSY.emailer import SmtpSender
+from SSY.ssyAsyncDBManager import SsyAsyncDBManager
+from SSY.ssyMailWorker import SsyMailWorker
+from SSY.ssyMetadata import SsyMetadata
+from tests.fake_oracle import FakeOracle
+
+pytest.importorskip("aiosmtpd")
+from tests.smtp_sink import SinkController, free_port  # noqa: E402
+
+
+@pytest.fixture
+def smtp():
+    started = []
+
+    def start(**smtp_kwargs):
+        controller = SinkController(**smtp_kwargs).start()
+        started.append(controller)
+        return controller
+
+    yield start
+    for controller in started:
+        controller.stop()
+
+
+def use_providers(settings, naver_port: int, google_port: int):
+    config.configure(dataclasses.replace(
+        settings, SMTP_STARTTLS=False, SMTP_TIMEOUT=2,
+        NAVER_SMTP_HOST="127.0.0.1", NAVER_SMTP_PORT=naver_port, NAVER_SMTP_USER="noreply@naver.test", NAVER_SMTP_PASS=None,
+        GOOGLE_SMTP_HOST="127.0.0.1", GOOGLE_SMTP_PORT=google_port, GOOGLE_SMTP_USER="noreply@gmail.test", GOOGLE_SMTP_PASS=None,
+    ))
+
+
+def test_sender_reuses_one_connection(settings, smtp):
+    server = smtp()
+    use_providers(settings, server.port, free_port())
+    sender = SmtpSender("naver")
+    try:
+        for n in range(3):
+            sender.send("a@example.com", f"제목 {n}", "<p>본문</p>")
+    finally:
+        sender.close()
+    assert len(server.handler.messages) == 3
+    assert server.connections == 1
+
+
+def test_sender_reconnects_after_idle_disconnect(settings, smtp):
+    server = smtp(timeout=0.2)  # 서버가 유휴 연결을 0.2초 뒤 끊음
+    use_providers(settings, server.port, free_port())
+    sender = SmtpSender("naver")
+    try:
+        sender.send("a@example.com", "첫 메일", "<p>1</p>")
+        time.sleep(0.5)
+        assert not sender._alive()  # NOOP 확인 실패
+        sender.send("a@example.com", "둘째 메일", "<p>2</p>")
+    finally:
+        sender.close()
+    assert len(server.handler.messages) == 2
+    assert server.connections == 2
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    SsyMetadata.invalidate()
+    db = FakeOracle().install(monkeypatch)
+    yield db
+    SsyMetadata.invalidate()
+
+
+def enqueue(to_email="a@example.com", ttl_seconds=None):
+    async def run():
+        async with SsyAsyncDBManager.acquire() as (con, cur):
+            await SsyMailWorker.enqueue(cur, to_email, "인증번호", "<p>123456</p>", ttl_seconds)
+            await con.commit()
+    asyncio.run(run())
+
+
+def process_batch():
+    async def run():
+        senders = {}
+        try:
+            return await SsyMailWorker._process_batch(senders)
+        finally:
+            for sender in senders.values():
+                sender.close()
+    return asyncio.run(run())
+
+
+def test_worker_fails_over_from_naver_to_google(settings, smtp, outbox):
+    google = smtp()
+    use_providers(settings, free_port(), google.port)  # naver는 아무도 듣지 않는 포트
+    enqueue(ttl_seconds=180)
+
+    assert process_batch() == 1
+    mail = outbox.mail_outbox[1]
+    assert (mail["STATUS"], mail["PROVIDER"], mail["ATTEMPTS"], mail["BODY_HTML"]) == ("SENT", "google", 1, None)
+    assert [m.rcpt_tos for m in google.handler.messages] == [["a@example.com"]]
+
+
+def test_worker_claims_sends_and_marks_sent(settings, smtp, outbox):
+    naver = smtp()
+    use_providers(settings, naver.port, free_port())
+    enqueue("a@example.com")
+    enqueue("b@example.com")
+
+    async def run():
+        SsyMailWorker.start(workers=1)
+        SsyMailWorker.notify()
+        await SsyMailWorker.stop(timeout=10)  # 발송 예정 메일을 다 보낸 뒤 종료
+    asyncio.run(run())
+
+    assert [m["STATUS"] for m in outbox.mail_outbox.values()] == ["SENT", "SENT"]
+    assert all(m["PROVIDER"] == "naver" and m["BODY_HTML"] is None for m in outbox.mail_outbox.values())
+    assert sorted(m.rcpt_tos[0] for m in naver.handler.messages) == ["a@example.com", "b@example.com"]
+    assert naver.connections == 1
+
+
+def test_worker_backs_off_when_every_provider_fails(settings, outbox):
+    use_providers(settings, free_port(), free_port())
+    enqueue()
+
+    before = datetime.now()
+    assert process_batch() == 1
+    mail = outbox.mail_outbox[1]
+    assert (mail["STATUS"], mail["ATTEMPTS"]) == ("PENDING", 1)
+    assert mail["BODY_HTML"] is not None  # 재시도할 본문은 남김
+    assert "naver:" in mail["LAST_ERROR"] and "google:" in mail["LAST_ERROR"]
+    assert mail["NEXT_ATTEMPT_AT"] >= before + timedelta(seconds=settings.MAIL_RETRY_BASE_SECONDS)
+    assert process_batch() == 0  # 백오프 동안은 다시 가져가지 않음
+
+
+def test_otp_mail_is_not_retried_after_it_expires(settings):
+    now = 1000.0
+    otp_deadline = now + settings.OTP_TTL_SECONDS
+    results = [
+        (1, 1, None, "smtp down", otp_deadline),               # 10초 뒤 재시도 -> 유효 시간 안
+        (2, 4, None, "smtp down", now + 50),                   # 80초 뒤 재시도인데 50초 뒤 만료 -> 포기
+        (3, 5, None, "smtp down", None),                       # 기한 없는 메일은 백오프대로
+        (4, settings.MAIL_MAX_ATTEMPTS, None, "smtp down", None),
+        (5, 1, "naver", None, otp_deadline),                   # 성공
+    ]
+    retry, final = SsyMailWorker._plan_failures(results, now)
+    assert [r["P_ID"] for r in retry] == [1, 3]
+    assert [r["P_ID"] for r in final] == [2, 4]
+    assert all(now + r["P_DELAY"] < otp_deadline for r in retry if r["P_ID"] == 1)
+
+
+def test_retry_delay_is_capped(settings):
+    assert SsyMailWorker._retry_delay(1) == settings.MAIL_RETRY_BASE_SECONDS
+    assert SsyMailWorker._retry_delay(30) == settings.MAIL_RETRY_MAX_SECONDS
@@ -0,0 +1,36 @@
+import dataclasses
+
+from fastapi.testclient import TestClient
+
+import homeController
+from SSY import config
+from SSY.ssyRateLimiter import MemoryRateLimiter
+
+
+def _client(monkeypatch, settings, **overrides):
+    config.configure(dataclasses.replace(settings, **overrides))
+
+    async def no_db():
+        pass
+
+    monkeypatch.setattr(homeController, "warm_metadata", no_db)
+    app = homeController.create_app(users_dao=object(), produce_log_dao=object(), rate_limiter=MemoryRateLimiter())
+    return TestClient(app)
+
+
+def test_refresh_is_disabled_without_admin_token(monkeypatch, settings):
+    with _client(monkeypatch, settings) as client:
+        assert client.post("/api/metadata/refresh").status_code == 403
+        assert client.post("/api/metadata/refresh", headers={"X-Admin-Token": ""}).status_code == 403
+
+
+def test_refresh_requires_token_and_is_rate_limited(monkeypatch, settings):
+    with _client(monkeypatch, settings, ADMIN_TOKEN="s3cret", METADATA_REFRESH_LIMIT="2/60") as client:
+        assert client.post("/api/metadata/refresh").status_code == 401
+        assert client.post("/api/metadata/refresh", headers={"X-Admin-Token": "wrong"}).status_code == 401
+        ok = {"X-Admin-Token": "s3cret"}
+        assert client.post("/api/metadata/refresh", headers=ok).status_code == 200
+        assert client.post("/api/metadata/refresh", headers=ok).status_code == 200
+        limited = client.post("/api/metadata/refresh", headers=ok)
+        assert limited.status_code == 429
+        assert int(limited.headers["Retry-After"]) > 0
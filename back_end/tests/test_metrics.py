@@ -0,0 +1,73 @@
+import asyncio
+import dataclasses
+import logging
+
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from homeController import create_app
+from SSY import config
+from SSY.ssyMetrics import SsyMetrics
+
+
+def duration(route: str):
+    series = SsyMetrics._histograms["http_request_duration_seconds"]
+    (slot,) = [v for k, v in series.items() if ("route", route) in k]
+    return slot[-2], slot[-1]  # (합계 초, 횟수)
+
+
+def test_streaming_latency_includes_body():
+    async def slow_stream():
+        async def chunks():
+            for _ in range(3):
+                await asyncio.sleep(0.1)
+                yield b"x"
+        return StreamingResponse(chunks())
+
+    SsyMetrics.reset()
+    app = create_app(users_dao=object(), produce_log_dao=object())
+    app.add_api_route("/test/slow-stream", slow_stream)
+    with TestClient(app) as client:
+        r = client.get("/test/slow-stream")
+    assert r.content == b"xxx"
+    assert "app;dur=" in r.headers["server-timing"]
+    seconds, count = duration("/test/slow-stream")
+    assert count == 1 and seconds >= 0.3  # 헤더가 나간 시점이 아니라 마지막 조각까지
+
+
+def test_unmatched_and_errors_are_recorded():
+    async def boom():
+        raise RuntimeError("boom")
+
+    SsyMetrics.reset()
+    app = create_app(users_dao=object(), produce_log_dao=object())
+    app.add_api_route("/test/boom", boom)
+    with TestClient(app, raise_server_exceptions=False) as client:
+        assert client.get("/test/boom").status_code == 500
+        assert client.get("/no-such-route").status_code == 404
+    assert duration("/test/boom")[1] == 1
+    assert duration("unmatched")[1] == 1
+    assert ("status", 500) in next(k for k in SsyMetrics._histograms["http_request_duration_seconds"] if ("route", "/test/boom") in k)
+
+
+def test_fetches_are_timed_but_not_counted_as_round_trips(settings, caplog):
+    config.configure(dataclasses.replace(settings, SLOW_QUERY_MS=5))
+    token = SsyMetrics.begin_request()
+    SsyMetrics.record_db("execute", 0.002, "SELECT 1 FROM dual")
+    for _ in range(3):
+        SsyMetrics.record_db("fetchone", 0.0001)  # prefetch 버퍼에서 나온 행
+    with caplog.at_level(logging.WARNING, logger="SSY.ssyMetrics"):
+        SsyMetrics.record_db("commit", 0.006)
+    round_trips, db_seconds = SsyMetrics.end_request(token)
+    assert round_trips == 2
+    assert abs(db_seconds - 0.0083) < 1e-9
+    assert "slow query 6.0ms [commit]" in caplog.text
+
+
+def test_metrics_and_pool_stats_need_admin_token(settings):
+    config.configure(dataclasses.replace(settings, ADMIN_TOKEN="s3cret"))
+    app = create_app(users_dao=object(), produce_log_dao=object())
+    with TestClient(app) as client:
+        for path in ("/metrics", "/api/db-pool-stats"):
+            assert client.get(path).status_code == 401
+            assert client.get(path, headers={"X-Admin-Token": "s3cret"}).status_code == 200
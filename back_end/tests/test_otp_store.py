@@ -0,0 +1,178 @@
+import asyncio
+import dataclasses
+
+import pytest
+
+from SSY import config
+from SSY.ssyAsyncDBManager import SsyAsyncDBManager
+from SSY.ssyMetadata import SsyMetadata
+from SSY.ssyOtpStore import (OTP_INVALID, OTP_LOCKED, OTP_OK, MemoryOtpStore, OracleOtpStore, RedisOtpStore,
+                             create_otp_store, hash_otp)
+from tests.fake_oracle import FakeOracle
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """RedisOtpStore가 쓰는 명령만 (해시 + 만료 + 검증 Lua 스크립트를 같은 규칙의 파이썬으로)"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.ttls = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def register_script(self, lua):
+        assert lua == RedisOtpStore._VERIFY_LUA
+
+        async def verify(keys, args):
+            entry = self.hashes.get(keys[0])
+            if entry is None:
+                return 0
+            entry["a"] = int(entry["a"]) + 1
+            if entry["a"] > int(args[1]):
+                return -1
+            if entry["h"] == args[0]:
+                del self.hashes[keys[0]]
+                return 1
+            return 0
+        return verify
+
+    async def aclose(self):
+        pass
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def delete(self, key):
+        self.commands.append(lambda: self.redis.hashes.pop(key, None))
+
+    def hset(self, key, mapping):
+        self.commands.append(lambda: self.redis.hashes.setdefault(key, {}).update(mapping))
+
+    def expire(self, key, seconds):
+        self.commands.append(lambda: self.redis.ttls.__setitem__(key, seconds))
+
+    async def execute(self):
+        return [command() for command in self.commands]
+
+
+def test_hash_otp_is_keyed_and_hides_code(settings):
+    digest = hash_otp(1, "123456")
+    assert digest == hash_otp(1, "123456") and len(digest) == 43
+    assert "123456" not in digest
+    assert hash_otp(2, "123456") != digest  # 같은 코드라도 사용자별로 다름
+    config.configure(dataclasses.replace(settings, OTP_HASH_SECRET="other"))
+    assert hash_otp(1, "123456") != digest
+
+
+def test_code_is_single_use_and_stored_hashed():
+    store = MemoryOtpStore()
+
+    async def scenario():
+        await store.issue(None, 1, "123456", 180)
+        assert "123456" not in repr(store._entries)
+        return await store.verify(None, 1, "123456"), await store.verify(None, 1, "123456")
+
+    assert asyncio.run(scenario()) == (OTP_OK, OTP_INVALID)
+
+
+def test_wrong_codes_lock_until_reissued(settings):
+    config.configure(dataclasses.replace(settings, OTP_MAX_ATTEMPTS=3))
+    store = MemoryOtpStore()
+
+    async def scenario():
+        await store.issue(None, 1, "123456", 180)
+        wrong = [await store.verify(None, 1, "000000") for _ in range(3)]
+        locked = await store.verify(None, 1, "123456")  # 맞는 코드도 잠김
+        await store.issue(None, 1, "654321", 180)
+        return wrong, locked, await store.verify(None, 1, "654321")
+
+    assert asyncio.run(scenario()) == ([OTP_INVALID] * 3, OTP_LOCKED, OTP_OK)
+
+
+def test_expired_codes_are_rejected_and_swept():
+    clock = FakeClock()
+    store = MemoryOtpStore(sweep_interval=60, clock=clock)
+
+    async def scenario():
+        await store.issue(None, 1, "111111", 180)
+        await store.issue(None, 2, "222222", 30)
+        clock.now += 100
+        expired = await store.verify(None, 2, "222222")
+        clock.now += 100  # 1번도 만료, 다음 호출에서 한꺼번에 정리
+        await store.issue(None, 3, "333333", 180)
+        return expired
+
+    assert asyncio.run(scenario()) == OTP_INVALID
+    assert set(store._entries) == {3}
+
+
+def test_create_otp_store_backends():
+    assert isinstance(create_otp_store("memory"), MemoryOtpStore)
+    with pytest.raises(ValueError):
+        create_otp_store("file")
+
+
+def test_redis_store_locks_after_max_attempts(settings):
+    config.configure(dataclasses.replace(settings, OTP_MAX_ATTEMPTS=2))
+    redis = FakeRedis()
+    store = RedisOtpStore(prefix="otp:", client=redis)
+
+    async def scenario():
+        await store.issue(None, 7, "123456", 180)
+        assert redis.ttls["otp:7"] == 180 and "123456" not in repr(redis.hashes)
+        wrong = [await store.verify(None, 7, "000000") for _ in range(2)]
+        locked = await store.verify(None, 7, "123456")
+        await store.issue(None, 7, "654321", 180)  # 재발급하면 시도 횟수도 새로
+        return wrong, locked, await store.verify(None, 7, "654321"), await store.verify(None, 7, "654321")
+
+    assert asyncio.run(scenario()) == ([OTP_INVALID] * 2, OTP_LOCKED, OTP_OK, OTP_INVALID)
+
+
+@pytest.fixture
+def oracle(monkeypatch):
+    SsyMetadata.invalidate()
+    return FakeOracle().install(monkeypatch)
+
+
+def test_oracle_store_issue_verify_and_lock(settings, oracle):
+    config.configure(dataclasses.replace(settings, OTP_MAX_ATTEMPTS=2))
+    store = OracleOtpStore()
+
+    async def call(method, *args):
+        async with SsyAsyncDBManager.acquire() as (con, cur):
+            result = await getattr(store, method)(cur, *args)
+            await con.commit()  # writes_db: 시도 횟수/사용 처리는 호출자 commit으로 남음
+            return result
+
+    async def scenario():
+        await call("issue", 3, "111111", 180)
+        await call("issue", 3, "222222", 180)  # 이전 코드는 무효화
+        old = await call("verify", 3, "111111")
+        wrong = await call("verify", 3, "000000")
+        locked = await call("verify", 3, "222222")
+        await call("issue", 3, "333333", 180)
+        ok = await call("verify", 3, "333333")
+        await call("issue", 3, "444444", -1)  # 이미 만료
+        return old, wrong, locked, ok, await call("verify", 3, "444444")
+
+    assert asyncio.run(scenario()) == (OTP_INVALID, OTP_INVALID, OTP_LOCKED, OTP_OK, OTP_INVALID)
+    assert store.writes_db
+    assert all(t["TOKEN"] not in {"111111", "222222", "333333"} for t in oracle.email_tokens.values())
@@ -0,0 +1,48 @@
+import asyncio
+import dataclasses
+
+import pytest
+
+from SSY import config
+from SSY.ssyPasswordHasher import SsyPasswordHasher
+
+
+@pytest.fixture
+def low_rounds(settings):
+    config.configure(dataclasses.replace(settings, BCRYPT_ROUNDS=4, PASSWORD_HASH_WORKERS=1))
+    yield
+    asyncio.run(SsyPasswordHasher.shutdown())
+
+
+def test_hash_and_verify_in_process_pool(low_rounds):
+    async def scenario():
+        hashed = await SsyPasswordHasher.hash("비밀번호")
+        return hashed, await SsyPasswordHasher.verify("비밀번호", hashed), await SsyPasswordHasher.verify("틀림", hashed)
+
+    hashed, ok, wrong = asyncio.run(scenario())
+    assert hashed.startswith("$2b$04$")
+    assert ok and not wrong
+
+
+def test_pool_is_spawned_and_shut_down_off_the_loop(low_rounds):
+    async def scenario():
+        executor = SsyPasswordHasher.getExecutor()
+        await SsyPasswordHasher.hash("pw")
+        await SsyPasswordHasher.shutdown()
+        return executor
+
+    executor = asyncio.run(scenario())
+    assert executor._mp_context.get_start_method() == "spawn"
+    assert SsyPasswordHasher._executor is None
+
+
+@pytest.mark.parametrize("hashed", ["", None, "plaintext", "$2b$04$broken"])
+def test_verify_rejects_missing_or_malformed_hash(low_rounds, hashed):
+    assert asyncio.run(SsyPasswordHasher.verify("pw", hashed)) is False
+
+
+def test_cost_and_needs_rehash(low_rounds):
+    assert SsyPasswordHasher.cost("$2b$12$" + "a" * 53) == 12
+    assert SsyPasswordHasher.cost("plaintext") == 0
+    assert SsyPasswordHasher.needs_rehash("$2b$12$" + "a" * 53)  # 설정(4)과 다름 -> 로그인 때 재해시
+    assert not SsyPasswordHasher.needs_rehash("$2b$04$" + "a" * 53)
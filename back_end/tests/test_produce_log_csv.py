@@ -0,0 +1,68 @@
+import asyncio
+import dataclasses
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from produceLogDAO.produceLogDAO import ProduceLogDAO
+from SSY import config
+from SSY.ssyApiError import SsyApiError
+from tests.fake_oracle import FakeOracle
+
+HEADER = "cropName,quantity,productionDate\n"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    return FakeOracle().install(monkeypatch)
+
+
+@pytest.fixture
+def dao(monkeypatch):
+    dao = ProduceLogDAO()
+
+    async def no_metadata(cur):
+        pass
+
+    monkeypatch.setattr(dao, "_ensure_schema_and_tables", no_metadata)
+    return dao
+
+
+class CountingFile(io.BytesIO):
+    reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def upload(text: str):
+    f = CountingFile(("\ufeff" + text).encode("utf-8"))
+    return UploadFile(file=f, filename="logs.csv"), f
+
+
+def test_csv_rows_are_inserted(db, dao):
+    file, _ = upload(HEADER + "쌀,3,2024-01-01\n감자,x,2024-01-02\n")
+    result = asyncio.run(dao.add_logs_csv(file, owner_id=1))
+    assert result["inserted"] == 1 and [r["index"] for r in result["rejected"]] == [1]
+    assert len(db.logs) == 1
+
+
+def test_oversized_csv_stops_reading_with_413(settings, db, dao):
+    config.configure(dataclasses.replace(settings, PRODUCE_LOG_CSV_MAX_BYTES=4096, UPLOAD_CHUNK_SIZE=1024))
+    file, raw = upload(HEADER + "쌀,3,2024-01-01\n" * 10000)
+    with pytest.raises(SsyApiError) as e:
+        asyncio.run(dao.add_logs_csv(file, owner_id=1))
+    assert e.value.status_code == 413
+    assert raw.reads <= 5  # 한도를 넘는 청크에서 멈춤
+    assert not db.logs
+
+
+def test_csv_row_limit_is_413_before_db(settings, db, dao):
+    config.configure(dataclasses.replace(settings, PRODUCE_LOG_BULK_MAX_ROWS=3))
+    file, _ = upload(HEADER + "쌀,3,2024-01-01\n" * 4)
+    with pytest.raises(SsyApiError) as e:
+        asyncio.run(dao.add_logs_csv(file, owner_id=1))
+    assert e.value.status_code == 413
+    assert not db.logs
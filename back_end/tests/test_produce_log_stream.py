@@ -0,0 +1,70 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from produceLogDAO.produceLogDAO import ProduceLogDAO
+from SSY.ssyApiError import SsyApiError
+from SSY.ssyAsyncDBManager import SsyAsyncDBManager
+
+
+class BrokenCursor:
+    # 첫 묶음은 돌려주고 두 번째 fetch에서 연결이 끊긴 것처럼 실패
+    description = [("ID",), ("CROP_NAME",), ("PRODUCE_QUANTITY",), ("PROD_DATE",)]
+    arraysize = 100
+
+    def __init__(self):
+        self.fetches = 0
+
+    async def execute(self, sql, binds=None):
+        pass
+
+    async def fetchmany(self):
+        self.fetches += 1
+        if self.fetches == 1:
+            return [(2, "쌀", 3.5, "2024-01-02"), (1, "쌀", 1.0, "2024-01-01")]
+        raise ConnectionError("DPY-4011: the database or network closed the connection")
+
+
+@pytest.fixture
+def dao(monkeypatch):
+    @asynccontextmanager
+    async def acquire():
+        yield None, BrokenCursor()
+
+    async def no_metadata(cur):
+        pass
+
+    monkeypatch.setattr(SsyAsyncDBManager, "acquire", acquire)
+    dao = ProduceLogDAO()
+    monkeypatch.setattr(dao, "_ensure_schema_and_tables", no_metadata)
+    return dao
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson"])
+def test_mid_stream_error_aborts_without_closing_the_array(dao, fmt):
+    async def collect():
+        chunks = []
+        with pytest.raises(ConnectionError):
+            async for chunk in dao.stream_logs(1, fmt=fmt).body_iterator:
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    body = asyncio.run(collect())
+    assert b'"id":2' in body
+    assert not body.endswith(b"]")
+
+
+@pytest.mark.parametrize("date_from, date_to", [
+    ("2024-13-01", None),
+    ("yesterday", None),
+    (None, "2024-02-30"),
+    ("2024-03-01", "2024-02-01"),
+])
+def test_invalid_date_range_is_422(dao, date_from, date_to):
+    with pytest.raises(SsyApiError) as e:
+        dao.stream_logs(1, date_from=date_from, date_to=date_to)
+    assert e.value.status_code == 422
+    with pytest.raises(SsyApiError) as e:
+        asyncio.run(dao.get_logs(1, date_from=date_from, date_to=date_to))
+    assert e.value.status_code == 422
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from SSY.ssyRateLimiter import MemoryRateLimiter, parse_rule, too_many_requests
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_rule():
+    assert parse_rule("3/600") == (3, 600.0)
+
+
+def test_flood_is_rejected_then_recovers_after_refill():
+    clock = FakeClock()
+    limiter = MemoryRateLimiter(clock=clock)
+    rules = [("otp-send:email:a@b.c", "3/600"), ("otp-send:ip:1.2.3.4", "20/600")]
+
+    async def flood(n):
+        return [await limiter.check(rules) for _ in range(n)]
+
+    waits = asyncio.run(flood(50))
+    assert waits[:3] == [0, 0, 0]
+    assert all(w > 0 for w in waits[3:])
+    assert waits[3] == pytest.approx(200)  # 600초에 3개 -> 한 개 회복에 200초
+
+    clock.now += 199
+    assert asyncio.run(limiter.check(rules)) == pytest.approx(1)
+    clock.now += 1
+    assert asyncio.run(limiter.check(rules)) == 0  # 회복된 한 개 사용
+    assert asyncio.run(limiter.check(rules)) > 0
+
+    clock.now += 600  # 가득 찰 때까지 쉬면 다시 3번
+    assert asyncio.run(flood(4))[:3] == [0, 0, 0]
+
+
+def test_full_buckets_are_swept():
+    clock = FakeClock()
+    limiter = MemoryRateLimiter(sweep_interval=60, clock=clock)
+    asyncio.run(limiter.hit("k", 3, 600))
+    clock.now += 1000
+    asyncio.run(limiter.hit("other", 3, 600))
+    assert "k" not in limiter._buckets
+
+
+def test_too_many_requests_sets_retry_after():
+    error = too_many_requests(12.2)
+    assert error.status_code == 429
+    assert error.headers == {"Retry-After": "13"}
+
+
+def test_otp_flood_does_not_reach_the_dao():
+    from fastapi.testclient import TestClient
+
+    from homeController import create_app
+
+    class CountingUsers:
+        calls = 0
+
+        async def send_otp(self, email):
+            CountingUsers.calls += 1
+            return {"result": "인증번호를 전송했습니다."}
+
+    app = create_app(users_dao=CountingUsers(), produce_log_dao=object(), rate_limiter=MemoryRateLimiter())
+    with TestClient(app) as client:
+        codes = [client.post("/users/auth-email", json={"email": "a@b.c"}).status_code for _ in range(100)]
+    assert codes.count(200) == 3 and codes.count(429) == 97
+    assert CountingUsers.calls == 3  # DB/SMTP 작업은 허용된 3번뿐
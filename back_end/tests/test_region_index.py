@@ -0,0 +1,50 @@
+import random
+import time
+
+from fastapi.testclient import TestClient
+
+from cropRd.regionIndex import RegionIndex
+from cropRd.cropRd import region_finder
+from homeController import create_app
+
+REGIONS = [
+    {"name": "서울", "lat": 37.5665, "lon": 126.9780, "aliases": ["서울특별시"]},
+    {"name": "부산", "lat": 35.1796, "lon": 129.0756, "aliases": ["부산광역시"]},
+    {"name": "대전", "lat": 36.3504, "lon": 127.3845},
+    {"name": "제주", "lat": 33.4996, "lon": 126.5312, "aliases": ["제주특별자치도"]},
+]
+
+
+def _brute_force(index, lat, lon):
+    return min(index.regions, key=lambda r: index._dist2(lat, lon, r["lat"], r["lon"]))
+
+
+def test_names_and_addresses():
+    index = RegionIndex(REGIONS)
+    assert index.by_name("서울 특별시")["name"] == "서울"
+    assert index.by_address("부산광역시", "해운대구")["name"] == "부산"
+    assert index.by_name("평양") is None
+
+
+def test_nearest_matches_linear_scan():
+    index = RegionIndex(REGIONS, cell_deg=0.25)
+    rng = random.Random(7)
+    for _ in range(2000):
+        lat, lon = rng.uniform(33, 38.5), rng.uniform(126, 129.5)
+        assert index.nearest(lat, lon) is _brute_force(index, lat, lon)
+
+
+def test_far_coordinate_is_rejected_quickly():
+    index = RegionIndex(REGIONS, cell_deg=0.01)  # 칸이 작을수록 예전 고리 탐색은 오래 걸렸음
+    started = time.perf_counter()
+    assert not index.covers(48.85, 2.35)
+    assert index.nearest(48.85, 2.35) is None
+    assert index.nearest(-89.9, 179.9) is None
+    assert time.perf_counter() - started < 0.05
+
+
+def test_recommend_rejects_out_of_range_coordinates():
+    assert region_finder.covers(37.5, 127.0)
+    with TestClient(create_app(users_dao=object(), produce_log_dao=object())) as client:
+        r = client.get("/api/recommend-crop", params={"lat": 48.85, "lon": 2.35})
+        assert r.status_code == 422
@@ -0,0 +1,71 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from produceLogDAO.produceLogDAO import ProduceLogDAO
+from tests.fake_oracle import FakeOracle
+
+
+@pytest.fixture
+def db(monkeypatch):
+    return FakeOracle().install(monkeypatch)
+
+
+@pytest.fixture
+def dao(monkeypatch):
+    dao = ProduceLogDAO()
+
+    async def no_metadata(cur):
+        pass
+
+    monkeypatch.setattr(dao, "_ensure_schema_and_tables", no_metadata)
+    return dao
+
+
+def assert_rollups_match(db):
+    expected = db.recompute()
+    assert db.rollups.keys() == expected.keys()
+    for key, (quantity, count) in expected.items():
+        assert db.rollups[key][0] == pytest.approx(quantity)
+        assert db.rollups[key][1] == count
+
+
+def test_rollups_follow_insert_bulk_and_delete(db, dao):
+    async def scenario():
+        await dao.add_log(1, "쌀", 10.5, "2024-01-01")
+        await dao.add_log(1, "쌀", 4.5, "2024-01-03")  # 같은 주/월/연 버킷
+        await dao.add_log(2, "감자", 7, "2023-12-31")
+        result = await dao.add_logs_bulk([
+            {"cropName": "쌀", "quantity": 3, "productionDate": "2024-02-29"},
+            {"cropName": "보리", "quantity": 1.25, "productionDate": "2024-01-01"},
+            {"cropName": "쌀", "quantity": "많이", "productionDate": "2024-03-01"},  # 형식 오류 -> 거부
+        ], batch_size=2, owner_id=1)
+        assert result["inserted"] == 2 and [r["index"] for r in result["rejected"]] == [2]
+        assert_rollups_match(db)
+
+        first_rice = next(i for i, log in db.logs.items() if log[1] == "쌀")
+        await dao.delete_log(first_rice, owner_id=1)
+        barley = next(i for i, log in db.logs.items() if log[1] == "보리")
+        await dao.delete_log(barley, owner_id=1)  # 버킷이 비면 행도 지워짐
+        assert_rollups_match(db)
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_first_insert_retries_merge(db, dao):
+    # 다른 세션이 같은 버킷의 첫 기록을 먼저 넣어 이쪽 MERGE가 ORA-00001 -> 한 번 더 MERGE해 UPDATE로 반영
+    db.concurrent_first_insert.append((1, "쌀", 2.0, datetime(2024, 5, 2)))
+    asyncio.run(dao.add_log(1, "쌀", 5.0, "2024-05-01"))
+    assert len(db.logs) == 2
+    assert_rollups_match(db)
+
+
+def test_concurrent_first_insert_in_bulk_retries_only_failed_rows(db, dao):
+    db.concurrent_first_insert.append((1, "콩", 1.0, datetime(2024, 6, 3)))
+    result = asyncio.run(dao.add_logs_bulk([
+        {"cropName": "콩", "quantity": 2, "productionDate": "2024-06-04"},
+        {"cropName": "콩", "quantity": 3, "productionDate": "2024-06-05"},
+    ], owner_id=1))
+    assert result["inserted"] == 2
+    assert_rollups_match(db)
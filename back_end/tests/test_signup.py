@@ -0,0 +1,120 @@
+import asyncio
+import dataclasses
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from homeController import create_app
+from SSY import config
+from SSY.ssyApiError import SsyApiError
+from SSY.ssyAsyncDBManager import SsyAsyncDBManager
+from SSY.ssyMailWorker import SsyMailWorker
+from SSY.ssyMetadata import SsyMetadata
+from SSY.ssyPasswordHasher import SsyPasswordHasher
+from SSY.ssyRateLimiter import MemoryRateLimiter
+from tests.fake_oracle import FakeOracle
+from users.userDAO import UsersDAO
+
+FORM = dict(username="kim", email="kim@example.com", phone_number="", password="pw", psa=None,
+            si_do="서울특별시", si_gun_gu="종로구", dong="청운동", detail_address="1")
+
+
+@pytest.fixture
+def users(monkeypatch):
+    # (IS_VERIFIED, 이미 가입) 한 행을 돌려주는 사전 확인만 흉내 냄
+    state = {"row": None, "executes": 0}
+
+    class Cursor:
+        async def execute(self, sql, binds=None):
+            state["executes"] += 1
+
+        async def fetchone(self):
+            return state["row"]
+
+    @asynccontextmanager
+    async def acquire():
+        yield None, Cursor()
+
+    async def no_metadata(cur):
+        pass
+
+    async def must_not_hash(password):
+        raise AssertionError("bcrypt ran for a rejected sign-up")
+
+    monkeypatch.setattr(SsyAsyncDBManager, "acquire", acquire)
+    monkeypatch.setattr(SsyPasswordHasher, "hash", must_not_hash)
+    dao = UsersDAO.__new__(UsersDAO)
+    dao.T_USERS = "USERS"
+    monkeypatch.setattr(dao, "_ensure_schema_and_tables", no_metadata)
+    return dao, state
+
+
+@pytest.mark.parametrize("row, status", [(None, 404), ((0, 0), 403), ((1, 1), 409)])
+def test_rejected_sign_up_skips_bcrypt(users, row, status):
+    dao, state = users
+    state["row"] = row
+    with pytest.raises(SsyApiError) as e:
+        asyncio.run(dao.signUp(**FORM))
+    assert e.value.status_code == status
+    assert state["executes"] == 1
+
+
+def test_sign_up_is_rate_limited_before_db_work(settings):
+    class CountingUsers:
+        calls = 0
+
+        async def signUp(self, **kwargs):
+            CountingUsers.calls += 1
+            raise SsyApiError(409, "이미 가입된 이메일입니다.")
+
+    config.configure(dataclasses.replace(settings, SIGNUP_LIMIT_PER_EMAIL="2/600"))
+    app = create_app(users_dao=CountingUsers(), produce_log_dao=object(), rate_limiter=MemoryRateLimiter())
+    form = {k: v for k, v in FORM.items() if v is not None}
+    with TestClient(app) as client:
+        codes = [client.post("/users/sign-up", data=form).status_code for _ in range(5)]
+    assert codes == [409, 409, 429, 429, 429]
+    assert CountingUsers.calls == 2
+
+
+def test_signup_funnel_with_otp_from_mail(settings, monkeypatch):
+    # 인증번호 요청 -> (메일 워커가 SMTP 싱크로 발송) -> 메일의 번호로 인증 -> 가입 -> 로그인
+    pytest.importorskip("aiosmtpd")
+    from tests.smtp_sink import SinkController
+
+    sink = SinkController().start()
+    config.configure(dataclasses.replace(
+        settings, SMTP_STARTTLS=False, MAIL_PROVIDERS=["naver"], NAVER_SMTP_HOST="127.0.0.1",
+        NAVER_SMTP_PORT=sink.port, NAVER_SMTP_USER="noreply@naver.test", BCRYPT_ROUNDS=4, PASSWORD_HASH_WORKERS=1,
+    ))
+    SsyMetadata.invalidate()
+    db = FakeOracle().install(monkeypatch)
+    app = create_app(produce_log_dao=object(), rate_limiter=MemoryRateLimiter())
+    form = {k: v for k, v in FORM.items() if v is not None}
+
+    async def funnel():
+        async with app.router.lifespan_context(app):
+            SsyMailWorker.start(workers=1)  # DSN이 없으면 lifespan이 띄우지 않으므로 직접
+            try:
+                async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                    (await client.post("/users/auth-email", json={"email": FORM["email"]})).raise_for_status()
+                    code = await sink.handler.wait_otp(FORM["email"])
+                    (await client.post("/users/verify-otp", json={"email": FORM["email"], "code": code})).raise_for_status()
+                    signup = await client.post("/users/sign-up", data=form)
+                    again = await client.post("/users/sign-up", data=form)
+                    login = await client.post("/users/login", json={"email": FORM["email"], "password": FORM["password"]})
+            finally:
+                await SsyMailWorker.stop(timeout=5)
+        return signup, again, login
+
+    try:
+        signup, again, login = asyncio.run(funnel())
+    finally:
+        sink.stop()
+        SsyMetadata.invalidate()
+    assert (signup.status_code, again.status_code, login.status_code) == (200, 409, 200)
+    [user] = db.users.values()
+    assert (user["IS_VERIFIED"], user["USERNAME"]) == (1, "kim")
+    assert db.locations[user["LOCATION_ID"]] == ("서울특별시", "종로구", "청운동", "1")
+    assert [m["STATUS"] for m in db.mail_outbox.values()] == ["SENT"]
@@ -0,0 +1,34 @@
+import asyncio
+import inspect
+
+import jwt
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from SSY.ssyApiError import SsyApiError
+from SSY.ssyTokenManager import SsyTokenManager, current_user_id
+
+
+def test_claims_are_cached_per_token():
+    SsyTokenManager.clear()
+    hits, misses = SsyTokenManager.hits, SsyTokenManager.misses
+    token = SsyTokenManager.issue(7)["access_token"]
+    for _ in range(3):
+        assert SsyTokenManager.decode(token)["sub"] == "7"
+    assert (SsyTokenManager.hits - hits, SsyTokenManager.misses - misses) == (2, 1)
+
+
+def test_refresh_token_is_not_an_access_token():
+    tokens = SsyTokenManager.issue(7)
+    with pytest.raises(jwt.InvalidTokenError):
+        SsyTokenManager.decode(tokens["refresh_token"])
+    assert SsyTokenManager.decode(tokens["refresh_token"], SsyTokenManager.REFRESH)["sub"] == "7"
+
+
+def test_current_user_id_runs_on_the_event_loop():
+    assert inspect.iscoroutinefunction(current_user_id)
+    token = SsyTokenManager.issue(3)["access_token"]
+    assert asyncio.run(current_user_id(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))) == 3
+    with pytest.raises(SsyApiError) as e:
+        asyncio.run(current_user_id(HTTPAuthorizationCredentials(scheme="Bearer", credentials="not-a-jwt")))
+    assert e.value.status_code == 401
@@ -1,260 +1,169 @@
-import os
+import logging
 import secrets
-import bcrypt
 from datetime import datetime, timedelta
 
 from fastapi import UploadFile
-from fastapi.responses import JSONResponse
 
-from SSY.ssyDBManager import SsyDBManager
-from SSY.ssyFileNameGenerator import SsyFileNameGenerator
+from SSY.ssyApiError import SsyApiError
+
+from SSY.ssyAsyncDBManager import SsyAsyncDBManager
 from SSY import config
-from SSY.emailer import send_mail, verification_html, otp_html
+from SSY.ssyMetadata import SsyMetadata
+from SSY.ssyOtpStore import create_otp_store, OTP_OK, OTP_LOCKED
+from SSY.ssyFileStore import SsyFileStore, UploadTooLarge, UploadNotAllowed
+from SSY.ssyPasswordHasher import SsyPasswordHasher
+from SSY.ssyTokenManager import SsyTokenManager
+from SSY.emailer import verification_html, otp_html
+from SSY.ssyMailWorker import SsyMailWorker
+from SSY.ssyLocationCache import SsyLocationCache
+
+logger = logging.getLogger(__name__)
 
 
 class UsersDAO:
     def __init__(self):
-        self.psaFolder = "./psa"
-        os.makedirs(self.psaFolder, exist_ok=True)
-        self.jwtKey = "dkanrjsk"
-        self.jwtAlgorithm = "HS256"
-        self.db = SsyDBManager()
-        self.TOKEN_EXPIRE_HOURS = 24
-
-        # 스키마/테이블 캐시
+        self.db = SsyAsyncDBManager()
+        self.otp = create_otp_store()  # OTP 저장소 (config.OTP_BACKEND)
+
+        # 스키마/테이블 이름 (SsyMetadata에서 채움)
         self._schema = None
-        self._users_pk_cache = None
         self.T_USERS = "USERS"
         self.T_EMAIL_TOKENS = "EMAIL_TOKENS"
         self.T_LOCATIONS = "LOCATIONS"
 
-    # === 커넥션 공통 ===
-    def _makeConCur(self):
-        return SsyDBManager.makeConCur()
-
-    def _closeConCur(self, con, cur):
-        SsyDBManager.closeConCur(con, cur)
-
-    # === 스키마/테이블 완전수식 준비 ===
-    def _ensure_schema_and_tables(self, cur):
-        if self._schema is None:
-            # 1) config에 DB_SCHEMA 있으면 사용, 없으면 현재 세션 스키마
-            cfg_schema = getattr(config, "DB_SCHEMA", None)
-            if cfg_schema:
-                self._schema = cfg_schema.upper()
-            else:
-                cur.execute("SELECT SYS_CONTEXT('USERENV','CURRENT_SCHEMA') FROM dual")
-                self._schema = (cur.fetchone()[0] or "").upper()
-
-            # 모든 테이블을 소유자 접두사로 완전수식
-            if self._schema:
-                self.T_USERS = f"{self._schema}.USERS"
-                self.T_EMAIL_TOKENS = f"{self._schema}.EMAIL_TOKENS"
-                self.T_LOCATIONS = f"{self._schema}.LOCATIONS"
-
-    # === USERS PK 컬럼 자동탐지 (ALL_* 뷰, OWNER 필터) ===
-    def _users_pk_col(self, cur) -> str:
-        if self._users_pk_cache:
-            return self._users_pk_cache
-
-        self._ensure_schema_and_tables(cur)
-        owner = self._schema
-
-        # PK 제약에서 탐지
-        cur.execute(
-            """
-            SELECT cols.column_name
-              FROM all_constraints cons
-              JOIN all_cons_columns cols
-                ON cons.owner = cols.owner
-               AND cons.constraint_name = cols.constraint_name
-               AND cons.table_name = cols.table_name
-             WHERE cons.constraint_type = 'P'
-               AND cons.table_name = 'USERS'
-               AND cons.owner = :P_OWNER
-            """,
-            {"P_OWNER": owner},
-        )
-        r = cur.fetchone()
-        if r and r[0]:
-            self._users_pk_cache = r[0]
-            return self._users_pk_cache
-
-        # 폴백: 흔한 PK 이름
-        cur.execute(
-            """
-            SELECT column_name
-              FROM all_tab_columns
-             WHERE owner = :P_OWNER
-               AND table_name = 'USERS'
-               AND column_name IN ('ID','USER_ID','USERS_ID')
-            """,
-            {"P_OWNER": owner},
-        )
-        r = cur.fetchone()
-        self._users_pk_cache = r[0] if r else "ID"
-        return self._users_pk_cache
+    # === 스키마/테이블 완전수식 준비 (공유 메타데이터 캐시에서) ===
+    async def _ensure_schema_and_tables(self, cur):
+        await SsyMetadata.ensure(cur)
+        self._schema = SsyMetadata.schema()
+        self.T_USERS = SsyMetadata.table("USERS")
+        self.T_EMAIL_TOKENS = SsyMetadata.table("EMAIL_TOKENS")
+        self.T_LOCATIONS = SsyMetadata.table("LOCATIONS")
+
+    # === USERS PK 컬럼 (기동 시 ALL_* 뷰에서 탐지해 둔 값) ===
+    async def _users_pk_col(self, cur) -> str:
+        await self._ensure_schema_and_tables(cur)
+        return SsyMetadata.pk("USERS")
+
+    # === 이메일 정규화 (USERS.EMAIL_NORM 가상 컬럼 = LOWER(TRIM(EMAIL)) 과 같은 규칙) ===
+    @staticmethod
+    def _norm_email(email: str) -> str:
+        return (email or "").strip().lower()
 
     # === OTP 유틸 ===
     def _gen_otp(self) -> str:
         return str(secrets.randbelow(1_000_000)).zfill(6)
 
-    def _issue_otp(self, cur, user_id: int, minutes: int = 3) -> str:
+    async def _issue_otp(self, cur, user_id: int, minutes: int = None) -> str:
         code = self._gen_otp()
-
-        # 이전 미사용 OTP 무효화
-        cur.execute(
-            f"""
-            UPDATE {self.T_EMAIL_TOKENS}
-               SET USED_AT = SYSDATE
-             WHERE USER_ID = :P_USER_ID
-               AND PURPOSE = 'OTP'
-               AND USED_AT IS NULL
-            """,
-            {"P_USER_ID": user_id},
-        )
-
-        expires_at = datetime.now() + timedelta(minutes=minutes)
-
-        # 새 OTP 발급
-        cur.execute(
-            f"""
-            INSERT INTO {self.T_EMAIL_TOKENS} (USER_ID, TOKEN, PURPOSE, EXPIRES_AT)
-            VALUES (:P_USER_ID, :P_TOKEN, 'OTP', :P_EXPIRES_AT)
-            """,
-            {"P_USER_ID": user_id, "P_TOKEN": code, "P_EXPIRES_AT": expires_at},
-        )
+        ttl_seconds = minutes * 60 if minutes else config.OTP_TTL_SECONDS
+        await self.otp.issue(cur, user_id, code, ttl_seconds)
         return code
 
     # === OTP: 전송 ===
-    def send_otp(self, email: str) -> JSONResponse:
-        h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
+    async def send_otp(self, email: str) -> dict:
         try:
-            con, cur = self._makeConCur()
-            self._ensure_schema_and_tables(cur)
-            pk = self._users_pk_col(cur)
-
-            # 이메일 존재/상태
-            cur.execute(
-                f"""
-                SELECT {pk}, IS_VERIFIED
-                  FROM {self.T_USERS}
-                 WHERE LOWER(EMAIL) = LOWER(:P_EMAIL)
-                """,
-                {"P_EMAIL": email},
-            )
-            row = cur.fetchone()
+            async with SsyAsyncDBManager.acquire() as (con, cur):
+                await self._ensure_schema_and_tables(cur)
+                pk = await self._users_pk_col(cur)
 
-            if row:
-                uid, isv = int(row[0]), int(row[1] or 0)
-                if isv == 1:
-                    return JSONResponse({"result": "이미 인증된 계정입니다."}, headers=h)
-            else:
-                # 임시 사용자 생성 (RETURNING으로 PK 획득)
-                id_out = cur.var(int)
-                cur.execute(
+                # 이메일 존재/상태
+                await cur.execute(
                     f"""
-                    INSERT INTO {self.T_USERS} (EMAIL, IS_VERIFIED)
-                    VALUES (:P_EMAIL, 0)
-                    RETURNING {pk} INTO :P_ID_OUT
+                    SELECT {pk}, IS_VERIFIED
+                      FROM {self.T_USERS}
+                     WHERE EMAIL_NORM = :P_EMAIL_NORM
                     """,
-                    {"P_EMAIL": email, "P_ID_OUT": id_out},
+                    {"P_EMAIL_NORM": self._norm_email(email)},
                 )
-                uid = int(id_out.getvalue()[0])
+                row = await cur.fetchone()
+
+                if row:
+                    uid, isv = int(row[0]), int(row[1] or 0)
+                    if isv == 1:
+                        return {"result": "이미 인증된 계정입니다."}
+                else:
+                    # 임시 사용자 생성 (RETURNING으로 PK 획득)
+                    id_out = cur.var(int)
+                    await cur.execute(
+                        f"""
+                        INSERT INTO {self.T_USERS} (EMAIL, IS_VERIFIED)
+                        VALUES (:P_EMAIL, 0)
+                        RETURNING {pk} INTO :P_ID_OUT
+                        """,
+                        {"P_EMAIL": email, "P_ID_OUT": id_out},
+                    )
+                    uid = int(id_out.getvalue()[0])
+
+                code = await self._issue_otp(cur, uid)
+                # 발송은 메일 큐(outbox)에 같은 트랜잭션으로 적재 -> 백그라운드 워커가 전송
+                await SsyMailWorker.enqueue(
+                    cur, email, "[TRADESITE] 회원가입 인증번호", otp_html(code), ttl_seconds=config.OTP_TTL_SECONDS
+                )
+                await con.commit()
 
-            code = self._issue_otp(cur, uid, minutes=3)
-            con.commit()
+            SsyMailWorker.notify()
+            return {"result": "인증번호를 전송했습니다."}
 
-            send_mail(email, "[TRADESITE] 회원가입 인증번호", otp_html(code))
-            return JSONResponse({"result": "인증번호를 전송했습니다."}, headers=h)
-
-        except Exception as e:
-            if con:
-                con.rollback()
-            print("send_otp error:", e)
-            return JSONResponse({"result": "전송 실패"}, status_code=500, headers=h)
-        finally:
-            self._closeConCur(con, cur)
+        except Exception:
+            logger.exception("send_otp failed")
+            raise SsyApiError(500, "전송 실패")
 
     # === OTP: 검증 ===
-    def verify_otp(self, email: str, code: str) -> JSONResponse:
-        h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
+    async def verify_otp(self, email: str, code: str) -> dict:
         try:
-            con, cur = self._makeConCur()
-            self._ensure_schema_and_tables(cur)
-            pk = self._users_pk_col(cur)
-
-            cur.execute(
-                f"""
-                SELECT {pk}, IS_VERIFIED
-                  FROM {self.T_USERS}
-                 WHERE LOWER(EMAIL) = LOWER(:P_EMAIL)
-                """,
-                {"P_EMAIL": email},
-            )
-            u = cur.fetchone()
-            if not u:
-                return JSONResponse({"result": "존재하지 않는 이메일"}, status_code=400, headers=h)
+            async with SsyAsyncDBManager.acquire() as (con, cur):
+                await self._ensure_schema_and_tables(cur)
+                pk = await self._users_pk_col(cur)
 
-            uid, isv = int(u[0]), int(u[1] or 0)
-            if isv == 1:
-                return JSONResponse({"result": "이미 인증된 계정"}, headers=h)
-
-            cur.execute(
-                f"""
-                SELECT 1
-                  FROM {self.T_EMAIL_TOKENS}
-                 WHERE USER_ID = :P_USER_ID
-                   AND PURPOSE = 'OTP'
-                   AND USED_AT IS NULL
-                   AND EXPIRES_AT > SYSDATE
-                   AND TOKEN = :P_TOKEN
-                """,
-                {"P_USER_ID": uid, "P_TOKEN": code},
-            )
-            ok = cur.fetchone() is not None
-            if not ok:
-                return JSONResponse({"result": "코드가 유효하지 않거나 만료됨"}, status_code=400, headers=h)
+                await cur.execute(
+                    f"""
+                    SELECT {pk}, IS_VERIFIED
+                      FROM {self.T_USERS}
+                     WHERE EMAIL_NORM = :P_EMAIL_NORM
+                    """,
+                    {"P_EMAIL_NORM": self._norm_email(email)},
+                )
+                u = await cur.fetchone()
+                if not u:
+                    raise SsyApiError(400, "존재하지 않는 이메일")
 
-            # 사용 처리 + 유저 인증
-            cur.execute(
-                f"""
-                UPDATE {self.T_EMAIL_TOKENS}
-                   SET USED_AT = SYSDATE
-                 WHERE USER_ID = :P_USER_ID
-                   AND PURPOSE = 'OTP'
-                   AND TOKEN = :P_TOKEN
-                """,
-                {"P_USER_ID": uid, "P_TOKEN": code},
-            )
-            cur.execute(
-                f"""
-                UPDATE {self.T_USERS}
-                   SET IS_VERIFIED = 1,
-                       EMAIL_VERIFIED_AT = SYSDATE
-                 WHERE {pk} = :P_USER_ID
-                """,
-                {"P_USER_ID": uid},
-            )
+                uid, isv = int(u[0]), int(u[1] or 0)
+                if isv == 1:
+                    return {"result": "이미 인증된 계정"}
+
+                result = await self.otp.verify(cur, uid, code)
+                if result != OTP_OK:
+                    if self.otp.writes_db:
+                        await con.commit()  # 시도 횟수 기록
+                    if result == OTP_LOCKED:
+                        raise SsyApiError(429, "시도 횟수를 초과했습니다. 인증번호를 다시 받아 주세요.")
+                    raise SsyApiError(400, "코드가 유효하지 않거나 만료됨")
+
+                # 유저 인증 (OTP 사용 처리는 저장소가 verify에서 함께 처리)
+                await cur.execute(
+                    f"""
+                    UPDATE {self.T_USERS}
+                       SET IS_VERIFIED = 1,
+                           EMAIL_VERIFIED_AT = SYSDATE
+                     WHERE {pk} = :P_USER_ID
+                    """,
+                    {"P_USER_ID": uid},
+                )
 
-            con.commit()
-            return JSONResponse({"result": "이메일 인증 완료"}, headers=h)
+                await con.commit()
+                return {"result": "이메일 인증 완료"}
 
-        except Exception as e:
-            if con:
-                con.rollback()
-            print("verify_otp error:", e)
-            return JSONResponse({"result": "인증 실패"}, status_code=500, headers=h)
-        finally:
-            self._closeConCur(con, cur)
+        except SsyApiError:
+            raise
+        except Exception:
+            logger.exception("verify_otp failed")
+            raise SsyApiError(500, "인증 실패")
 
     # === (참고) 링크 방식 메서드들 — 현재 OTP 플로우 미사용 ===
-    def _issue_email_token(self, cur, user_id: int, hours: int = 24) -> str:
+    async def _issue_email_token(self, cur, user_id: int, hours: int = 24) -> str:
         token = secrets.token_urlsafe(32)
-        self._ensure_schema_and_tables(cur)
-        cur.execute(
+        await self._ensure_schema_and_tables(cur)
+        await cur.execute(
             f"""
             UPDATE {self.T_EMAIL_TOKENS}
                SET USED_AT = SYSDATE
@@ -265,7 +174,7 @@ class UsersDAO:
             {"P_USER_ID": user_id},
         )
         expires_at = datetime.now() + timedelta(hours=hours)
-        cur.execute(
+        await cur.execute(
             f"""
             INSERT INTO {self.T_EMAIL_TOKENS} (USER_ID, TOKEN, PURPOSE, EXPIRES_AT)
             VALUES (:P_USER_ID, :P_TOKEN, 'VERIFY', :P_EXPIRES_AT)
@@ -274,6 +183,142 @@ class UsersDAO:
         )
         return token
 
+    # === 회원가입 PL/SQL 블록 ===
+    def _signup_plsql(self, pk: str) -> str:
+        """
+        O_STATUS: 200 가입 완료 / 404 사용자 없음 / 403 미인증 / 409 이미 가입
+        - 주소는 P_LOC_ID(SsyLocationCache 결과)가 있으면 그대로 쓰고,
+          없으면 (si_do, si_gun_gu, dong, detail_address)가 같은 행을 찾아 재사용, 없을 때만 INSERT
+          (동시에 같은 주소가 들어와 UNIQUE 위반이면 다시 조회)
+        - 실패 상태에서는 아무것도 쓰지 않으므로 고아 LOCATIONS 행이 생기지 않습니다.
+        - 이미 가입 여부는 UPDATE 조건으로 확인해 동시 가입 요청에도 한 번만 성공합니다.
+        """
+        return f"""
+        DECLARE
+          v_user_id  {self.T_USERS}.{pk}%TYPE;
+          v_verified NUMBER;
+          v_username {self.T_USERS}.USERNAME%TYPE;
+          v_password {self.T_USERS}.PASSWORD%TYPE;
+          v_loc_id   {self.T_LOCATIONS}.LOCATION_ID%TYPE;
+
+          FUNCTION find_location(p_sido VARCHAR2, p_sigungu VARCHAR2, p_dong VARCHAR2, p_detail VARCHAR2)
+            RETURN {self.T_LOCATIONS}.LOCATION_ID%TYPE IS
+            v_id {self.T_LOCATIONS}.LOCATION_ID%TYPE;
+          BEGIN
+            -- DECODE는 NULL끼리도 같다고 보므로 상세주소가 빈 경우도 재사용
+            SELECT LOCATION_ID INTO v_id
+              FROM {self.T_LOCATIONS}
+             WHERE SI_DO = p_sido
+               AND SI_GUN_GU = p_sigungu
+               AND DONG = p_dong
+               AND DECODE(DETAIL_ADDRESS, p_detail, 1, 0) = 1
+             FETCH FIRST 1 ROWS ONLY;
+            RETURN v_id;
+          EXCEPTION
+            WHEN NO_DATA_FOUND THEN RETURN NULL;
+          END;
+        BEGIN
+          BEGIN
+            SELECT {pk}, NVL(IS_VERIFIED, 0), USERNAME, PASSWORD
+              INTO v_user_id, v_verified, v_username, v_password
+              FROM {self.T_USERS}
+             WHERE EMAIL_NORM = :P_EMAIL_NORM;
+          EXCEPTION
+            WHEN NO_DATA_FOUND THEN
+              :O_STATUS := 404;
+              RETURN;
+          END;
+
+          IF v_verified <> 1 THEN
+            :O_STATUS := 403;
+            RETURN;
+          END IF;
+          IF v_username IS NOT NULL AND v_password IS NOT NULL THEN
+            :O_STATUS := 409;
+            RETURN;
+          END IF;
+
+          -- 캐시에서 찾은 주소 ID가 있으면 그대로, 없으면 조회 후 없을 때만 INSERT
+          v_loc_id := :P_LOC_ID;
+          IF v_loc_id IS NULL THEN
+            v_loc_id := find_location(:P_SIDO, :P_SIGUNGU, :P_DONG, :P_DETAIL_ADDRESS);
+          END IF;
+          IF v_loc_id IS NULL THEN
+            BEGIN
+              INSERT INTO {self.T_LOCATIONS} (SI_DO, SI_GUN_GU, DONG, DETAIL_ADDRESS)
+              VALUES (:P_SIDO, :P_SIGUNGU, :P_DONG, :P_DETAIL_ADDRESS)
+              RETURNING LOCATION_ID INTO v_loc_id;
+            EXCEPTION
+              WHEN DUP_VAL_ON_INDEX THEN
+                v_loc_id := find_location(:P_SIDO, :P_SIGUNGU, :P_DONG, :P_DETAIL_ADDRESS);
+            END;
+          END IF;
+
+          UPDATE {self.T_USERS}
+             SET USERNAME = :P_USERNAME,
+                 PHONE_NUMBER = :P_PHONE,
+                 PASSWORD = :P_PASSWORD,
+                 PROFILE_IMAGE_URL = :P_IMG,
+                 LOCATION_ID = v_loc_id
+           WHERE {pk} = v_user_id
+             AND (USERNAME IS NULL OR PASSWORD IS NULL);
+
+          IF SQL%ROWCOUNT = 0 THEN
+            ROLLBACK;
+            :O_STATUS := 409;
+            RETURN;
+          END IF;
+
+          COMMIT;
+          :O_LOC_ID := v_loc_id;
+          :O_STATUS := 200;
+        END;
+        """
+
+    # === 가입 가능 여부 (인덱스 조회 한 번, bcrypt/파일 저장 전에 확인) ===
+    async def _signup_precheck(self, email: str) -> int:
+        """200 가입 가능 / 404 사용자 없음 / 403 미인증 / 409 이미 가입 (최종 판단은 PL/SQL 블록이 다시 함)"""
+        async with SsyAsyncDBManager.acquire() as (con, cur):
+            await self._ensure_schema_and_tables(cur)
+            await cur.execute(
+                f"""
+                SELECT NVL(IS_VERIFIED, 0),
+                       CASE WHEN USERNAME IS NOT NULL AND PASSWORD IS NOT NULL THEN 1 ELSE 0 END
+                  FROM {self.T_USERS}
+                 WHERE EMAIL_NORM = :P_EMAIL_NORM
+                """,
+                {"P_EMAIL_NORM": self._norm_email(email)},
+            )
+            row = await cur.fetchone()
+        if not row:
+            return 404
+        if int(row[0]) != 1:
+            return 403
+        return 409 if int(row[1]) else 200
+
+    async def _release_upload(self, file_name: str, discard: bool):
+        """가입 요청이 끝난 업로드 정리. 되돌릴 때도 이미 다른 사용자가 가입하며 쓴 파일이면 남겨 둠"""
+        if discard:
+            try:
+                async with SsyAsyncDBManager.acquire() as (con, cur):
+                    await cur.execute(
+                        f"SELECT 1 FROM {self.T_USERS} WHERE PROFILE_IMAGE_URL = :P_IMG AND ROWNUM = 1",
+                        {"P_IMG": file_name},
+                    )
+                    discard = await cur.fetchone() is None
+            except Exception:
+                logger.exception("프로필 이미지 참조 확인 실패 (파일은 남겨 둠): %s", file_name)
+                discard = False
+        SsyFileStore.release(file_name, discard)
+
+    @staticmethod
+    def _signup_error(status: int) -> SsyApiError:
+        if status == 404:
+            return SsyApiError(404, "먼저 이메일로 인증번호를 받아 인증을 완료해 주세요.")
+        if status == 403:
+            return SsyApiError(403, "이메일 인증(OTP)을 먼저 완료해 주세요.")
+        return SsyApiError(409, "이미 가입된 이메일입니다.")
+
     # === 회원가입 (OTP 인증 선행) ===
     async def signUp(
         self,
@@ -292,135 +337,155 @@ class UsersDAO:
         - 미인증 : 403 (먼저 /users/verify-otp로 인증)
         - 인증됨 + 정보빈 : UPDATE하고 완료
         - 인증됨 + 정보있음 : 409 (이미 가입)
+        거절될 요청(중복/미인증)에 bcrypt(~250ms CPU)와 파일 저장을 쓰지 않도록 상태를 먼저 확인합니다.
+        DB 왕복은 가입 성공 시 2회(사전 확인 SELECT + PL/SQL 블록)입니다. 한 번으로 줄이는 목표는 일부러 접었습니다:
+        사전 확인을 블록에 합치면 bcrypt 해시를 먼저 만들어야 해서 거절될 요청도 bcrypt를 치르게 됩니다.
+        거절은 사전 확인 1회로 끝나고, 업로드가 있는 요청이 실패하면 _release_upload가 파일 참조 확인 SELECT를 1회 더 합니다.
         """
-        h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
+        if not username.strip() or not password:
+            raise SsyApiError(422, "이름과 비밀번호를 입력해 주세요.")
+
         file_name = None
+        created = False  # 이번 요청이 새로 저장한 파일만 실패 시 지움 (같은 내용은 공유됨)
+        joined = False
 
         try:
-            if psa:
-                content = await psa.read()
-                file_name = SsyFileNameGenerator.generate(psa.filename, "date")
-                with open(os.path.join(self.psaFolder, file_name), "wb") as f:
-                    f.write(content)
-
-            con, cur = self._makeConCur()
-            self._ensure_schema_and_tables(cur)
-            pk = self._users_pk_col(cur)
-
-            cur.execute(
-                f"""
-                SELECT {pk}, IS_VERIFIED, USERNAME, PASSWORD
-                  FROM {self.T_USERS}
-                 WHERE LOWER(EMAIL) = LOWER(:P_EMAIL)
-                """,
-                {"P_EMAIL": email},
-            )
-            row = cur.fetchone()
-            if not row:
-                if file_name and os.path.exists(os.path.join(self.psaFolder, file_name)):
-                    os.remove(os.path.join(self.psaFolder, file_name))
-                return JSONResponse({"result": "먼저 이메일로 인증번호를 받아 인증을 완료해 주세요."},
-                                    status_code=404, headers=h)
-
-            user_id, is_verified, exist_username, exist_pw = int(row[0]), int(row[1] or 0), row[2], row[3]
-
-            # LOCATION 저장 (항상 신규)
-            loc_out = cur.var(int)
-            cur.execute(
-                f"""
-                INSERT INTO {self.T_LOCATIONS} (si_do, si_gun_gu, dong,detail_address)
-                VALUES (:P_SIDO, :P_SIGUNGU, :P_DONG, :P_detail_address)
-                RETURNING location_id INTO :P_LOC_OUT
-                """,
-                {"P_SIDO": si_do, "P_SIGUNGU": si_gun_gu, "P_DONG": dong, "P_LOC_OUT": loc_out,"P_DETAIL_ADDRESS": detail_address,},
-            )
-            location_id = loc_out.getvalue()[0]
+            status = await self._signup_precheck(email)
+            if status != 200:
+                raise self._signup_error(status)
 
-            if is_verified != 1:
-                if file_name and os.path.exists(os.path.join(self.psaFolder, file_name)):
-                    os.remove(os.path.join(self.psaFolder, file_name))
-                return JSONResponse({"result": "이메일 인증(OTP)을 먼저 완료해 주세요."},
-                                    status_code=403, headers=h)
+            if psa:
+                # 청크 단위로 디스크에 쓰면서 해시/크기 검사, 이름은 내용 해시
+                try:
+                    file_name, created = await SsyFileStore.save(psa)
+                except UploadTooLarge:
+                    raise SsyApiError(413, f"프로필 이미지는 최대 {config.UPLOAD_MAX_BYTES // (1024 * 1024)}MB까지 올릴 수 있습니다.")
+                except UploadNotAllowed:
+                    raise SsyApiError(415, "지원하지 않는 이미지 형식입니다.")
+
+            # bcrypt는 CPU를 오래 쓰므로 이벤트 루프 밖(프로세스 풀)에서, 세션을 빌리기 전에 실행
+            hashed_password = await SsyPasswordHasher.hash(password)
+
+            async with SsyAsyncDBManager.acquire() as (con, cur):
+                await self._ensure_schema_and_tables(cur)
+                pk = await self._users_pk_col(cur)
+
+                # 상태 확인 + 주소 재사용/추가 + 사용자 갱신 + COMMIT 을 PL/SQL 블록 한 번(왕복 1회)으로
+                out_status = cur.var(int)
+                out_loc = cur.var(int)
+                await cur.execute(self._signup_plsql(pk), {
+                    "P_EMAIL_NORM": self._norm_email(email),
+                    "P_USERNAME": username,
+                    "P_PHONE": phone_number,
+                    "P_PASSWORD": hashed_password,
+                    "P_IMG": file_name,
+                    "P_SIDO": si_do,
+                    "P_SIGUNGU": si_gun_gu,
+                    "P_DONG": dong,
+                    "P_DETAIL_ADDRESS": detail_address,
+                    "P_LOC_ID": SsyLocationCache.get(si_do, si_gun_gu, dong, detail_address),
+                    "O_STATUS": out_status,
+                    "O_LOC_ID": out_loc,
+                })
+                status = out_status.getvalue()
+
+            if status == 200:
+                joined = True
+                SsyLocationCache.put(out_loc.getvalue(), si_do, si_gun_gu, dong, detail_address)
+                return {"result": "가입이 완료되었습니다!"}
+
+            # 사전 확인과 PL/SQL 사이에 다른 요청이 먼저 가입한 경우
+            raise self._signup_error(status)
+
+        except SsyApiError:
+            raise
+        except Exception:
+            logger.exception("회원가입 실패")
+            raise SsyApiError(500, "회원가입 실패")
+        finally:
+            if file_name:
+                await self._release_upload(file_name, discard=created and not joined)
 
-            hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
 
-            if (exist_username is None) or (exist_pw is None):
-                cur.execute(
-                    f"""
-                    UPDATE {self.T_USERS}
-                       SET USERNAME = :P_USERNAME,
-                           PHONE_NUMBER = :P_PHONE,
-                           PASSWORD = :P_PASSWORD,
-                           PROFILE_IMAGE_URL = :P_IMG,
-                           LOCATION_ID = :P_LOC_ID
-                     WHERE {pk} = :P_USER_ID
-                    """,
-                    {
-                        "P_USERNAME": username,
-                        "P_PHONE": phone_number,
-                        "P_PASSWORD": hashed_password,
-                        "P_IMG": file_name,
-                        "P_LOC_ID": location_id,
-                        "P_USER_ID": user_id,
-                    },
+    # === 사용자 주소 조회 (작물 추천 지역 결정용) ===
+    async def get_address(self, user_id: int):
+        try:
+            async with SsyAsyncDBManager.acquire() as (con, cur):
+                await self._ensure_schema_and_tables(cur)
+                pk = await self._users_pk_col(cur)
+                # 주소 자체는 SsyLocationCache에서 (LOCATIONS 조인 없이 USERS 한 행만)
+                await cur.execute(
+                    f"SELECT LOCATION_ID FROM {self.T_USERS} WHERE {pk} = :P_USER_ID",
+                    {"P_USER_ID": user_id},
                 )
-                con.commit()
-                return JSONResponse({"result": "가입이 완료되었습니다!"}, headers=h)
-
-            if file_name and os.path.exists(os.path.join(self.psaFolder, file_name)):
-                os.remove(os.path.join(self.psaFolder, file_name))
-            return JSONResponse({"result": "이미 가입된 이메일입니다."}, status_code=409, headers=h)
-
-        except Exception as e:
-            if con:
-                con.rollback()
-            if file_name and os.path.exists(os.path.join(self.psaFolder, file_name)):
-                os.remove(os.path.join(self.psaFolder, file_name))
-            print("회원가입 실패:", e)
-            return JSONResponse({"result": "회원가입 실패"}, status_code=500, headers=h)
-        finally:
-            self._closeConCur(con, cur)
+                row = await cur.fetchone()
+                if not row:
+                    return None
+                address = await SsyLocationCache.address_or_refresh(cur, row[0])
+                if not address:
+                    return None
+                return {"si_do": address["si_do"], "si_gun_gu": address["si_gun_gu"], "dong": address["dong"]}
+        except Exception:
+            logger.exception("get_address failed (user_id=%s)", user_id)
+            return None
 
 
 ######################################################################
 # 로그인 함수
-    def login(self, email: str, password: str) -> JSONResponse:
-        h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
+    async def login(self, email: str, password: str) -> dict:
         try:
-            con, cur = self._makeConCur()
-            self._ensure_schema_and_tables(cur)
-            pk = self._users_pk_col(cur)
-
-            # 1. 이메일로 사용자 정보 조회
-            cur.execute(
-                f"""
-                SELECT {pk}, EMAIL, PASSWORD
-                FROM {self.T_USERS}
-                WHERE LOWER(EMAIL) = LOWER(:P_EMAIL)
-                """,
-                {"P_EMAIL": email},
-            )
-            row = cur.fetchone()
-
-            if not row:
-                return JSONResponse({"result": "이메일 또는 비밀번호가 올바르지 않습니다."}, status_code=401, headers=h)
-
-            user_id, user_email, hashed_pw = int(row[0]), row[1], row[2]
-
-            # 2. 비밀번호 일치 여부 확인 (bcrypt)
-            if not hashed_pw or not bcrypt.checkpw(password.encode("utf-8"), hashed_pw.encode("utf-8")):
-                return JSONResponse({"result": "이메일 또는 비밀번호가 올바르지 않습니다."}, status_code=401, headers=h)
-
-            # 3. 로그인 성공 응답
-            # 실제 앱에서는 JWT 토큰 등을 생성하여 반환합니다.
-            return JSONResponse({"result": "로그인 성공", "user_id": user_id, "email": user_email}, headers=h)
+            async with SsyAsyncDBManager.acquire() as (con, cur):
+                await self._ensure_schema_and_tables(cur)
+                pk = await self._users_pk_col(cur)
 
+                # 1. 이메일로 사용자 정보 조회
+                await cur.execute(
+                    f"""
+                    SELECT {pk}, EMAIL, PASSWORD
+                    FROM {self.T_USERS}
+                    WHERE EMAIL_NORM = :P_EMAIL_NORM
+                    """,
+                    {"P_EMAIL_NORM": self._norm_email(email)},
+                )
+                row = await cur.fetchone()
+
+                if not row:
+                    raise SsyApiError(401, "이메일 또는 비밀번호가 올바르지 않습니다.")
+
+                user_id, user_email, hashed_pw = int(row[0]), row[1], row[2]
+
+            # 2. 비밀번호 일치 여부 확인 (bcrypt, 세션 반납 후 프로세스 풀에서)
+            if not await SsyPasswordHasher.verify(password, hashed_pw):
+                raise SsyApiError(401, "이메일 또는 비밀번호가 올바르지 않습니다.")
+
+            # 2-1. cost factor가 설정과 다르면 현재 설정으로 재해시해 저장
+            #      (부가 작업이라 실패해도 로그인은 성공 처리, 다음 로그인 때 다시 시도됨)
+            if SsyPasswordHasher.needs_rehash(hashed_pw):
+                try:
+                    new_hash = await SsyPasswordHasher.hash(password)
+                    async with SsyAsyncDBManager.acquire() as (con, cur):
+                        await cur.execute(
+                            f"UPDATE {self.T_USERS} SET PASSWORD = :P_PASSWORD WHERE {pk} = :P_USER_ID",
+                            {"P_PASSWORD": new_hash, "P_USER_ID": user_id},
+                        )
+                        await con.commit()
+                except Exception:
+                    logger.exception("password rehash failed (user_id=%s)", user_id)
+
+            # 3. 로그인 성공 응답 (액세스/리프레시 토큰 발급)
+            return {"result": "로그인 성공", "user_id": user_id, "email": user_email, **SsyTokenManager.issue(user_id, user_email)}
+
+        except SsyApiError:
+            raise
+        except Exception:
+            logger.exception("login failed")
+            raise SsyApiError(500, "로그인 실패")
+
+    # === 액세스 토큰 재발급 (리프레시 토큰, DB 조회 없음) ===
+    async def refresh(self, refresh_token: str) -> dict:
+        try:
+            claims = SsyTokenManager.decode(refresh_token, SsyTokenManager.REFRESH)
         except Exception as e:
-            if con:
-                con.rollback()
-            print("login error:", e)
-            return JSONResponse({"result": "로그인 실패"}, status_code=500, headers=h)
-        finally:
-            self._closeConCur(con, cur)
\ No newline at end of file
+            logger.info("refresh rejected: %s", e)
+            raise SsyApiError(401, "다시 로그인해 주세요.")
+        return {"result": "토큰 재발급", **SsyTokenManager.issue(int(claims["sub"]))}